@@ -0,0 +1,37 @@
+import hmac
+import random
+
+from fastapi import HTTPException, Request
+from app import config
+
+ADMIN_TOKEN_HEADER = "x-admin-token"
+PROFILE_HEADER = "x-profile"
+
+
+def is_admin(request: Request) -> bool:
+    if not config.ADMIN_TOKEN:
+        return False
+    token = request.headers.get(ADMIN_TOKEN_HEADER, "")
+    return hmac.compare_digest(token.encode("utf-8"), config.ADMIN_TOKEN.encode("utf-8"))
+
+
+def require_admin(request: Request) -> None:
+    # Dependencia de FastAPI para los endpoints de administración
+    if not config.ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=403,
+            detail="Los endpoints de administración están desactivados (CV_ANALYZER_ADMIN_TOKEN)"
+        )
+    if not is_admin(request):
+        raise HTTPException(
+            status_code=403,
+            detail="Token de administración no válido"
+        )
+
+
+def profiling_requested(request: Request) -> bool:
+    # Por petición (X-Profile con token de admin) o por muestreo
+    if request.headers.get(PROFILE_HEADER) and is_admin(request):
+        return True
+    rate = config.PROFILE_SAMPLE_RATE
+    return rate > 0 and random.random() < rate
@@ -0,0 +1,209 @@
+import zipfile
+from io import BytesIO
+from typing import List, NamedTuple, Optional
+from fastapi import HTTPException, UploadFile
+from app import config
+from app.api.uploads import PDF_HEADER_WINDOW, PDF_MAGIC, UPLOAD_CHUNK_SIZE
+from app.services.metrics import UPLOAD_BYTES
+
+ZIP_CONTENT_TYPES = {
+    "application/zip",
+    "application/x-zip",
+    "application/x-zip-compressed",
+    "multipart/x-zip",
+    # Algunos navegadores y clientes no saben el tipo: se decide por la cabecera
+    "application/octet-stream"
+}
+# Cabecera de fichero local y de archivo vacío
+ZIP_MAGICS = (b"PK\x03\x04", b"PK\x05\x06")
+
+
+class ArchiveEntryError(Exception):
+    """Error en una entrada concreta: se informa y se sigue con las demás."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class ArchiveLimitError(ArchiveEntryError):
+    """Se ha superado el límite del archivo completo: no se leen más entradas."""
+
+
+class ArchiveEntry(NamedTuple):
+    index: int
+    info: zipfile.ZipInfo
+    # Motivo por el que la entrada no se analiza (None si es un PDF candidato)
+    skip_reason: Optional[str]
+
+    @property
+    def filename(self) -> str:
+        return self.info.filename
+
+
+class UploadedArchive:
+    """
+    ZIP subido ya validado. Se lee con zipfile directamente del fichero
+    temporal de la subida (acceso aleatorio al directorio central) y cada
+    entrada se descomprime por bloques y solo cuando toca analizarla.
+    """
+
+    def __init__(self, upload: UploadFile, zip_file: zipfile.ZipFile, entries: List[ArchiveEntry]):
+        self.upload = upload
+        self.file = upload.file
+        self.filename = upload.filename
+        self.zip_file = zip_file
+        self.entries = entries
+        self.uncompressed_total = 0
+
+    @property
+    def pdf_entries(self) -> List[ArchiveEntry]:
+        return [entry for entry in self.entries if entry.skip_reason is None]
+
+    def read_entry(self, entry: ArchiveEntry) -> bytes:
+        """
+        Descomprime una entrada por bloques contando los bytes reales (el
+        tamaño declarado en el ZIP puede mentir). Es síncrona.
+        """
+        info = entry.info
+        if info.file_size > config.ZIP_MAX_ENTRY_SIZE:
+            raise ArchiveEntryError(413, f"El PDF supera el máximo de {_mb(config.ZIP_MAX_ENTRY_SIZE)}MB")
+        if info.file_size > max(info.compress_size, 1) * config.ZIP_MAX_COMPRESSION_RATIO:
+            raise ArchiveEntryError(413, "Ratio de compresión sospechoso")
+
+        buffer = BytesIO()
+        header = b""
+        size = 0
+
+        try:
+            with self.zip_file.open(info) as stream:
+                while True:
+                    chunk = stream.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+
+                    size += len(chunk)
+                    self.uncompressed_total += len(chunk)
+                    if self.uncompressed_total > config.ZIP_MAX_TOTAL_SIZE:
+                        raise ArchiveLimitError(
+                            413,
+                            f"El contenido descomprimido supera el máximo de {_mb(config.ZIP_MAX_TOTAL_SIZE)}MB"
+                        )
+                    if size > config.ZIP_MAX_ENTRY_SIZE:
+                        raise ArchiveEntryError(
+                            413, f"El PDF supera el máximo de {_mb(config.ZIP_MAX_ENTRY_SIZE)}MB"
+                        )
+                    if size > max(info.compress_size, 1) * config.ZIP_MAX_COMPRESSION_RATIO:
+                        raise ArchiveEntryError(413, "Ratio de compresión sospechoso")
+
+                    # Se deja de leer en cuanto se ve que no es un PDF
+                    if len(header) < PDF_HEADER_WINDOW:
+                        header += chunk[:PDF_HEADER_WINDOW - len(header)]
+                        if len(header) >= PDF_HEADER_WINDOW and PDF_MAGIC not in header:
+                            raise ArchiveEntryError(400, "El archivo no es un PDF válido")
+
+                    buffer.write(chunk)
+        except (zipfile.BadZipFile, EOFError, NotImplementedError, RuntimeError) as e:
+            # CRC incorrecto, método de compresión no soportado, entrada cifrada...
+            raise ArchiveEntryError(400, f"Entrada del ZIP ilegible: {e}")
+
+        if PDF_MAGIC not in header:
+            raise ArchiveEntryError(400, "El archivo no es un PDF válido")
+
+        return buffer.getvalue()
+
+    def detach(self) -> "UploadedArchive":
+        # Igual que UploadedPDF.detach: la respuesta en streaming cierra el fichero
+        self.upload.file = BytesIO()
+        return self
+
+    def close(self) -> None:
+        self.zip_file.close()
+        self.file.close()
+
+
+def _mb(size: int) -> int:
+    return size // (1024 * 1024)
+
+
+def _skip_reason(info: zipfile.ZipInfo) -> Optional[str]:
+    name = info.filename
+    basename = name.rsplit("/", 1)[-1]
+    if info.is_dir():
+        return "directory"
+    # Metadatos que añade macOS y ficheros ocultos
+    if name.startswith("__MACOSX/") or basename.startswith("."):
+        return "hidden"
+    if not basename.lower().endswith(".pdf"):
+        return "not_pdf"
+    if info.flag_bits & 0x1:
+        return "encrypted"
+    return None
+
+
+def read_zip_upload(archive_file: UploadFile) -> UploadedArchive:
+    """
+    Valida el ZIP leyendo solo su directorio central: número de entradas y
+    tamaños descomprimidos declarados. No descomprime nada. Es síncrona
+    (zipfile lee el fichero temporal); llamar con asyncio.to_thread.
+    """
+    if archive_file.content_type not in ZIP_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail="El archivo debe ser un ZIP"
+        )
+
+    file = archive_file.file
+    file.seek(0, 2)
+    size = file.tell()
+    UPLOAD_BYTES.inc(size)
+    if size > config.ZIP_MAX_ARCHIVE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"El archivo es demasiado grande. Máximo {_mb(config.ZIP_MAX_ARCHIVE_SIZE)}MB"
+        )
+
+    file.seek(0)
+    if file.read(4) not in ZIP_MAGICS:
+        raise HTTPException(
+            status_code=400,
+            detail="El archivo no es un ZIP válido"
+        )
+
+    file.seek(0)
+    try:
+        zip_file = zipfile.ZipFile(file)
+    except (zipfile.BadZipFile, OSError, ValueError):
+        raise HTTPException(
+            status_code=400,
+            detail="El archivo no es un ZIP válido"
+        )
+
+    infos = zip_file.infolist()
+    if len(infos) > config.ZIP_MAX_ENTRIES:
+        zip_file.close()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Demasiadas entradas en el ZIP. Máximo {config.ZIP_MAX_ENTRIES}"
+        )
+
+    entries = [ArchiveEntry(index, info, _skip_reason(info)) for index, info in enumerate(infos)]
+
+    # Rechazo inmediato si lo declarado ya supera el límite; lo real se vuelve a contar al leer
+    declared = sum(entry.info.file_size for entry in entries if entry.skip_reason is None)
+    if declared > config.ZIP_MAX_TOTAL_SIZE:
+        zip_file.close()
+        raise HTTPException(
+            status_code=400,
+            detail=f"El contenido descomprimido supera el máximo de {_mb(config.ZIP_MAX_TOTAL_SIZE)}MB"
+        )
+
+    if not any(entry.skip_reason is None for entry in entries):
+        zip_file.close()
+        raise HTTPException(
+            status_code=400,
+            detail="El ZIP no contiene ningún PDF"
+        )
+
+    return UploadedArchive(archive_file, zip_file, entries)
@@ -0,0 +1,158 @@
+import json
+from typing import Dict, Optional
+
+from app import config
+from app.services.admission import AdmissionController, AdmissionRejected, admission_controller
+
+
+class RequestTooLarge(Exception):
+    pass
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Limita el tamaño de los cuerpos multipart/form-data antes de que
+    Starlette los parsee. Si Content-Length ya supera el límite se responde
+    413 sin leer nada; si no viene (chunked) o miente, se cuentan los bytes
+    según llegan y se aborta en cuanto se pasa del límite.
+
+    path_limits permite un límite distinto para las rutas que empiezan por
+    un prefijo dado (p. ej. las subidas de lotes de CVs).
+    """
+
+    def __init__(
+        self,
+        app,
+        max_body_size: int = config.MAX_REQUEST_SIZE,
+        path_limits: Optional[Dict[str, int]] = None
+    ):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._is_multipart(scope):
+            await self.app(scope, receive, send)
+            return
+
+        max_body_size = self._limit_for(scope.get("path", ""))
+
+        content_length = self._header(scope, b"content-length")
+        if content_length is not None and content_length.isdigit():
+            if int(content_length) > max_body_size:
+                await self._reject(send, max_body_size)
+                return
+
+        received = 0
+        response_started = False
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body_size:
+                    # Se responde aquí: FastAPI convierte cualquier error al
+                    # leer el formulario en un 400 genérico
+                    if not response_started and not rejected:
+                        rejected = True
+                        await self._reject(send, max_body_size)
+                    raise RequestTooLarge()
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if rejected:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except RequestTooLarge:
+            pass
+
+    def _limit_for(self, path: str) -> int:
+        for prefix, limit in self.path_limits.items():
+            if path.startswith(prefix):
+                return limit
+        return self.max_body_size
+
+    def _is_multipart(self, scope) -> bool:
+        content_type = self._header(scope, b"content-type") or ""
+        return content_type.startswith("multipart/form-data")
+
+    @staticmethod
+    def _header(scope, name: bytes):
+        for key, value in scope.get("headers", []):
+            if key.lower() == name:
+                return value.decode("latin-1")
+        return None
+
+    async def _reject(self, send, max_body_size: int) -> None:
+        body = json.dumps({
+            "detail": f"La petición es demasiado grande. Máximo {max_body_size // (1024 * 1024)}MB"
+        }, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"connection", b"close")
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionMiddleware:
+    """
+    Control de admisión delante del pipeline. Antes de leer el cuerpo de la
+    petición se reserva un hueco del tipo de tráfico de la ruta (routes:
+    ruta exacta de un POST -> "interactive" o "batch"). Si no lo hay, la
+    petición espera en la cola acotada del AdmissionLimiter; con la cola
+    llena o el plazo vencido se responde 503 con Retry-After en el acto,
+    sin leer la subida, y se cierra la conexión. El hueco se libera al
+    terminar la respuesta, también en las de streaming.
+    """
+
+    def __init__(self, app, routes: Dict[str, str], controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.routes = routes
+        self.controller = controller or admission_controller
+
+    async def __call__(self, scope, receive, send):
+        traffic = None
+        if scope["type"] == "http" and scope.get("method") == "POST":
+            traffic = self.routes.get(scope.get("path", ""))
+        if traffic is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            async with self.controller.limiter(traffic).slot():
+                await self.app(scope, receive, send)
+        except AdmissionRejected as e:
+            await self._reject(send, e)
+
+    @staticmethod
+    async def _reject(send, error: AdmissionRejected) -> None:
+        # No se lee la subida: leerla entera bajo saturación es justo el trabajo que se
+        # quiere evitar. Con "Connection: close" el servidor no espera el resto del cuerpo
+        # para reutilizar la conexión
+        body = json.dumps({
+            "detail": f"El servidor está saturado. Inténtalo de nuevo en {error.retry_after} s"
+        }, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(error.retry_after).encode("latin-1")),
+                (b"connection", b"close")
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,140 @@
+import gzip
+import hashlib
+import json
+from typing import Any, Dict, Optional, Set
+
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+
+from app import config
+
+try:
+    import orjson
+except ImportError:
+    # Opcional: sin orjson se usa json de la biblioteca estándar
+    orjson = None
+
+# Secciones de un análisis que se pueden pedir con ?fields=
+ANALYSIS_SECTIONS = ("cv_info", "cv_analysis", "job_analysis", "match_result", "recommendations")
+# ?verbose=false: solo el score y su desglose
+COMPACT_FIELDS = "match_result.total_score,match_result.breakdown"
+
+# sección -> claves pedidas dentro de ella (None = la sección entera)
+FieldSelection = Dict[str, Optional[Set[str]]]
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse serializada con orjson si está instalado (varias veces más rápido)."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":")
+        ).encode("utf-8")
+
+
+def parse_fields(fields: Optional[str], verbose: bool = True) -> Optional[FieldSelection]:
+    """
+    Traduce ?fields=cv_info,match_result.total_score a una selección de
+    secciones (y de claves dentro de ellas). None = respuesta completa.
+    """
+    if fields is None and verbose:
+        return None
+
+    selection: FieldSelection = {}
+    for field in (fields if fields is not None else COMPACT_FIELDS).split(","):
+        field = field.strip()
+        if not field:
+            continue
+
+        section, _, key = field.partition(".")
+        if section not in ANALYSIS_SECTIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Campo desconocido '{section}'. Valores posibles: {', '.join(ANALYSIS_SECTIONS)}"
+            )
+
+        if not key:
+            selection[section] = None
+        elif section not in selection or selection[section] is not None:
+            selection.setdefault(section, set()).add(key)
+
+    return selection
+
+
+def select_fields(data: Dict, selection: Optional[FieldSelection]) -> Dict:
+    """Deja solo las secciones pedidas; las claves que no son secciones se conservan siempre."""
+    if selection is None:
+        return data
+
+    selected = {}
+    for key, value in data.items():
+        if key not in ANALYSIS_SECTIONS:
+            selected[key] = value
+        elif key in selection:
+            keys = selection[key]
+            selected[key] = value if keys is None or not isinstance(value, dict) else {
+                name: value[name] for name in value if name in keys
+            }
+    return selected
+
+
+def accepts_gzip(request: Request) -> bool:
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            # gzip;q=0 significa que el cliente lo rechaza
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def strong_etag(body: bytes) -> str:
+    # ETag fuerte: hash del cuerpo sin comprimir (la variante gzip lleva sufijo, ver compress_response)
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def matched_etag(request: Request, etag: str, gzip_variant: bool = False) -> Optional[str]:
+    """
+    ETag de If-None-Match que coincide con la respuesta (la variante identidad
+    o la gzip), o None. Con "*" se devuelve el de la representación que se
+    enviaría (gzip_variant).
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    gzip_etag = etag[:-1] + '-gzip"'
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate in (etag, gzip_etag):
+            return candidate
+        if candidate == "*":
+            return gzip_etag if gzip_variant else etag
+    return None
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers={"etag": etag, "vary": "Accept-Encoding"})
+
+
+def should_compress(request: Request, body: bytes) -> bool:
+    return len(body) >= config.GZIP_MIN_SIZE and accepts_gzip(request)
+
+
+def compress_response(request: Request, response: Response) -> Response:
+    """Comprime con gzip el cuerpo ya serializado si es grande y el cliente lo acepta."""
+    if not should_compress(request, response.body):
+        return response
+
+    response.body = gzip.compress(response.body, compresslevel=config.GZIP_LEVEL)
+    etag = response.headers.get("etag")
+    if etag:
+        # Otra representación, otro ETag fuerte
+        response.headers["etag"] = etag[:-1] + '-gzip"'
+    response.headers["content-encoding"] = "gzip"
+    response.headers["content-length"] = str(len(response.body))
+    response.headers["vary"] = "Accept-Encoding"
+    return response
@@ -1,72 +1,576 @@
-from fastapi import APIRouter, File, UploadFile, Form, HTTPException
-from app.services.pdf_extractor import PDFExtractor
-from app.services.cv_parser import CVParser
-from app.services.job_parser import JobParser
-from app.services.scoring_engine import ScoringEngine
-from app.services.recommendations import RecommendationsEngine
+import asyncio
+import json
+from typing import Dict, List, Optional, Set
+from fastapi import APIRouter, Depends, File, UploadFile, Form, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, Field
+from app import config
+from app.services import pipeline
+from app.api.admin import profiling_requested, require_admin
+from app.api.archives import ArchiveEntry, ArchiveEntryError, ArchiveLimitError, UploadedArchive, read_zip_upload
+from app.api.responses import (
+    FastJSONResponse,
+    FieldSelection,
+    compress_response,
+    matched_etag,
+    not_modified_response,
+    parse_fields,
+    select_fields,
+    should_compress,
+    strong_etag
+)
+from app.api.schemas import CVAnalysis
+from app.api.streaming import event_stream_response, wants_sse
+from app.api.uploads import UploadedPDF, extract_upload_text, read_pdf_upload
+from app.services.executor import PipelineTimeoutError, pipeline_executor, record_backend_timings, record_truncation
+from app.services.extraction_cache import extraction_cache
+from app.services.pdf_extractor import extraction_summary
+from app.services.job_cache import job_parse_cache, normalize_offer_text
+from app.services.metrics import NOT_MODIFIED_RESPONSES, RequestTimings
+from app.services.profiler import profile_store
+from app.services.result_cache import result_cache
+from app.services.taxonomy import taxonomy_registry
 
 router = APIRouter()
-pdf_extractor = PDFExtractor()
-cv_parser = CVParser()
-job_parser = JobParser()
-scoring_engine = ScoringEngine()
-recommendations_engine = RecommendationsEngine()
+
+# Partes del análisis que guarda la caché de resultados (cv_info se rehace con cada subida)
+ANALYSIS_RESULT_SECTIONS = ("cv_analysis", "job_analysis", "match_result", "recommendations")
+
+class CandidateScoringRequest(BaseModel):
+    job_offer: str
+    # Salida de CVParser.parse (cv_analysis) de cada candidato
+    cv_analyses: List[CVAnalysis]
+    top_k: Optional[int] = Field(None, ge=1)
 
 @router.post("/analyze")
 async def analyze_cv(
+    request: Request,
     cv_file: UploadFile = File(...),
-    job_offer: str = Form(...)
+    job_offer: str = Form(...),
+    fields: Optional[str] = Query(None),
+    verbose: bool = Query(True)
 ):
     
-    if cv_file.content_type != "application/pdf":
+    # Se valida antes de hacer ningún trabajo
+    selection = parse_fields(fields, verbose)
+    
+    timings = RequestTimings()
+    
+    with timings.stage("upload"):
+        pdf = await read_pdf_upload(cv_file)
+    
+    # Solo se comprueba aquí: las peticiones sin perfilar siguen el camino normal
+    if profiling_requested(request):
+        return await analyze_cv_profiled(request, pdf, job_offer, timings, selection)
+    
+    # El mismo CV con la misma oferta (recargas, reintentos) no vuelve a pasar por el pipeline
+    cache_key = result_cache.key_for(pdf.sha256, normalize_offer_text(job_offer), taxonomy_registry.version)
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        return timed_json_response(
+            request, timings, analysis_payload(pdf, cached["extraction"], cached["analysis"], selection), etag=True
+        )
+    
+    with timings.stage("extraction"):
+        extraction_result = await extract_upload_text(pdf)
+    
+    try:
+        with timings.stage("analysis"):
+            analysis = await pipeline_executor.analyze(extraction_result["text"], job_offer)
+    except PipelineTimeoutError:
         raise HTTPException(
-            status_code=400,
-            detail="El archivo debe ser un PDF"
+            status_code=504,
+            detail="El análisis ha superado el tiempo máximo permitido"
         )
     
-    file_content = await cv_file.read()
-    file_size = len(file_content)
+    # Desglose del worker: cv_parsing, job_parsing (si no estaba en caché), scoring, recommendations
+    timings.record_all(analysis["timings"])
+    
+    result_cache.put(cache_key, {
+        "extraction": extraction_summary(extraction_result),
+        "analysis": {section: analysis[section] for section in ANALYSIS_RESULT_SECTIONS}
+    })
     
-    max_size = 5 * 1024 * 1024
-    if file_size > max_size:
+    return timed_json_response(
+        request, timings, analysis_payload(pdf, extraction_result, analysis, selection), etag=True
+    )
+
+async def analyze_cv_profiled(
+    request: Request,
+    pdf: UploadedPDF,
+    job_offer: str,
+    timings: RequestTimings,
+    selection: Optional[FieldSelection] = None
+) -> JSONResponse:
+    try:
+        with timings.stage("profiled_analysis"):
+            profiled = await pipeline_executor.run(pipeline.profile_analysis, pdf.read_bytes(), job_offer)
+    except PipelineTimeoutError:
         raise HTTPException(
-            status_code=400,
-            detail="El archivo es demasiado grande. Máximo 5MB"
+            status_code=504,
+            detail="El análisis ha superado el tiempo máximo permitido"
         )
     
-    extraction_result = pdf_extractor.extract_text(file_content)
+    extraction_result = profiled["extraction"]
+    analysis = profiled["analysis"]
+    record_backend_timings(extraction_result)
+    record_truncation(extraction_result)
+    
+    profile_id = await asyncio.to_thread(
+        profile_store.save,
+        profiled["stats"],
+        {
+            "endpoint": "/api/analyze",
+            "filename": pdf.filename,
+            "size_bytes": pdf.size,
+            "num_pages": extraction_result["num_pages"],
+            "success": extraction_result["success"],
+            "wall_time": round(profiled["wall_time"], 6)
+        }
+    )
     
     if not extraction_result["success"]:
         raise HTTPException(
             status_code=500,
-            detail=f"Error al extraer texto del PDF: {extraction_result.get('error', 'Error desconocido')}"
+            detail=f"Error al extraer texto del PDF: {extraction_result.get('error', 'Error desconocido')}",
+            headers={"X-Profile-Id": profile_id}
+        )
+    
+    timings.record_all(analysis["timings"])
+    
+    response = timed_json_response(request, timings, analysis_payload(pdf, extraction_result, analysis, selection))
+    response.headers["X-Profile-Id"] = profile_id
+    return response
+
+def analysis_payload(
+    pdf: UploadedPDF,
+    extraction_result: Dict,
+    analysis: Dict,
+    selection: Optional[FieldSelection] = None
+) -> Dict:
+    return {
+        "status": "success",
+        "message": "Análisis completado correctamente",
+        "data": select_fields({
+            "cv_info": {
+                "filename": pdf.filename,
+                "size_bytes": pdf.size,
+                **extraction_summary(extraction_result)
+            },
+            "cv_analysis": analysis["cv_analysis"],
+            "job_analysis": analysis["job_analysis"],
+            "match_result": analysis["match_result"],
+            "recommendations": analysis["recommendations"]
+        }, selection)
+    }
+
+def timed_json_response(
+    request: Request,
+    timings: RequestTimings,
+    payload: Dict,
+    etag: bool = False
+) -> Response:
+    # JSONResponse serializa al construirse: así se mide la serialización
+    with timings.stage("serialization"):
+        response = FastJSONResponse(payload)
+    
+    if etag:
+        # ETag fuerte sobre el cuerpo: si el cliente ya tiene esta respuesta, 304 sin cuerpo
+        tag = strong_etag(response.body)
+        # El 304 lleva el ETag de la representación que el cliente tiene (identidad o gzip)
+        matched = matched_etag(request, tag, should_compress(request, response.body))
+        if matched is not None:
+            NOT_MODIFIED_RESPONSES.inc(endpoint=request.url.path)
+            response = not_modified_response(matched)
+            if config.SERVER_TIMING:
+                response.headers["Server-Timing"] = timings.server_timing()
+            return response
+        response.headers["etag"] = tag
+        # La representación depende de Accept-Encoding aunque esta vaya sin comprimir
+        response.headers["vary"] = "Accept-Encoding"
+    
+    with timings.stage("compression"):
+        response = compress_response(request, response)
+    
+    if config.SERVER_TIMING:
+        response.headers["Server-Timing"] = timings.server_timing()
+    
+    return response
+
+@router.post("/analyze/stream")
+async def analyze_cv_stream(
+    request: Request,
+    cv_file: UploadFile = File(...),
+    job_offer: str = Form(...)
+):
+    
+    timings = RequestTimings()
+    
+    # Los errores de validación de la subida siguen siendo respuestas HTTP normales
+    with timings.stage("upload"):
+        pdf = await read_pdf_upload(cv_file)
+    
+    return event_stream_response(
+        stream_analysis_events(pdf.detach(), job_offer, timings),
+        sse=wants_sse(request)
+    )
+
+async def stream_analysis_events(pdf: UploadedPDF, job_offer: str, timings: RequestTimings):
+    """
+    Emite cada etapa del análisis en cuanto termina: progreso de extracción
+    por páginas, extraction, cv_analysis, job_analysis, match_result,
+    recommendations y done. Un fallo a mitad se emite como evento error.
+    """
+    progress: asyncio.Queue = asyncio.Queue()
+    
+    def on_progress(pages_done: int, num_pages: int) -> None:
+        progress.put_nowait({"pages_done": pages_done, "num_pages": num_pages})
+    
+    # La oferta no depende del PDF: se parsea mientras se extrae el texto
+    job_task = asyncio.ensure_future(
+        timings.measure("job_parsing", pipeline_executor.parse_job(job_offer))
+    )
+    extraction_task = asyncio.ensure_future(
+        timings.measure("extraction", extract_upload_text(pdf, on_progress))
+    )
+    
+    try:
+        while not extraction_task.done() or not progress.empty():
+            getter = asyncio.ensure_future(progress.get())
+            await asyncio.wait({getter, extraction_task}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                yield {"event": "progress", "data": {"stage": "extraction", **getter.result()}}
+            else:
+                getter.cancel()
+        
+        extraction_result = extraction_task.result()
+        yield {
+            "event": "extraction",
+            "data": {
+                "filename": pdf.filename,
+                "size_bytes": pdf.size,
+                **extraction_summary(extraction_result)
+            }
+        }
+        
+        with timings.stage("cv_parsing"):
+            cv_analysis = await pipeline_executor.run(pipeline.parse_cv, extraction_result["text"])
+        yield {"event": "cv_analysis", "data": cv_analysis}
+        
+        job_analysis = await job_task
+        yield {"event": "job_analysis", "data": job_analysis}
+        
+        with timings.stage("scoring"):
+            match_result = await pipeline_executor.run(pipeline.match_cv, cv_analysis, job_analysis)
+        yield {"event": "match_result", "data": match_result}
+        
+        with timings.stage("recommendations"):
+            recommendations = await pipeline_executor.run(
+                pipeline.recommend,
+                cv_analysis,
+                job_analysis,
+                match_result
+            )
+        yield {"event": "recommendations", "data": recommendations}
+        
+        yield {"event": "done", "data": {"status": "success"}}
+    
+    except HTTPException as error:
+        yield {"event": "error", "data": {"status_code": error.status_code, "detail": error.detail}}
+    except PipelineTimeoutError:
+        yield {
+            "event": "error",
+            "data": {"status_code": 504, "detail": "El análisis ha superado el tiempo máximo permitido"}
+        }
+    finally:
+        for task in (job_task, extraction_task):
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                # Evita avisos de excepciones no recogidas si se abortó antes
+                task.exception()
+        pdf.close()
+
+@router.post("/analyze/zip")
+async def analyze_cv_zip(
+    request: Request,
+    cv_archive: UploadFile = File(...),
+    job_offer: str = Form(...)
+):
+    
+    if not job_offer.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="La oferta de trabajo no puede estar vacía"
         )
     
-    cv_analysis = cv_parser.parse(extraction_result["text"])
+    timings = RequestTimings()
     
-    job_analysis = job_parser.parse(job_offer)
+    # Solo se lee el directorio central; las entradas se descomprimen al analizarlas
+    with timings.stage("upload"):
+        archive = await asyncio.to_thread(read_zip_upload, cv_archive)
     
-    match_result = scoring_engine.calculate_match(cv_analysis, job_analysis)
+    # La oferta se parsea una vez para todo el archivo
+    try:
+        with timings.stage("job_parsing"):
+            job_analysis = await pipeline_executor.parse_job(job_offer)
+    except PipelineTimeoutError:
+        archive.close()
+        raise HTTPException(
+            status_code=504,
+            detail="El análisis de la oferta ha superado el tiempo máximo permitido"
+        )
     
-    recommendations = recommendations_engine.generate(
-        cv_analysis,
-        job_analysis,
-        match_result
+    return event_stream_response(
+        stream_zip_events(archive.detach(), job_analysis, timings),
+        sse=wants_sse(request)
     )
+
+async def stream_zip_events(archive: UploadedArchive, job_analysis: Dict, timings: RequestTimings):
+    """
+    Descomprime los PDFs del ZIP de uno en uno y los reparte entre los
+    workers, con como mucho max_workers entradas en memoria a la vez.
+    Emite job_analysis, un evento result o entry_error por PDF en orden de
+    finalización, skipped por cada entrada que no es un PDF y done con el
+    resumen. Si se supera el tamaño descomprimido total se deja de leer el
+    archivo y se emite error tras los PDFs que ya estaban en marcha.
+    """
+    yield {"event": "job_analysis", "data": job_analysis}
+    
+    summary = {"total_entries": len(archive.entries), "succeeded": 0, "failed": 0, "skipped": 0}
+    pending: Set[asyncio.Future] = set()
+    limit_error: Optional[ArchiveLimitError] = None
+    
+    try:
+        for entry in archive.entries:
+            if entry.skip_reason is not None:
+                summary["skipped"] += 1
+                yield {
+                    "event": "skipped",
+                    "data": {"index": entry.index, "filename": entry.filename, "reason": entry.skip_reason}
+                }
+                continue
+            
+            # Esperar a que quede un hueco antes de descomprimir la siguiente entrada
+            async for event in collect_finished(pending, keep=pipeline_executor.max_workers - 1):
+                summary["succeeded" if event["event"] == "result" else "failed"] += 1
+                yield event
+            
+            try:
+                pdf_bytes = await asyncio.to_thread(archive.read_entry, entry)
+            except ArchiveLimitError as error:
+                limit_error = error
+                break
+            except ArchiveEntryError as error:
+                summary["failed"] += 1
+                yield zip_entry_error(entry, error.status_code, error.detail)
+                continue
+            
+            pending.add(asyncio.ensure_future(analyze_zip_entry(entry, pdf_bytes, job_analysis, timings)))
+        
+        async for event in collect_finished(pending, keep=0):
+            summary["succeeded" if event["event"] == "result" else "failed"] += 1
+            yield event
+        
+        if limit_error is not None:
+            yield {"event": "error", "data": {"status_code": limit_error.status_code, "detail": limit_error.detail}}
+        
+        yield {"event": "done", "data": {"status": "success" if limit_error is None else "error", **summary}}
+    
+    finally:
+        for task in pending:
+            task.cancel()
+        archive.close()
+
+async def collect_finished(pending: Set[asyncio.Future], keep: int):
+    # Devuelve los resultados según terminan hasta que queden `keep` tareas en curso
+    while len(pending) > max(keep, 0):
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            pending.discard(task)
+            yield task.result()
+
+async def analyze_zip_entry(entry: ArchiveEntry, pdf_bytes: bytes, job_analysis: Dict, timings: RequestTimings) -> Dict:
+    try:
+        with timings.stage("extraction"):
+            extraction_result = await extract_upload_text(pdf_bytes)
+        with timings.stage("analysis"):
+            analysis = await pipeline_executor.run(
+                pipeline.analyze_parsed_job,
+                extraction_result["text"],
+                job_analysis
+            )
+    except HTTPException as error:
+        return zip_entry_error(entry, error.status_code, error.detail)
+    except PipelineTimeoutError:
+        return zip_entry_error(entry, 504, "El análisis ha superado el tiempo máximo permitido")
+    except Exception as error:
+        # Un PDF que tumba su worker (u otro fallo) no puede cortar el stream del ZIP
+        return zip_entry_error(entry, 500, f"Error inesperado al analizar el CV: {error}")
+    
+    timings.record_all(analysis["timings"])
     
     return {
+        "event": "result",
+        "data": {
+            "index": entry.index,
+            "cv_info": {
+                "filename": entry.filename,
+                "size_bytes": len(pdf_bytes),
+                **extraction_summary(extraction_result)
+            },
+            "cv_analysis": analysis["cv_analysis"],
+            "match_result": analysis["match_result"],
+            "recommendations": analysis["recommendations"]
+        }
+    }
+
+def zip_entry_error(entry: ArchiveEntry, status_code: int, detail: str) -> Dict:
+    return {
+        "event": "entry_error",
+        "data": {"index": entry.index, "filename": entry.filename, "status_code": status_code, "detail": detail}
+    }
+
+@router.post("/analyze/batch-jobs")
+async def analyze_cv_batch_jobs(
+    request: Request,
+    cv_file: UploadFile = File(...),
+    job_offers: List[str] = Form(...),
+    top_k: Optional[int] = Form(None),
+    fields: Optional[str] = Query(None),
+    verbose: bool = Query(True)
+):
+    
+    selection = parse_fields(fields, verbose)
+    offers = parse_job_offers_field(job_offers)
+    
+    if not offers:
+        raise HTTPException(
+            status_code=400,
+            detail="Debes enviar al menos una oferta de trabajo"
+        )
+    
+    if len(offers) > config.MAX_BATCH_JOB_OFFERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Demasiadas ofertas. Máximo {config.MAX_BATCH_JOB_OFFERS} por petición"
+        )
+    
+    if top_k is not None and top_k < 1:
+        raise HTTPException(
+            status_code=400,
+            detail="top_k debe ser mayor que 0"
+        )
+    
+    timings = RequestTimings()
+    
+    with timings.stage("upload"):
+        pdf = await read_pdf_upload(cv_file)
+    
+    with timings.stage("extraction"):
+        extraction_result = await extract_upload_text(pdf)
+    
+    # El CV se parsea una sola vez; las ofertas se reparten entre los workers
+    try:
+        cv_analysis, job_analyses = await asyncio.gather(
+            timings.measure("cv_parsing", pipeline_executor.run(pipeline.parse_cv, extraction_result["text"])),
+            timings.measure("job_parsing", pipeline_executor.parse_jobs(offers))
+        )
+        with timings.stage("ranking"):
+            ranked = await pipeline_executor.run(pipeline.rank_job_offers, cv_analysis, job_analyses, top_k)
+    except PipelineTimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail="El análisis ha superado el tiempo máximo permitido"
+        )
+    
+    # La selección de campos se aplica al CV y a cada oferta del ranking
+    return timed_json_response(request, timings, {
         "status": "success",
         "message": "Análisis completado correctamente",
-        "data": {
+        "data": select_fields({
             "cv_info": {
                 "filename": cv_file.filename,
-                "size_bytes": file_size,
-                "num_pages": extraction_result["num_pages"],
-                "num_characters": extraction_result["num_characters"]
+                "size_bytes": pdf.size,
+                **extraction_summary(extraction_result)
             },
             "cv_analysis": cv_analysis,
+            "total_offers": len(offers),
+            "top_k": top_k,
+            "results": [select_fields(result, selection) for result in ranked]
+        }, selection)
+    })
+
+def parse_job_offers_field(job_offers: List[str]) -> List[str]:
+    # Acepta el campo repetido (job_offers=...&job_offers=...) o un array JSON
+    if len(job_offers) == 1 and job_offers[0].lstrip().startswith("["):
+        try:
+            decoded = json.loads(job_offers[0])
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="job_offers no es un array JSON válido"
+            )
+        if not all(isinstance(offer, str) for offer in decoded):
+            raise HTTPException(
+                status_code=400,
+                detail="job_offers debe contener solo textos"
+            )
+        job_offers = decoded
+    
+    return [offer for offer in job_offers if offer.strip()]
+
+@router.post("/score/candidates")
+async def score_candidates(request: CandidateScoringRequest):
+    
+    if not request.job_offer.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="La oferta de trabajo no puede estar vacía"
+        )
+    
+    # Scoring vectorizado de todos los candidatos contra una oferta
+    try:
+        job_analysis = await pipeline_executor.parse_job(request.job_offer)
+        results = await pipeline_executor.run(
+            pipeline.score_candidates,
+            [cv_analysis.model_dump() for cv_analysis in request.cv_analyses],
+            job_analysis,
+            request.top_k
+        )
+    except PipelineTimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail="El scoring ha superado el tiempo máximo permitido"
+        )
+    
+    return {
+        "status": "success",
+        "message": "Scoring completado correctamente",
+        "data": {
+            "total_candidates": len(request.cv_analyses),
             "job_analysis": job_analysis,
-            "match_result": match_result,
-            "recommendations": recommendations
+            "results": results
+        }
+    }
+
+@router.get("/cache/stats")
+async def cache_stats():
+    return {
+        "status": "success",
+        "data": {
+            "extraction": extraction_cache.stats(),
+            "job_parse": job_parse_cache.stats(),
+            "result": result_cache.stats()
+        }
+    }
+
+@router.delete("/cache/results", dependencies=[Depends(require_admin)])
+async def purge_result_cache():
+    return {
+        "status": "success",
+        "message": "Caché de resultados vaciada",
+        "data": {
+            "purged": result_cache.clear()
         }
     }
\ No newline at end of file
@@ -0,0 +1,211 @@
+import asyncio
+from typing import List, Optional
+from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Query, Request
+from app import config
+from app.api.responses import FastJSONResponse, compress_response
+from app.api.streaming import event_stream_response, wants_sse
+from app.api.uploads import read_pdf_upload
+from app.services.batch_queue import BATCH_CANCELLED, BATCH_COMPLETED, BatchFile, get_batch_queue
+from app.services.batch_runner import batch_runner
+from app.services.executor import PipelineTimeoutError, pipeline_executor
+
+router = APIRouter()
+
+@router.post("/batches", status_code=202)
+async def create_batch(
+    cv_files: List[UploadFile] = File(...),
+    job_offer: str = Form(...),
+    max_concurrency: Optional[int] = Form(None),
+    label: Optional[str] = Form(None)
+):
+
+    if not job_offer.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="La oferta de trabajo no puede estar vacía"
+        )
+
+    if len(cv_files) > config.BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Demasiados CVs. Máximo {config.BATCH_MAX_FILES} por lote"
+        )
+
+    if max_concurrency is not None and max_concurrency < 1:
+        raise HTTPException(
+            status_code=400,
+            detail="max_concurrency debe ser mayor que 0"
+        )
+
+    # Se valida todo el lote antes de encolar nada
+    pdfs = []
+    for cv_file in cv_files:
+        try:
+            pdfs.append(await read_pdf_upload(cv_file))
+        except HTTPException as error:
+            raise HTTPException(
+                status_code=error.status_code,
+                detail=f"{cv_file.filename}: {error.detail}"
+            )
+
+    # La oferta se parsea una sola vez y se guarda con el lote
+    try:
+        job_analysis = await pipeline_executor.parse_job(job_offer)
+    except PipelineTimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail="El análisis de la oferta ha superado el tiempo máximo permitido"
+        )
+
+    concurrency = min(max_concurrency or config.BATCH_CONCURRENCY, config.BATCH_WORKERS)
+    batch_id = await asyncio.to_thread(
+        get_batch_queue().create,
+        job_offer,
+        job_analysis,
+        [BatchFile(pdf.filename, pdf.size, pdf.sha256, pdf.read_bytes) for pdf in pdfs],
+        concurrency,
+        label
+    )
+
+    batch_runner.start()
+    batch_runner.notify()
+
+    return {
+        "status": "success",
+        "message": "Lote encolado correctamente",
+        "data": {
+            "batch_id": batch_id,
+            "total": len(pdfs),
+            "max_concurrency": concurrency,
+            "status_url": f"/api/batches/{batch_id}",
+            "events_url": f"/api/batches/{batch_id}/events",
+            "results_url": f"/api/batches/{batch_id}/results"
+        }
+    }
+
+@router.get("/batches/{batch_id}")
+async def get_batch(batch_id: str):
+
+    batch = await asyncio.to_thread(get_batch_queue().get, batch_id)
+
+    if batch is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Lote no encontrado"
+        )
+
+    return {
+        "status": "success",
+        "data": batch
+    }
+
+@router.get("/batches/{batch_id}/events")
+async def stream_batch_events(
+    request: Request,
+    batch_id: str,
+    after: int = Query(0, ge=0)
+):
+
+    if await asyncio.to_thread(get_batch_queue().get, batch_id) is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Lote no encontrado"
+        )
+
+    return event_stream_response(batch_events(batch_id, after), sse=wants_sse(request))
+
+async def batch_events(batch_id: str, after: int = 0):
+    """
+    Emite un evento item por cada CV terminado (en orden de finalización,
+    con su número seq), progress cuando cambian los contadores y done al
+    acabar el lote. Con ?after=<seq> se retoma un stream interrumpido.
+    """
+    queue = get_batch_queue()
+    last_progress = None
+
+    while True:
+        batch = await asyncio.to_thread(queue.get, batch_id)
+        if batch is None:
+            yield {"event": "error", "data": {"status_code": 404, "detail": "Lote no encontrado"}}
+            return
+
+        for item in await asyncio.to_thread(queue.finished_since, batch_id, after):
+            after = item["seq"]
+            yield {"event": "item", "data": item}
+
+        if batch["progress"] != last_progress:
+            last_progress = batch["progress"]
+            yield {
+                "event": "progress",
+                "data": {key: batch[key] for key in ("status", "total", "progress", "percent")}
+            }
+
+        if batch["status"] in (BATCH_COMPLETED, BATCH_CANCELLED):
+            yield {"event": "done", "data": {"status": batch["status"]}}
+            return
+
+        await asyncio.sleep(config.BATCH_PROGRESS_INTERVAL)
+
+@router.get("/batches/{batch_id}/results")
+async def get_batch_results(
+    request: Request,
+    batch_id: str,
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0)
+):
+
+    queue = get_batch_queue()
+    batch = await asyncio.to_thread(queue.get, batch_id)
+
+    if batch is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Lote no encontrado"
+        )
+
+    results = await asyncio.to_thread(queue.results, batch_id, limit, offset)
+
+    # Mientras el lote sigue en marcha se devuelven los resultados parciales
+    return compress_response(request, FastJSONResponse({
+        "status": "success",
+        "data": {
+            "batch": batch,
+            "job_analysis": await asyncio.to_thread(queue.job_analysis, batch_id),
+            **results
+        }
+    }))
+
+@router.post("/batches/{batch_id}/cancel")
+async def cancel_batch(batch_id: str):
+
+    queue = get_batch_queue()
+
+    if not await asyncio.to_thread(queue.cancel, batch_id):
+        if await asyncio.to_thread(queue.get, batch_id) is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Lote no encontrado"
+            )
+        raise HTTPException(
+            status_code=409,
+            detail="El lote ya ha terminado"
+        )
+
+    return {
+        "status": "success",
+        "message": "Lote cancelado correctamente"
+    }
+
+@router.delete("/batches/{batch_id}")
+async def delete_batch(batch_id: str):
+
+    if not await asyncio.to_thread(get_batch_queue().delete, batch_id):
+        raise HTTPException(
+            status_code=404,
+            detail="Lote no encontrado"
+        )
+
+    return {
+        "status": "success",
+        "message": "Lote eliminado correctamente"
+    }
@@ -0,0 +1,102 @@
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, File, UploadFile, Form, HTTPException
+from app.api.uploads import extract_upload_text, read_pdf_upload
+from app.services import pipeline
+from app.services.cv_store import get_cv_store
+from app.services.executor import PipelineTimeoutError, pipeline_executor
+
+router = APIRouter()
+
+@router.post("/candidates")
+async def add_candidate(
+    cv_file: UploadFile = File(...),
+    candidate_id: Optional[str] = Form(None),
+    label: Optional[str] = Form(None)
+):
+    
+    pdf = await read_pdf_upload(cv_file)
+    
+    extraction_result = await extract_upload_text(pdf)
+    
+    try:
+        cv_analysis = await pipeline_executor.run(pipeline.parse_cv, extraction_result["text"])
+    except PipelineTimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail="El análisis ha superado el tiempo máximo permitido"
+        )
+    
+    # SQLite e índice en memoria: fuera del event loop
+    stored_id = await asyncio.to_thread(get_cv_store().add, cv_analysis, candidate_id, label or cv_file.filename)
+    
+    return {
+        "status": "success",
+        "message": "Candidato guardado correctamente",
+        "data": {
+            "candidate_id": stored_id,
+            "cv_analysis": cv_analysis
+        }
+    }
+
+@router.get("/candidates/{candidate_id}")
+async def get_candidate(candidate_id: str):
+    
+    candidate = get_cv_store().get(candidate_id)
+    
+    if candidate is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Candidato no encontrado"
+        )
+    
+    return {
+        "status": "success",
+        "data": candidate
+    }
+
+@router.delete("/candidates/{candidate_id}")
+async def delete_candidate(candidate_id: str):
+    
+    if not get_cv_store().delete(candidate_id):
+        raise HTTPException(
+            status_code=404,
+            detail="Candidato no encontrado"
+        )
+    
+    return {
+        "status": "success",
+        "message": "Candidato eliminado correctamente"
+    }
+
+@router.post("/candidates/search")
+async def search_candidates(
+    job_offer: str = Form(...),
+    top_k: int = Form(10)
+):
+    
+    if top_k < 1:
+        raise HTTPException(
+            status_code=400,
+            detail="top_k debe ser mayor que 0"
+        )
+    
+    try:
+        job_analysis = await pipeline_executor.parse_job(job_offer)
+    except PipelineTimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail="El análisis de la oferta ha superado el tiempo máximo permitido"
+        )
+    
+    # Puntúa todo el pool podado y lee los análisis guardados: fuera del event loop
+    search_result = await asyncio.to_thread(get_cv_store().search, job_analysis, top_k)
+    
+    return {
+        "status": "success",
+        "message": "Búsqueda completada correctamente",
+        "data": {
+            "job_analysis": job_analysis,
+            **search_result
+        }
+    }
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.services.extraction_cache import extraction_cache
+from app.services.job_cache import job_parse_cache
+from app.services.metrics import metrics_registry, register_cache_stats
+from app.services.result_cache import result_cache
+
+router = APIRouter()
+
+register_cache_stats("extraction", extraction_cache.stats)
+register_cache_stats("job_parse", job_parse_cache.stats)
+register_cache_stats("result", result_cache.stats)
+
+# Formato de exposición de texto de Prometheus
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
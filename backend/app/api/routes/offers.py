@@ -0,0 +1,126 @@
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, File, UploadFile, Form, HTTPException
+from pydantic import BaseModel, Field
+from app.api.schemas import CVAnalysis
+from app.api.uploads import extract_upload_text, read_pdf_upload
+from app.services import pipeline
+from app.services.executor import PipelineTimeoutError, pipeline_executor
+from app.services.offer_store import get_offer_store
+
+router = APIRouter()
+
+class OfferSearchRequest(BaseModel):
+    # Salida de CVParser.parse
+    cv_analysis: CVAnalysis
+    top_k: int = Field(10, ge=1)
+
+@router.post("/offers")
+async def add_offer(
+    job_offer: str = Form(...),
+    offer_id: Optional[str] = Form(None),
+    label: Optional[str] = Form(None)
+):
+    
+    if not job_offer.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="La oferta de trabajo no puede estar vacía"
+        )
+    
+    try:
+        job_analysis = await pipeline_executor.parse_job(job_offer)
+    except PipelineTimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail="El análisis de la oferta ha superado el tiempo máximo permitido"
+        )
+    
+    # SQLite e índice en memoria: fuera del event loop
+    stored_id = await asyncio.to_thread(get_offer_store().add, job_analysis, offer_id, label, job_offer)
+    
+    return {
+        "status": "success",
+        "message": "Oferta guardada correctamente",
+        "data": {
+            "offer_id": stored_id,
+            "job_analysis": job_analysis
+        }
+    }
+
+@router.get("/offers/{offer_id}")
+async def get_offer(offer_id: str):
+    
+    offer = get_offer_store().get(offer_id)
+    
+    if offer is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Oferta no encontrada"
+        )
+    
+    return {
+        "status": "success",
+        "data": offer
+    }
+
+@router.delete("/offers/{offer_id}")
+async def delete_offer(offer_id: str):
+    
+    if not get_offer_store().delete(offer_id):
+        raise HTTPException(
+            status_code=404,
+            detail="Oferta no encontrada"
+        )
+    
+    return {
+        "status": "success",
+        "message": "Oferta eliminada correctamente"
+    }
+
+@router.post("/offers/search")
+async def search_offers(request: OfferSearchRequest):
+    
+    # Puntúa las ofertas candidatas y lee sus análisis guardados: fuera del event loop
+    search_result = await asyncio.to_thread(get_offer_store().search, request.cv_analysis.model_dump(), request.top_k)
+    
+    return {
+        "status": "success",
+        "message": "Búsqueda completada correctamente",
+        "data": search_result
+    }
+
+@router.post("/offers/match")
+async def match_offers(
+    cv_file: UploadFile = File(...),
+    top_k: int = Form(10)
+):
+    
+    if top_k < 1:
+        raise HTTPException(
+            status_code=400,
+            detail="top_k debe ser mayor que 0"
+        )
+    
+    pdf = await read_pdf_upload(cv_file)
+    
+    extraction_result = await extract_upload_text(pdf)
+    
+    try:
+        cv_analysis = await pipeline_executor.run(pipeline.parse_cv, extraction_result["text"])
+    except PipelineTimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail="El análisis ha superado el tiempo máximo permitido"
+        )
+    
+    search_result = await asyncio.to_thread(get_offer_store().search, cv_analysis, top_k)
+    
+    return {
+        "status": "success",
+        "message": "Búsqueda completada correctamente",
+        "data": {
+            "cv_analysis": cv_analysis,
+            **search_result
+        }
+    }
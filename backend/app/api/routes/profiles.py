@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from app.api.admin import require_admin
+from app.services.profiler import PROFILE_FORMATS, profile_store
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+@router.get("/profiles")
+async def list_profiles():
+    profiles = profile_store.list()
+    return {
+        "status": "success",
+        "data": {
+            "total": len(profiles),
+            "max_entries": profile_store.max_entries,
+            "profiles": profiles
+        }
+    }
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str, format: str = "pstats"):
+    
+    if format not in PROFILE_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Formato no soportado. Usa uno de: {', '.join(PROFILE_FORMATS)}"
+        )
+    
+    path = profile_store.path_for(profile_id, format)
+    if path is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Perfil no encontrado"
+        )
+    
+    return FileResponse(
+        path,
+        media_type=PROFILE_FORMATS[format][1],
+        filename=path.name
+    )
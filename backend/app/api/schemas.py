@@ -0,0 +1,29 @@
+from typing import Dict, List
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class CVExperience(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    level: str = "unknown"
+
+
+class CVContext(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    percentages: Dict[str, float] = Field(default_factory=dict)
+    dominant: str = "unknown"
+
+
+class CVAnalysis(BaseModel):
+    """
+    Salida de CVParser.parse enviada por el cliente. Solo se validan los
+    campos que leen el scoring y las búsquedas; el resto se conserva tal cual.
+    """
+
+    model_config = ConfigDict(extra="allow")
+
+    technical_skills: Dict[str, List[str]] = Field(default_factory=dict)
+    experience: CVExperience = Field(default_factory=CVExperience)
+    context: CVContext = Field(default_factory=CVContext)
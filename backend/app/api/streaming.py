@@ -0,0 +1,45 @@
+import json
+from typing import Any, AsyncIterator, Dict
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+def wants_sse(request: Request) -> bool:
+    # ?format=sse o Accept: text/event-stream (EventSource); NDJSON por defecto
+    requested = request.query_params.get("format")
+    if requested is not None:
+        return requested.lower() == "sse"
+    return SSE_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def encode_event(event: str, data: Any, sse: bool = False) -> str:
+    payload = json.dumps(data, ensure_ascii=False)
+    if sse:
+        return f"event: {event}\ndata: {payload}\n\n"
+    # Misma línea que json.dumps({"event": ..., "data": ...}) sin volver a serializar data
+    return f'{{"event": {json.dumps(event, ensure_ascii=False)}, "data": {payload}}}\n'
+
+
+def event_stream_response(events: AsyncIterator[Dict], sse: bool = False) -> StreamingResponse:
+    """
+    Envuelve un generador de eventos {"event": ..., "data": ...} en una
+    respuesta NDJSON (una línea JSON por evento) o SSE.
+    """
+
+    async def body():
+        async for item in events:
+            yield encode_event(item["event"], item["data"], sse)
+
+    return StreamingResponse(
+        body(),
+        media_type=SSE_MEDIA_TYPE if sse else NDJSON_MEDIA_TYPE,
+        headers={
+            "Cache-Control": "no-cache",
+            # Evita que proxies como nginx acumulen la respuesta
+            "X-Accel-Buffering": "no"
+        }
+    )
@@ -0,0 +1,146 @@
+import hashlib
+from io import BytesIO
+from typing import BinaryIO, Callable, Optional, Union
+from fastapi import HTTPException, UploadFile
+from app import config
+from app.services.executor import PipelineTimeoutError, pipeline_executor
+from app.services.extraction_cache import extraction_cache
+from app.services.metrics import EXTRACTION_FAILURES, PDF_PAGES, UPLOAD_BYTES
+
+PDF_MAGIC = b"%PDF-"
+# La especificación permite basura antes de la cabecera dentro del primer KB
+PDF_HEADER_WINDOW = 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class UploadedPDF:
+    """
+    PDF subido ya validado. No copia el contenido: envuelve el fichero
+    temporal (spooled) en el que Starlette ha recibido la subida.
+    """
+
+    def __init__(self, upload: UploadFile, size: int, sha256: str):
+        self.upload = upload
+        self.file = upload.file
+        self.filename = upload.filename
+        self.size = size
+        self.sha256 = sha256
+
+    def open(self) -> BinaryIO:
+        self.file.seek(0)
+        return self.file
+
+    def read_bytes(self) -> bytes:
+        return self.open().read()
+
+    def detach(self) -> "UploadedPDF":
+        # FastAPI cierra los ficheros subidos al salir del endpoint; una
+        # respuesta en streaming se queda con el fichero y lo cierra ella
+        self.upload.file = BytesIO()
+        return self
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail=f"El archivo es demasiado grande. Máximo {config.MAX_UPLOAD_SIZE // (1024 * 1024)}MB"
+    )
+
+
+def _not_a_pdf() -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail="El archivo no es un PDF válido"
+    )
+
+
+async def read_pdf_upload(cv_file: UploadFile) -> UploadedPDF:
+    if cv_file.content_type != "application/pdf":
+        raise HTTPException(
+            status_code=400,
+            detail="El archivo debe ser un PDF"
+        )
+
+    # Starlette ya conoce el tamaño: rechazo inmediato sin leer nada
+    if cv_file.size is not None and cv_file.size > config.MAX_UPLOAD_SIZE:
+        raise _too_large()
+
+    # Lectura por bloques: se valida la cabecera con el primer bloque,
+    # se corta en cuanto se supera el límite y se calcula el hash sobre la marcha
+    digest = hashlib.sha256()
+    header = b""
+    total = 0
+
+    await cv_file.seek(0)
+    while True:
+        chunk = await cv_file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+
+        total += len(chunk)
+        UPLOAD_BYTES.inc(len(chunk))
+        if total > config.MAX_UPLOAD_SIZE:
+            raise _too_large()
+
+        if len(header) < PDF_HEADER_WINDOW:
+            header += chunk[:PDF_HEADER_WINDOW - len(header)]
+            if len(header) >= PDF_HEADER_WINDOW and PDF_MAGIC not in header:
+                raise _not_a_pdf()
+
+        digest.update(chunk)
+
+    if PDF_MAGIC not in header:
+        raise _not_a_pdf()
+
+    return UploadedPDF(cv_file, total, digest.hexdigest())
+
+
+async def extract_text_cached(
+    pdf: Union[UploadedPDF, bytes],
+    on_progress: Optional[Callable[[int, int], None]] = None
+) -> dict:
+    # Un PDF ya procesado no vuelve a pasar por PyPDF2
+    if isinstance(pdf, UploadedPDF):
+        cache_key = pdf.sha256
+        source = pdf.open()
+    else:
+        cache_key = extraction_cache.key_for(pdf)
+        source = pdf
+
+    cached = extraction_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    extraction_result = await pipeline_executor.extract_text(source, on_progress)
+    if extraction_result["success"]:
+        # Páginas leídas de verdad: con la extracción acotada pueden ser menos que num_pages
+        PDF_PAGES.inc(extraction_result["pages_extracted"])
+    extraction_cache.put(cache_key, extraction_result)
+    return extraction_result
+
+
+async def extract_upload_text(
+    pdf: Union[UploadedPDF, bytes],
+    on_progress: Optional[Callable[[int, int], None]] = None
+) -> dict:
+    # Las etapas CPU-bound se ejecutan fuera del event loop
+    try:
+        extraction_result = await extract_text_cached(pdf, on_progress)
+    except PipelineTimeoutError:
+        EXTRACTION_FAILURES.inc(reason="timeout")
+        raise HTTPException(
+            status_code=504,
+            detail="La extracción del PDF ha superado el tiempo máximo permitido"
+        )
+
+    if not extraction_result["success"]:
+        EXTRACTION_FAILURES.inc(reason="error")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error al extraer texto del PDF: {extraction_result.get('error', 'Error desconocido')}"
+        )
+
+    return extraction_result
@@ -0,0 +1,169 @@
+import os
+from pathlib import Path
+from typing import Optional
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+
+
+def _env_str(name: str, default: str) -> str:
+    value = os.environ.get(name)
+    return value.strip() if value and value.strip() else default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_optional_str(name: str) -> Optional[str]:
+    value = os.environ.get(name)
+    return value.strip() if value and value.strip() else None
+
+
+# ===== LÍMITES DE SUBIDA =====
+
+MAX_UPLOAD_SIZE = _env_int("CV_ANALYZER_MAX_UPLOAD_SIZE", 5 * 1024 * 1024)
+# Tamaño máximo del cuerpo multipart completo (PDF + campos de texto). Se
+# corta la conexión con 413 en cuanto se supera, sin terminar de recibirlo
+MAX_REQUEST_SIZE = _env_int("CV_ANALYZER_MAX_REQUEST_SIZE", MAX_UPLOAD_SIZE + 1024 * 1024)
+# Número máximo de ofertas en /api/analyze/batch-jobs
+MAX_BATCH_JOB_OFFERS = _env_int("CV_ANALYZER_MAX_BATCH_JOB_OFFERS", 100)
+
+# ===== ARCHIVOS ZIP (/api/analyze/zip) =====
+
+# Tamaño máximo del ZIP subido (comprimido)
+ZIP_MAX_ARCHIVE_SIZE = _env_int("CV_ANALYZER_ZIP_MAX_ARCHIVE_SIZE", 256 * 1024 * 1024)
+ZIP_MAX_ENTRIES = _env_int("CV_ANALYZER_ZIP_MAX_ENTRIES", 1000)
+# Protección contra zip bombs: tamaño descomprimido por PDF y del total, y ratio de compresión
+ZIP_MAX_ENTRY_SIZE = _env_int("CV_ANALYZER_ZIP_MAX_ENTRY_SIZE", MAX_UPLOAD_SIZE)
+ZIP_MAX_TOTAL_SIZE = _env_int("CV_ANALYZER_ZIP_MAX_TOTAL_SIZE", 1024 * 1024 * 1024)
+ZIP_MAX_COMPRESSION_RATIO = _env_int("CV_ANALYZER_ZIP_MAX_COMPRESSION_RATIO", 100)
+
+# ===== EJECUCIÓN DEL PIPELINE =====
+
+# "process" (pool de procesos), "thread" (pool de hilos) o "inline" (en el event loop)
+EXECUTION_MODE = _env_str("CV_ANALYZER_EXECUTION_MODE", "process")
+MAX_WORKERS = _env_int("CV_ANALYZER_MAX_WORKERS", min(4, os.cpu_count() or 1))
+# Segundos máximos por tarea; en modo "process" el worker se mata al superarlo, en "thread"
+# se deja de esperar (el hilo sigue hasta terminar) y en "inline" no se aplica
+TASK_TIMEOUT = _env_float("CV_ANALYZER_TASK_TIMEOUT", 30.0)
+# Extracción en paralelo por rangos de páginas a partir de N páginas (0 = desactivado)
+PAGE_PARALLEL_THRESHOLD = _env_int("CV_ANALYZER_PAGE_PARALLEL_THRESHOLD", 0)
+PAGES_PER_CHUNK = _env_int("CV_ANALYZER_PAGES_PER_CHUNK", 10)
+
+# ===== CONTROL DE ADMISIÓN =====
+
+# Análisis en curso a la vez por tipo de tráfico (0 = sin límite). Lo que no cabe espera
+# en una cola acotada como mucho *_QUEUE_TIMEOUT segundos; con la cola llena o el plazo
+# vencido se responde 503 con Retry-After sin leer la subida
+ADMISSION_INTERACTIVE_MAX_IN_FLIGHT = _env_int("CV_ANALYZER_ADMISSION_INTERACTIVE_MAX_IN_FLIGHT", MAX_WORKERS * 2)
+ADMISSION_INTERACTIVE_MAX_QUEUE = _env_int("CV_ANALYZER_ADMISSION_INTERACTIVE_MAX_QUEUE", MAX_WORKERS * 8)
+ADMISSION_INTERACTIVE_QUEUE_TIMEOUT = _env_float("CV_ANALYZER_ADMISSION_INTERACTIVE_QUEUE_TIMEOUT", 5.0)
+# ZIPs y cola de lotes: por defecto la mitad de los workers, para dejar sitio a las peticiones interactivas
+ADMISSION_BATCH_MAX_IN_FLIGHT = _env_int("CV_ANALYZER_ADMISSION_BATCH_MAX_IN_FLIGHT", max(1, MAX_WORKERS // 2))
+ADMISSION_BATCH_MAX_QUEUE = _env_int("CV_ANALYZER_ADMISSION_BATCH_MAX_QUEUE", MAX_WORKERS * 2)
+ADMISSION_BATCH_QUEUE_TIMEOUT = _env_float("CV_ANALYZER_ADMISSION_BATCH_QUEUE_TIMEOUT", 30.0)
+
+# ===== EXTRACCIÓN DE PDF =====
+
+# Backends en orden de preferencia: si uno no sabe leer el PDF se prueba el siguiente.
+# "native" (extractor propio, más rápido) y "pypdf2"
+PDF_BACKENDS = [
+    name.strip() for name in _env_str("CV_ANALYZER_PDF_BACKENDS", "native,pypdf2").split(",") if name.strip()
+]
+# Extracción acotada (0 = sin límite): páginas leídas como mucho, caracteres de texto a
+# partir de los que se deja de leer, segundos por página y tamaño descomprimido por stream.
+# Lo que se corta se indica en la respuesta con "truncated" y "truncation_reason"
+PDF_MAX_PAGES = _env_int("CV_ANALYZER_PDF_MAX_PAGES", 30)
+PDF_MAX_CHARS = _env_int("CV_ANALYZER_PDF_MAX_CHARS", 200_000)
+PDF_PAGE_TIME_LIMIT = _env_float("CV_ANALYZER_PDF_PAGE_TIME_LIMIT", 2.0)
+PDF_MAX_STREAM_SIZE = _env_int("CV_ANALYZER_PDF_MAX_STREAM_SIZE", 16 * 1024 * 1024)
+# Memoria máxima (RLIMIT_AS, bytes) de cada worker en modo "process" (0 = sin límite).
+# Un PDF que la agota falla con error en lugar de tumbar la máquina
+WORKER_MEMORY_LIMIT = _env_int("CV_ANALYZER_WORKER_MEMORY_LIMIT", 0)
+
+# ===== ARRANQUE =====
+
+# Artefacto precompilado de la taxonomía (python -m app.services.taxonomy_artifact).
+# Se usa solo si coincide con el hash de los JSON; si no, se compila desde ellos
+TAXONOMY_ARTIFACT = _env_str("CV_ANALYZER_TAXONOMY_ARTIFACT", str(DATA_DIR / 'taxonomy.bin'))
+# Arrancar los workers y cargar la taxonomía al iniciar; /ready responde 503 hasta terminar
+WARM_UP_ON_STARTUP = _env_bool("CV_ANALYZER_WARM_UP_ON_STARTUP", True)
+
+# ===== CACHÉ DE EXTRACCIÓN =====
+
+# Tamaño máximo del nivel en memoria (0 = desactivado)
+EXTRACTION_CACHE_MAX_BYTES = _env_int("CV_ANALYZER_EXTRACTION_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+# Ruta del fichero SQLite para el nivel en disco (sin definir = desactivado)
+EXTRACTION_CACHE_DB = _env_optional_str("CV_ANALYZER_EXTRACTION_CACHE_DB")
+EXTRACTION_CACHE_DISK_MAX_ENTRIES = _env_int("CV_ANALYZER_EXTRACTION_CACHE_DISK_MAX_ENTRIES", 10000)
+
+# ===== CACHÉ DE OFERTAS PARSEADAS =====
+
+JOB_CACHE_MAX_BYTES = _env_int("CV_ANALYZER_JOB_CACHE_MAX_BYTES", 16 * 1024 * 1024)
+
+# ===== CACHÉ DE RESULTADOS (/api/analyze) =====
+
+# Análisis completos por PDF + oferta + versión de la taxonomía (0 = desactivada)
+RESULT_CACHE_MAX_BYTES = _env_int("CV_ANALYZER_RESULT_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+# Segundos que se conserva cada resultado
+RESULT_CACHE_TTL = _env_float("CV_ANALYZER_RESULT_CACHE_TTL", 3600.0)
+
+# ===== ALMACENES PERSISTENTES =====
+
+CV_STORE_DB = _env_str("CV_ANALYZER_CV_STORE_DB", str(DATA_DIR / 'store' / 'candidates.sqlite3'))
+OFFER_STORE_DB = _env_str("CV_ANALYZER_OFFER_STORE_DB", str(DATA_DIR / 'store' / 'offers.sqlite3'))
+
+# ===== ANÁLISIS MASIVO (COLA DE LOTES) =====
+
+BATCH_QUEUE_DB = _env_str("CV_ANALYZER_BATCH_QUEUE_DB", str(DATA_DIR / 'store' / 'batches.sqlite3'))
+# CVs analizados a la vez entre todos los lotes
+BATCH_WORKERS = _env_int("CV_ANALYZER_BATCH_WORKERS", MAX_WORKERS)
+# CVs de un mismo lote en paso a la vez (por defecto; cada lote puede pedir menos)
+BATCH_CONCURRENCY = _env_int("CV_ANALYZER_BATCH_CONCURRENCY", BATCH_WORKERS)
+BATCH_MAX_FILES = _env_int("CV_ANALYZER_BATCH_MAX_FILES", 500)
+# Tamaño máximo del multipart de /api/batches (sustituye a MAX_REQUEST_SIZE en esa ruta)
+BATCH_MAX_REQUEST_SIZE = _env_int("CV_ANALYZER_BATCH_MAX_REQUEST_SIZE", 256 * 1024 * 1024)
+# Intentos por CV ante fallos de extracción, timeouts o la muerte de un worker, con espera
+# exponencial entre ellos; un PDF cifrado o que supera los límites falla al primer intento
+BATCH_MAX_ATTEMPTS = _env_int("CV_ANALYZER_BATCH_MAX_ATTEMPTS", 3)
+BATCH_RETRY_DELAY = _env_float("CV_ANALYZER_BATCH_RETRY_DELAY", 2.0)
+# Cada cuántos segundos se consulta el progreso en /api/batches/{id}/events
+BATCH_PROGRESS_INTERVAL = _env_float("CV_ANALYZER_BATCH_PROGRESS_INTERVAL", 0.5)
+
+# ===== RESPUESTAS =====
+
+# Las respuestas JSON de análisis mayores que esto se comprimen con gzip si el cliente lo acepta
+GZIP_MIN_SIZE = _env_int("CV_ANALYZER_GZIP_MIN_SIZE", 1024)
+GZIP_LEVEL = _env_int("CV_ANALYZER_GZIP_LEVEL", 6)
+
+# ===== MÉTRICAS =====
+
+# Añade la cabecera Server-Timing con el desglose por etapa de cada análisis
+SERVER_TIMING = _env_bool("CV_ANALYZER_SERVER_TIMING", False)
+
+# ===== ADMINISTRACIÓN Y PROFILING =====
+
+# Token para los endpoints de administración (cabecera X-Admin-Token). Sin definir = desactivados
+ADMIN_TOKEN = _env_optional_str("CV_ANALYZER_ADMIN_TOKEN")
+# Fracción de peticiones a /api/analyze que se perfilan automáticamente (0 = ninguna)
+PROFILE_SAMPLE_RATE = _env_float("CV_ANALYZER_PROFILE_SAMPLE_RATE", 0.0)
+PROFILE_DIR = _env_str("CV_ANALYZER_PROFILE_DIR", str(DATA_DIR / 'profiles'))
+# Perfiles guardados; al superarlo se borran los más antiguos
+PROFILE_MAX_ENTRIES = _env_int("CV_ANALYZER_PROFILE_MAX_ENTRIES", 50)
@@ -1,15 +1,89 @@
+import asyncio
+from contextlib import asynccontextmanager
+# Primero: el cold start se mide desde aquí
+from app.services.readiness import readiness
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import analyzer
+from app.api.middleware import AdmissionMiddleware, UploadSizeLimitMiddleware
+from app.api.responses import FastJSONResponse
+from app import config
+from app.api.routes import analyzer, batches, candidates, metrics, offers, profiles
+from app.services.batch_runner import batch_runner
+from app.services.executor import pipeline_executor
+from app.services.taxonomy import taxonomy_registry
+
+readiness.mark("import")
+
+async def warm_up():
+    error = None
+    try:
+        await pipeline_executor.warm_up()
+    except Exception as e:
+        # Sin warm-up el servidor funciona igual: cada worker se inicializa en su primera tarea
+        error = str(e)
+        print(f"Error en el warm-up: {e}")
+    readiness.set_ready(error)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    readiness.mark("lifespan")
+    # En segundo plano: el servidor acepta conexiones (y responde /ready con 503) mientras tanto
+    warm_up_task = asyncio.create_task(warm_up()) if config.WARM_UP_ON_STARTUP else None
+    if warm_up_task is None:
+        readiness.set_ready()
+    # Reanudar los lotes que quedaron pendientes en el último arranque
+    batch_runner.resume()
+    yield
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+    # Parar la cola de lotes y cerrar los pools de workers al apagar el servidor
+    await batch_runner.stop()
+    pipeline_executor.shutdown()
 
 # Crear instancia de FastAPI
 app = FastAPI(
     title="CV Analyzer API",
     description="API para analizar compatibilidad entre CVs y ofertas de trabajo",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    # orjson (si está instalado) para todas las respuestas JSON
+    default_response_class=FastJSONResponse
+)
+
+# Limitar los análisis en curso por tipo de tráfico; se añade antes que el límite de
+# tamaño para que las subidas demasiado grandes se rechacen sin ocupar hueco
+app.add_middleware(
+    AdmissionMiddleware,
+    routes={
+        "/api/analyze": "interactive",
+        "/api/analyze/stream": "interactive",
+        "/api/analyze/batch-jobs": "interactive",
+        "/api/score/candidates": "interactive",
+        "/api/candidates": "interactive",
+        "/api/candidates/search": "interactive",
+        "/api/offers": "interactive",
+        "/api/offers/search": "interactive",
+        "/api/offers/match": "interactive",
+        # Crear un lote solo valida las subidas y parsea la oferta; los CVs los procesan
+        # después los workers de la cola, que ya ocupan huecos "batch"
+        "/api/batches": "interactive",
+        "/api/analyze/zip": "batch"
+    }
 )
 
-# Configurar CORS para permitir peticiones desde el frontend
+# Rechazar subidas demasiado grandes antes de parsear el multipart
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    path_limits={
+        "/api/batches": config.BATCH_MAX_REQUEST_SIZE,
+        # El ZIP más los campos de texto
+        "/api/analyze/zip": config.ZIP_MAX_ARCHIVE_SIZE + 1024 * 1024
+    }
+)
+
+# Configurar CORS para permitir peticiones desde el frontend. Se añade el último
+# para que sea el más externo y también lleven sus cabeceras los 413 y 503 de arriba
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  
@@ -20,6 +94,12 @@ app.add_middleware(
 
 # Incluir rutas
 app.include_router(analyzer.router, prefix="/api", tags=["analyzer"])
+app.include_router(batches.router, prefix="/api", tags=["batches"])
+app.include_router(candidates.router, prefix="/api", tags=["candidates"])
+app.include_router(offers.router, prefix="/api", tags=["offers"])
+app.include_router(profiles.router, prefix="/api", tags=["profiles"])
+# /metrics sin prefijo, donde lo busca Prometheus por defecto
+app.include_router(metrics.router, tags=["metrics"])
 
 # Ruta de bienvenida
 @app.get("/")
@@ -28,4 +108,15 @@ async def root():
         "message": "CV Analyzer API",
         "status": "running",
         "version": "1.0.0"
-    }
\ No newline at end of file
+    }
+
+# Readiness: 503 hasta que termine el warm-up, para que el balanceador no envíe tráfico antes
+@app.get("/ready")
+async def ready():
+    return JSONResponse(
+        status_code=200 if readiness.ready else 503,
+        content={
+            **readiness.snapshot(),
+            "taxonomy": taxonomy_registry.status()
+        }
+    )
\ No newline at end of file
@@ -0,0 +1,167 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, List, Tuple
+
+from app import config
+from app.services.metrics import ADMISSION_REJECTIONS, ADMISSION_WAIT, CallbackMetric, LabelValues, metrics_registry
+
+# Tope del Retry-After sugerido, en segundos
+MAX_RETRY_AFTER = 60
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, traffic: str, reason: str, retry_after: int):
+        super().__init__(f"Capacidad de análisis '{traffic}' agotada ({reason})")
+        self.traffic = traffic
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """
+    Semáforo FIFO con cola acotada para un tipo de tráfico: como mucho
+    max_in_flight análisis a la vez y max_queue esperando, cada uno como
+    mucho queue_timeout segundos. Con la cola llena o el plazo vencido se
+    rechaza con AdmissionRejected en lugar de acumular trabajo que acabaría
+    disparando la latencia de todos. max_in_flight = 0 desactiva el límite.
+    """
+
+    def __init__(self, traffic: str, max_in_flight: int, max_queue: int, queue_timeout: float):
+        self.traffic = traffic
+        self.max_in_flight = max(0, max_in_flight)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # Media móvil de lo que se tarda en liberar un hueco, para el Retry-After
+        self._service_time = 1.0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def slot(self, wait: bool = False) -> AsyncIterator[None]:
+        """
+        Reserva un hueco durante el bloque. wait=True espera sin plazo ni
+        límite de cola (trabajo en segundo plano que no se puede rechazar).
+        """
+        await self.acquire(wait)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._service_time += 0.2 * (time.perf_counter() - start - self._service_time)
+            self.release()
+
+    async def acquire(self, wait: bool = False) -> None:
+        start = time.perf_counter()
+        if self.max_in_flight == 0 or (self.in_flight < self.max_in_flight and not self._waiters):
+            self.in_flight += 1
+            ADMISSION_WAIT.observe(0.0, traffic=self.traffic)
+            return
+
+        if not wait and len(self._waiters) >= self.max_queue:
+            self._reject("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            if wait:
+                await waiter
+            else:
+                await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._reject("timeout")
+        except asyncio.CancelledError:
+            # El cliente se ha ido: si ya se le había pasado el hueco, se devuelve
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+        ADMISSION_WAIT.observe(time.perf_counter() - start, traffic=self.traffic)
+
+    def release(self) -> None:
+        # El hueco pasa directamente al primero de la cola; in_flight no cambia
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def retry_after(self) -> int:
+        # Tiempo estimado hasta que se vacíe la cola actual
+        slots = max(1, self.max_in_flight)
+        estimate = self._service_time * (len(self._waiters) + 1) / slots
+        return min(MAX_RETRY_AFTER, max(1, math.ceil(estimate)))
+
+    def stats(self) -> Dict:
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout
+        }
+
+    def _reject(self, reason: str) -> None:
+        ADMISSION_REJECTIONS.inc(traffic=self.traffic, reason=reason)
+        raise AdmissionRejected(self.traffic, reason, self.retry_after())
+
+
+class AdmissionController:
+    """
+    Límites separados por tipo de tráfico: "interactive" (un CV por petición,
+    alguien esperando la respuesta) y "batch" (ZIPs y la cola de lotes), para
+    que el trabajo masivo no deje sin huecos a las peticiones interactivas.
+    """
+
+    def __init__(self, limiters: Dict[str, AdmissionLimiter]):
+        self.limiters = limiters
+
+    def limiter(self, traffic: str) -> AdmissionLimiter:
+        return self.limiters[traffic]
+
+    def stats(self) -> Dict[str, Dict]:
+        return {traffic: limiter.stats() for traffic, limiter in self.limiters.items()}
+
+    def _collect(self, attribute: str) -> List[Tuple[LabelValues, float]]:
+        return [((traffic,), getattr(limiter, attribute)) for traffic, limiter in self.limiters.items()]
+
+
+admission_controller = AdmissionController({
+    "interactive": AdmissionLimiter(
+        "interactive",
+        config.ADMISSION_INTERACTIVE_MAX_IN_FLIGHT,
+        config.ADMISSION_INTERACTIVE_MAX_QUEUE,
+        config.ADMISSION_INTERACTIVE_QUEUE_TIMEOUT
+    ),
+    "batch": AdmissionLimiter(
+        "batch",
+        config.ADMISSION_BATCH_MAX_IN_FLIGHT,
+        config.ADMISSION_BATCH_MAX_QUEUE,
+        config.ADMISSION_BATCH_QUEUE_TIMEOUT
+    )
+})
+
+metrics_registry.register(CallbackMetric(
+    "cv_analyzer_admission_in_flight",
+    "Análisis admitidos en curso por tipo de tráfico",
+    "gauge",
+    ["traffic"],
+    lambda: admission_controller._collect("in_flight")
+))
+metrics_registry.register(CallbackMetric(
+    "cv_analyzer_admission_queue_depth",
+    "Peticiones esperando hueco en el control de admisión por tipo de tráfico",
+    "gauge",
+    ["traffic"],
+    lambda: admission_controller._collect("queue_depth")
+))
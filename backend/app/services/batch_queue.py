@@ -0,0 +1,370 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from app import config
+
+# Estados de un lote
+BATCH_QUEUED = "queued"
+BATCH_RUNNING = "running"
+BATCH_COMPLETED = "completed"
+BATCH_CANCELLED = "cancelled"
+
+# Estados de cada CV del lote
+ITEM_PENDING = "pending"
+ITEM_RUNNING = "running"
+ITEM_DONE = "done"
+ITEM_FAILED = "failed"
+ITEM_CANCELLED = "cancelled"
+
+ITEM_STATES = (ITEM_PENDING, ITEM_RUNNING, ITEM_DONE, ITEM_FAILED, ITEM_CANCELLED)
+
+
+class BatchFile(NamedTuple):
+    filename: Optional[str]
+    size_bytes: int
+    sha256: str
+    # Lee el contenido del PDF al insertarlo (no se cargan todos a la vez en memoria)
+    read: Callable[[], bytes]
+
+
+class BatchItem(NamedTuple):
+    batch_id: str
+    item_index: int
+    filename: Optional[str]
+    size_bytes: int
+    sha256: str
+    pdf: bytes
+    attempts: int
+    job_analysis: Dict
+
+
+class BatchQueue:
+    """
+    Cola persistente (SQLite) de lotes de CVs a analizar contra una oferta.
+    Los PDFs se guardan en la propia base de datos hasta que se procesan,
+    así que un reinicio no pierde trabajo: los CVs que estaban en curso
+    vuelven a la cola con requeue_running().
+
+    Cada lote limita cuántos de sus CVs se procesan a la vez
+    (max_concurrency); claim() entrega el siguiente CV disponible
+    respetando ese límite y el orden de llegada de los lotes.
+
+    Pensada para un único proceso servidor, como el resto de almacenes.
+    """
+
+    def __init__(self, db_path: str = config.BATCH_QUEUE_DB):
+        self._lock = threading.Lock()
+        # id de lote -> análisis de la oferta (no cambia durante la vida del lote)
+        self._job_analyses: Dict[str, Dict] = {}
+
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._create_schema()
+
+    def create(
+        self,
+        offer_text: str,
+        job_analysis: Dict,
+        files: Iterable[BatchFile],
+        max_concurrency: int,
+        label: Optional[str] = None
+    ) -> str:
+        batch_id = uuid.uuid4().hex
+        now = time.time()
+
+        with self._lock:
+            try:
+                total = 0
+                for index, batch_file in enumerate(files):
+                    self._db.execute(
+                        "INSERT INTO batch_items "
+                        "(batch_id, item_index, filename, size_bytes, sha256, pdf, status, attempts, "
+                        "available_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?, ?)",
+                        (
+                            batch_id, index, batch_file.filename, batch_file.size_bytes,
+                            batch_file.sha256, batch_file.read(), ITEM_PENDING, now, now
+                        )
+                    )
+                    total += 1
+
+                self._db.execute(
+                    "INSERT INTO batches "
+                    "(id, label, offer_text, job_analysis, status, max_concurrency, total, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        batch_id, label, offer_text, json.dumps(job_analysis, ensure_ascii=False),
+                        BATCH_QUEUED, max(1, max_concurrency), total, now
+                    )
+                )
+                # Todo o nada: un lote a medio insertar no debe quedar en la cola
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+
+        return batch_id
+
+    def get(self, batch_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, label, status, max_concurrency, total, created_at, started_at, finished_at "
+                "FROM batches WHERE id = ?",
+                (batch_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            counts = dict(self._db.execute(
+                "SELECT status, COUNT(*) FROM batch_items WHERE batch_id = ? GROUP BY status",
+                (batch_id,)
+            ).fetchall())
+
+        progress = {state: counts.get(state, 0) for state in ITEM_STATES}
+        finished = progress[ITEM_DONE] + progress[ITEM_FAILED] + progress[ITEM_CANCELLED]
+        return {
+            "batch_id": row[0],
+            "label": row[1],
+            "status": row[2],
+            "max_concurrency": row[3],
+            "total": row[4],
+            "progress": progress,
+            "percent": round(finished / row[4] * 100, 2) if row[4] else 100.0,
+            "created_at": row[5],
+            "started_at": row[6],
+            "finished_at": row[7]
+        }
+
+    def job_analysis(self, batch_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self._get_job_analysis(batch_id)
+
+    def claim(self) -> Optional[BatchItem]:
+        """Marca como en curso el siguiente CV disponible y lo devuelve (None si no hay)."""
+        now = time.time()
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT i.batch_id, i.item_index, i.filename, i.size_bytes, i.sha256, i.pdf, i.attempts "
+                "FROM batch_items i JOIN batches b ON b.id = i.batch_id "
+                "WHERE i.status = ? AND i.available_at <= ? AND b.status IN (?, ?) "
+                "AND (SELECT COUNT(*) FROM batch_items r "
+                "     WHERE r.batch_id = i.batch_id AND r.status = ?) < b.max_concurrency "
+                "ORDER BY b.created_at, i.item_index LIMIT 1",
+                (ITEM_PENDING, now, BATCH_QUEUED, BATCH_RUNNING, ITEM_RUNNING)
+            ).fetchone()
+            if row is None:
+                return None
+
+            batch_id, item_index = row[0], row[1]
+            self._db.execute(
+                "UPDATE batch_items SET status = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE batch_id = ? AND item_index = ?",
+                (ITEM_RUNNING, now, batch_id, item_index)
+            )
+            self._db.execute(
+                "UPDATE batches SET status = ?, started_at = COALESCE(started_at, ?) "
+                "WHERE id = ? AND status = ?",
+                (BATCH_RUNNING, now, batch_id, BATCH_QUEUED)
+            )
+            self._db.commit()
+
+            return BatchItem(
+                batch_id, item_index, row[2], row[3], row[4], row[5], row[6] + 1,
+                self._get_job_analysis(batch_id)
+            )
+
+    def complete(self, batch_id: str, item_index: int, score: float, result: Dict) -> None:
+        self._finish_item(
+            batch_id, item_index, ITEM_DONE,
+            score=score, result=json.dumps(result, ensure_ascii=False)
+        )
+
+    def fail(self, batch_id: str, item_index: int, error: str) -> None:
+        self._finish_item(batch_id, item_index, ITEM_FAILED, error=error)
+
+    def retry(self, batch_id: str, item_index: int, error: str, delay: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE batch_items SET status = ?, error = ?, available_at = ?, updated_at = ? "
+                "WHERE batch_id = ? AND item_index = ? AND status = ?",
+                (ITEM_PENDING, error, now + delay, now, batch_id, item_index, ITEM_RUNNING)
+            )
+            self._db.commit()
+
+    def next_retry_delay(self) -> Optional[float]:
+        """Segundos hasta que un CV en espera de reintento vuelva a estar disponible."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT MIN(i.available_at) FROM batch_items i JOIN batches b ON b.id = i.batch_id "
+                "WHERE i.status = ? AND b.status IN (?, ?)",
+                (ITEM_PENDING, BATCH_QUEUED, BATCH_RUNNING)
+            ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    def finished_since(self, batch_id: str, after_seq: int = 0) -> List[Dict]:
+        """CVs terminados (o fallidos) en orden de finalización, a partir de after_seq."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT item_index, filename, status, score, error, attempts, finished_seq "
+                "FROM batch_items WHERE batch_id = ? AND finished_seq > ? ORDER BY finished_seq",
+                (batch_id, after_seq)
+            ).fetchall()
+
+        return [
+            {
+                "index": row[0],
+                "filename": row[1],
+                "status": row[2],
+                "total_score": row[3],
+                "error": row[4],
+                "attempts": row[5],
+                "seq": row[6]
+            }
+            for row in rows
+        ]
+
+    def results(self, batch_id: str, limit: Optional[int] = None, offset: int = 0) -> Dict:
+        """CVs analizados ordenados por score (desc) y los fallidos aparte."""
+        with self._lock:
+            ranked = self._db.execute(
+                "SELECT item_index, filename, score, result FROM batch_items "
+                "WHERE batch_id = ? AND status = ? ORDER BY score DESC, item_index LIMIT ? OFFSET ?",
+                (batch_id, ITEM_DONE, -1 if limit is None else limit, offset)
+            ).fetchall()
+            failed = self._db.execute(
+                "SELECT item_index, filename, error, attempts FROM batch_items "
+                "WHERE batch_id = ? AND status = ? ORDER BY item_index",
+                (batch_id, ITEM_FAILED)
+            ).fetchall()
+
+        return {
+            "results": [
+                {"rank": offset + position, "index": row[0], "filename": row[1], "total_score": row[2],
+                 **json.loads(row[3])}
+                for position, row in enumerate(ranked, start=1)
+            ],
+            "failed": [
+                {"index": row[0], "filename": row[1], "error": row[2], "attempts": row[3]}
+                for row in failed
+            ]
+        }
+
+    def cancel(self, batch_id: str) -> bool:
+        now = time.time()
+        with self._lock:
+            updated = self._db.execute(
+                "UPDATE batches SET status = ?, finished_at = ? WHERE id = ? AND status IN (?, ?)",
+                (BATCH_CANCELLED, now, batch_id, BATCH_QUEUED, BATCH_RUNNING)
+            ).rowcount
+            if updated:
+                # Los CVs en curso terminan; los pendientes ya no se procesan
+                self._db.execute(
+                    "UPDATE batch_items SET status = ?, pdf = NULL, updated_at = ? "
+                    "WHERE batch_id = ? AND status = ?",
+                    (ITEM_CANCELLED, now, batch_id, ITEM_PENDING)
+                )
+            self._db.commit()
+            return bool(updated)
+
+    def delete(self, batch_id: str) -> bool:
+        with self._lock:
+            deleted = self._db.execute("DELETE FROM batches WHERE id = ?", (batch_id,)).rowcount
+            self._db.execute("DELETE FROM batch_items WHERE batch_id = ?", (batch_id,))
+            self._db.commit()
+            self._job_analyses.pop(batch_id, None)
+            return bool(deleted)
+
+    def requeue_running(self) -> int:
+        """Devuelve a la cola los CVs que estaban en curso cuando se paró el servidor."""
+        with self._lock:
+            requeued = self._db.execute(
+                "UPDATE batch_items SET status = ?, available_at = ?, updated_at = ? WHERE status = ?",
+                (ITEM_PENDING, 0, time.time(), ITEM_RUNNING)
+            ).rowcount
+            self._db.commit()
+            return requeued
+
+    def _finish_item(self, batch_id: str, item_index: int, status: str, **fields) -> None:
+        now = time.time()
+        with self._lock:
+            # Número de orden de finalización dentro del lote (para el streaming de progreso)
+            seq = self._db.execute(
+                "SELECT COALESCE(MAX(finished_seq), 0) + 1 FROM batch_items WHERE batch_id = ?",
+                (batch_id,)
+            ).fetchone()[0]
+            self._db.execute(
+                "UPDATE batch_items SET status = ?, score = ?, result = ?, error = ?, pdf = NULL, "
+                "finished_seq = ?, updated_at = ? WHERE batch_id = ? AND item_index = ? AND status = ?",
+                (
+                    status, fields.get("score"), fields.get("result"), fields.get("error"),
+                    seq, now, batch_id, item_index, ITEM_RUNNING
+                )
+            )
+
+            remaining = self._db.execute(
+                "SELECT COUNT(*) FROM batch_items WHERE batch_id = ? AND status IN (?, ?)",
+                (batch_id, ITEM_PENDING, ITEM_RUNNING)
+            ).fetchone()[0]
+            if remaining == 0:
+                self._db.execute(
+                    "UPDATE batches SET status = ?, finished_at = ? WHERE id = ? AND status IN (?, ?)",
+                    (BATCH_COMPLETED, now, batch_id, BATCH_QUEUED, BATCH_RUNNING)
+                )
+                self._job_analyses.pop(batch_id, None)
+            self._db.commit()
+
+    def _get_job_analysis(self, batch_id: str) -> Optional[Dict]:
+        job_analysis = self._job_analyses.get(batch_id)
+        if job_analysis is None:
+            row = self._db.execute("SELECT job_analysis FROM batches WHERE id = ?", (batch_id,)).fetchone()
+            if row is None:
+                return None
+            job_analysis = json.loads(row[0])
+            self._job_analyses[batch_id] = job_analysis
+        return job_analysis
+
+    def _create_schema(self) -> None:
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS batches ("
+            "id TEXT PRIMARY KEY, label TEXT, offer_text TEXT NOT NULL, job_analysis TEXT NOT NULL, "
+            "status TEXT NOT NULL, max_concurrency INTEGER NOT NULL, total INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS batch_items ("
+            "batch_id TEXT NOT NULL, item_index INTEGER NOT NULL, filename TEXT, "
+            "size_bytes INTEGER NOT NULL, sha256 TEXT NOT NULL, pdf BLOB, status TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL, available_at REAL NOT NULL, score REAL, result TEXT, error TEXT, "
+            "finished_seq INTEGER, updated_at REAL NOT NULL, "
+            "PRIMARY KEY (batch_id, item_index))"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_batch_items_status ON batch_items (status, batch_id)"
+        )
+        self._db.commit()
+
+
+_batch_queue: Optional[BatchQueue] = None
+_batch_queue_lock = threading.Lock()
+
+
+def get_batch_queue() -> BatchQueue:
+    # Se abre en el primer uso para no crear la base de datos al importar
+    global _batch_queue
+    if _batch_queue is None:
+        with _batch_queue_lock:
+            if _batch_queue is None:
+                _batch_queue = BatchQueue()
+    return _batch_queue
+
+
+def batch_queue_exists() -> bool:
+    return _batch_queue is not None or Path(config.BATCH_QUEUE_DB).exists()
@@ -0,0 +1,236 @@
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional
+
+from app import config
+from app.services import pipeline
+from app.services.admission import AdmissionLimiter, admission_controller
+from app.services.batch_queue import BatchItem, BatchQueue, batch_queue_exists, get_batch_queue
+from app.services.executor import PipelineExecutor, PipelineTimeoutError, pipeline_executor
+from app.services.extraction_cache import extraction_cache
+from app.services.pdf_extractor import extraction_summary
+from app.services.metrics import BATCH_ITEMS, EXTRACTION_FAILURES, PDF_PAGES, RequestTimings
+
+# Espera máxima sin trabajo antes de volver a mirar la cola
+IDLE_POLL_INTERVAL = 5.0
+# Pausa antes de relanzar un worker que ha terminado por un error
+WORKER_RESTART_DELAY = 1.0
+
+
+class RetryableBatchError(Exception):
+    pass
+
+
+class PermanentBatchError(Exception):
+    pass
+
+
+class BatchRunner:
+    """
+    Pool de workers (tareas asyncio en el proceso del servidor) que vacía la
+    BatchQueue ejecutando el pipeline de siempre con pipeline_executor. El
+    trabajo CPU-bound sigue yendo al pool de procesos/hilos; aquí solo se
+    decide qué CV va a continuación.
+
+    Los fallos de extracción, los timeouts y la muerte de un worker se
+    reintentan hasta max_attempts veces con espera exponencial. Un PDF
+    cifrado o que supera los límites de extracción daría el mismo error en
+    cada intento, así que, como el resto de errores, marca el CV como
+    fallido directamente.
+
+    Cada CV ocupa un hueco del tráfico "batch" del control de admisión, el
+    mismo que los ZIPs: los workers esperan turno sin plazo en lugar de
+    quitar capacidad a las peticiones interactivas.
+    """
+
+    def __init__(
+        self,
+        queue_factory: Callable[[], BatchQueue] = get_batch_queue,
+        executor: Optional[PipelineExecutor] = None,
+        workers: int = config.BATCH_WORKERS,
+        max_attempts: int = config.BATCH_MAX_ATTEMPTS,
+        retry_delay: float = config.BATCH_RETRY_DELAY,
+        limiter: Optional[AdmissionLimiter] = None
+    ):
+        self.queue_factory = queue_factory
+        self.executor = executor or pipeline_executor
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        self.limiter = limiter or admission_controller.limiter("batch")
+
+        self._tasks: List[asyncio.Task] = []
+        self._queue: Optional[BatchQueue] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def start(self) -> None:
+        """
+        Arranca los workers (idempotente). Debe llamarse desde el event loop.
+        Si ya están arrancados solo se relanzan los que hayan terminado.
+        """
+        if self._tasks:
+            for number, task in enumerate(self._tasks):
+                if task.done():
+                    self._tasks[number] = self._spawn(number)
+            return
+
+        queue = self.queue_factory()
+        requeued = queue.requeue_running()
+        if requeued:
+            print(f"Cola de lotes: {requeued} CV(s) en curso devueltos a la cola tras el reinicio")
+
+        self._queue = queue
+        self._wakeup = asyncio.Event()
+        self._tasks = [self._spawn(number) for number in range(self.workers)]
+
+    def resume(self) -> None:
+        # Al arrancar el servidor solo hay algo que reanudar si la cola ya existe
+        if batch_queue_exists():
+            self.start()
+
+    def notify(self) -> None:
+        """Despierta a los workers parados (lote nuevo o hueco de concurrencia libre)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def stop(self) -> None:
+        # Se vacía antes de cancelar para que _worker_done no relance ninguno
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        # Los CVs interrumpidos se quedan "running" en disco y se reencolan al volver a arrancar
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _spawn(self, number: int, delay: float = 0.0) -> asyncio.Task:
+        task = asyncio.create_task(self._worker(self._queue, delay), name=f"batch-worker-{number}")
+        task.add_done_callback(lambda done: self._worker_done(number, done))
+        return task
+
+    def _worker_done(self, number: int, task: asyncio.Task) -> None:
+        # Un worker que muere por un error se relanza solo, sin esperar a que caigan los demás
+        if task.cancelled() or number >= len(self._tasks) or self._tasks[number] is not task:
+            return
+        print(f"Worker de lotes {number} terminado por un error ({task.exception()!r}), se relanza")
+        self._tasks[number] = self._spawn(number, WORKER_RESTART_DELAY)
+
+    async def _worker(self, queue: BatchQueue, delay: float = 0.0) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        while True:
+            # Se limpia antes de mirar la cola para no perder un aviso entre medias
+            self._wakeup.clear()
+            async with self.limiter.slot(wait=True):
+                try:
+                    item = await asyncio.to_thread(queue.claim)
+                except Exception as e:
+                    print(f"Error leyendo la cola de lotes: {e}")
+                    item = None
+                if item is not None:
+                    await self._process(queue, item)
+
+            if item is None:
+                retry_in = await asyncio.to_thread(queue.next_retry_delay)
+                timeout = IDLE_POLL_INTERVAL if retry_in is None else min(retry_in, IDLE_POLL_INTERVAL)
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # Queda un hueco libre en el lote: otro worker puede tomar su siguiente CV
+            self.notify()
+
+    async def _process(self, queue: BatchQueue, item: BatchItem) -> None:
+        timings = RequestTimings()
+
+        try:
+            with timings.stage("extraction"):
+                extraction_result = await self._extract(item)
+            with timings.stage("analysis"):
+                analysis = await self.executor.run(
+                    pipeline.analyze_parsed_job,
+                    extraction_result["text"],
+                    item.job_analysis
+                )
+        except RetryableBatchError as error:
+            await self._retry_or_fail(queue, item, str(error))
+            return
+        except PipelineTimeoutError:
+            await self._retry_or_fail(queue, item, "El análisis ha superado el tiempo máximo permitido")
+            return
+        except BrokenProcessPool:
+            await self._retry_or_fail(queue, item, "El worker terminó de forma abrupta")
+            return
+        except PermanentBatchError as error:
+            BATCH_ITEMS.inc(outcome="failed")
+            await asyncio.to_thread(queue.fail, item.batch_id, item.item_index, str(error))
+            return
+        except Exception as e:
+            BATCH_ITEMS.inc(outcome="failed")
+            await asyncio.to_thread(queue.fail, item.batch_id, item.item_index, f"Error inesperado: {e}")
+            return
+
+        timings.record_all(analysis["timings"])
+        BATCH_ITEMS.inc(outcome="done")
+        await asyncio.to_thread(
+            queue.complete,
+            item.batch_id,
+            item.item_index,
+            analysis["match_result"]["total_score"],
+            self._result_payload(item, extraction_result, analysis)
+        )
+
+    async def _extract(self, item: BatchItem) -> Dict:
+        # Misma caché que /api/analyze: un CV repetido entre lotes se extrae una vez
+        cached = extraction_cache.get(item.sha256)
+        if cached is not None:
+            return cached
+
+        try:
+            extraction_result = await self.executor.extract_text(item.pdf)
+        except PipelineTimeoutError:
+            EXTRACTION_FAILURES.inc(reason="timeout")
+            raise RetryableBatchError("La extracción del PDF ha superado el tiempo máximo permitido")
+
+        if not extraction_result["success"]:
+            EXTRACTION_FAILURES.inc(reason="error")
+            error = f"Error al extraer texto del PDF: {extraction_result.get('error', 'Error desconocido')}"
+            if not extraction_result.get("retryable", True):
+                raise PermanentBatchError(error)
+            raise RetryableBatchError(error)
+
+        # Páginas leídas de verdad: con la extracción acotada pueden ser menos que num_pages
+        PDF_PAGES.inc(extraction_result["pages_extracted"])
+        extraction_cache.put(item.sha256, extraction_result)
+        return extraction_result
+
+    async def _retry_or_fail(self, queue: BatchQueue, item: BatchItem, error: str) -> None:
+        if item.attempts >= self.max_attempts:
+            BATCH_ITEMS.inc(outcome="failed")
+            await asyncio.to_thread(queue.fail, item.batch_id, item.item_index, error)
+            return
+
+        BATCH_ITEMS.inc(outcome="retried")
+        delay = self.retry_delay * 2 ** (item.attempts - 1)
+        await asyncio.to_thread(queue.retry, item.batch_id, item.item_index, error, delay)
+
+    @staticmethod
+    def _result_payload(item: BatchItem, extraction_result: Dict, analysis: Dict) -> Dict:
+        # El análisis de la oferta es común a todo el lote y se devuelve una sola vez
+        return {
+            "cv_info": {
+                "filename": item.filename,
+                "size_bytes": item.size_bytes,
+                **extraction_summary(extraction_result)
+            },
+            "cv_analysis": analysis["cv_analysis"],
+            "match_result": analysis["match_result"],
+            "recommendations": analysis["recommendations"]
+        }
+
+
+batch_runner = BatchRunner()
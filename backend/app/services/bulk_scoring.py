@@ -0,0 +1,126 @@
+import threading
+from typing import Dict, List, Optional
+
+from app.services.scoring_engine import ScoringEngine
+from app.services.skill_matcher import SkillEncoder
+from app.services.taxonomy import TaxonomyRegistry, taxonomy_registry
+
+
+class CandidateMatrix:
+    """
+    Representación compacta de N CVs parseados:
+    - skill_bits[i]: bitset (int) con las skills del candidato i por ID canónico
+    - levels[i]: nivel de experiencia detectado
+    - context_scores[i]: score de contexto (no depende de la oferta)
+    """
+
+    def __init__(self, skill_bits: List[int], levels: List[str], context_scores: List[float]):
+        self.skill_bits = skill_bits
+        self.levels = levels
+        self.context_scores = context_scores
+
+    def __len__(self) -> int:
+        return len(self.skill_bits)
+
+
+class BulkScorer:
+    """
+    Scoring de muchos CVs contra una oferta. Las skills se codifican como
+    bitsets sobre los IDs canónicos de la taxonomía, de modo que la
+    coincidencia de cada candidato es un AND y un popcount. Produce los
+    mismos números que ScoringEngine.calculate_match.
+    """
+
+    def __init__(
+        self,
+        scoring_engine: Optional[ScoringEngine] = None,
+        registry: Optional[TaxonomyRegistry] = None
+    ):
+        self.registry = registry or taxonomy_registry
+        self.scoring_engine = scoring_engine or ScoringEngine(self.registry)
+        # Se crea en el primer uso: construir el servicio no carga la taxonomía
+        self._encoder: Optional[SkillEncoder] = None
+        self._encoder_lock = threading.Lock()
+
+    def encode_skills(self, skills: Dict[str, List[str]]) -> int:
+        return self._skill_encoder().encode_bits(skills)
+
+    def build_matrix(self, cv_analyses: List[Dict]) -> CandidateMatrix:
+        encoder = self._skill_encoder()
+        skill_bits = []
+        levels = []
+        context_scores = []
+
+        for cv_analysis in cv_analyses:
+            skill_bits.append(encoder.encode_bits(cv_analysis.get("technical_skills", {})))
+            levels.append(cv_analysis.get("experience", {}).get("level", "unknown"))
+            context_scores.append(
+                self.scoring_engine._calculate_context_match(cv_analysis.get("context", {}))["score"]
+            )
+
+        return CandidateMatrix(skill_bits, levels, context_scores)
+
+    def score(self, matrix: CandidateMatrix, job_analysis: Dict) -> List[Dict]:
+        weights = self.scoring_engine.weights
+        job_skills = job_analysis.get("required_skills", {})
+        job_experience = job_analysis.get("required_experience", {})
+
+        job_bits = self.encode_skills(job_skills)
+        total_required = job_bits.bit_count()
+
+        # Solo hay unos pocos niveles posibles: una entrada de tabla por nivel
+        experience_table: Dict[str, float] = {}
+        for level in set(matrix.levels):
+            experience_table[level] = self.scoring_engine._calculate_experience_match(
+                {"level": level},
+                job_experience
+            )["score"]
+
+        results = []
+        for index in range(len(matrix)):
+            found = (matrix.skill_bits[index] & job_bits).bit_count()
+
+            if not job_skills or total_required == 0:
+                skills_score = 100.0
+            else:
+                skills_score = (found / total_required) * 100
+
+            experience_score = experience_table[matrix.levels[index]]
+            context_score = matrix.context_scores[index]
+
+            total_score = (
+                skills_score * weights["skills"] +
+                experience_score * weights["experience"] +
+                context_score * weights["context"]
+            )
+
+            results.append({
+                "index": index,
+                "total_score": round(total_score, 2),
+                "breakdown": {
+                    "skills": round(skills_score, 2),
+                    "experience": round(experience_score, 2),
+                    "context": round(context_score, 2)
+                },
+                # Mismos conteos que breakdown.skills.details de calculate_match
+                "skills_required": total_required,
+                "skills_found": found
+            })
+
+        return results
+
+    def rank(self, matrix: CandidateMatrix, job_analysis: Dict, top_k: Optional[int] = None) -> List[Dict]:
+        results = self.score(matrix, job_analysis)
+        results.sort(key=lambda result: -result["total_score"])
+        return results if top_k is None else results[:top_k]
+
+    def _skill_encoder(self) -> SkillEncoder:
+        # Un único encoder para toda la vida del servicio: las matrices (p. ej. las del
+        # pool de candidatos) se construyen en un momento y se puntúan en otro
+        matcher = self.registry.get().skill_matcher
+        with self._encoder_lock:
+            if self._encoder is None:
+                self._encoder = SkillEncoder(matcher)
+            else:
+                self._encoder.refresh(matcher)
+            return self._encoder
@@ -1,36 +1,32 @@
-import json
-import re
-from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List, Optional
+from app.services.document_index import DocumentIndex
+from app.services.skill_matcher import SkillHit
+from app.services.taxonomy import Taxonomy, TaxonomyRegistry, taxonomy_registry
 
 class CVParser:
     
-    def __init__(self):
-        # Cargar las bases de datos
-        self.skills_db = self._load_json('skills_database.json')
-        self.keywords_db = self._load_json('keywords.json')
-    
-    def _load_json(self, filename: str) -> Dict:
-        try:
-            data_path = Path(__file__).parent.parent.parent / 'data' / filename
-            with open(data_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error cargando {filename}: {e}")
-            return {}
+    def __init__(self, registry: Optional[TaxonomyRegistry] = None):
+        # Taxonomía compartida por todo el proceso (skills, keywords y patrones precompilados)
+        self.registry = registry or taxonomy_registry
     
     def parse(self, cv_text: str) -> Dict:
-        # Normalizar texto para el análisis
-        normalized_text = cv_text.lower()
+        # Snapshot fijo durante todo el análisis aunque haya una recarga en paralelo
+        taxonomy = self.registry.get()
+        
+        # Normalizar y tokenizar el texto una sola vez para todos los extractores
+        document = taxonomy.index(cv_text)
+        
+        # Una sola pasada sobre el texto para skills, roles y metodologías
+        hits = taxonomy.skill_matcher.find(document.folded)
         
         # Extraer información
-        technical_skills = self._extract_technical_skills(normalized_text)
-        soft_skills = self._extract_soft_skills(normalized_text)
-        experience_info = self._extract_experience(normalized_text, cv_text)
-        context_info = self._extract_context(normalized_text)
-        roles = self._extract_roles(normalized_text)
-        certifications = self._extract_certifications(normalized_text, cv_text)
-        methodologies = self._extract_methodologies(normalized_text)
+        technical_skills = self._extract_technical_skills(hits)
+        soft_skills = self._extract_soft_skills(document, taxonomy)
+        experience_info = self._extract_experience(document, cv_text, taxonomy)
+        context_info = self._extract_context(document, taxonomy)
+        roles = self._extract_roles(hits)
+        certifications = self._extract_certifications(document, taxonomy)
+        methodologies = self._extract_methodologies(hits)
         
         return {
             "technical_skills": technical_skills,
@@ -47,45 +43,25 @@ class CVParser:
             )
         }
     
-    def _extract_technical_skills(self, text: str) -> Dict[str, List[str]]:
-        found_skills = {
-            "programming_languages": [],
-            "frameworks_backend": [],
-            "frameworks_frontend": [],
-            "mobile_development": [],
-            "databases": [],
-            "cloud_platforms": [],
-            "devops_tools": [],
-            "version_control": [],
-            "testing": [],
-            "data_science_ml": [],
-            "other_tools": []
-        }
+    def _extract_technical_skills(self, hits: List[SkillHit]) -> Dict[str, List[str]]:
+        found_skills = {}
         
-        technical_skills = self.skills_db.get('technical_skills', {})
-        
-        for category, skills_list in technical_skills.items():
-            for skill in skills_list:
-                # Buscar skill en el texto 
-                if re.search(r'\b' + re.escape(skill.lower()) + r'\b', text):
-                    found_skills[category].append(skill)
-        
-        # Eliminar categorías vacías
-        found_skills = {k: v for k, v in found_skills.items() if v}
+        for hit in hits:
+            if hit.kind == "technical_skills":
+                found_skills.setdefault(hit.category, []).append(hit.name)
         
         return found_skills
     
-    def _extract_soft_skills(self, text: str) -> List[str]:
+    def _extract_soft_skills(self, document: DocumentIndex, taxonomy: Taxonomy) -> List[str]:
         found_skills = []
-        soft_skills = self.skills_db.get('soft_skills', [])
         
-        for skill in soft_skills:
-            if skill.lower() in text:
+        for skill, key in taxonomy.soft_skill_keys:
+            if document.contains(key):
                 found_skills.append(skill)
         
         return found_skills
     
-    def _extract_experience(self, text: str, original_text: str) -> Dict:
+    def _extract_experience(self, document: DocumentIndex, original_text: str, taxonomy: Taxonomy) -> Dict:
         experience_data = {
             "years_detected": [],
             "level": "unknown",
@@ -93,46 +69,38 @@ class CVParser:
         }
         
         # Buscar patrones de años de experiencia
-        patterns = self.keywords_db.get('experience_patterns', {}).get('years_experience', [])
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
+        for pattern in taxonomy.years_patterns:
+            matches = pattern.findall(document.lowered)
             if matches:
                 experience_data["years_detected"].extend(matches)
         
         # Detectar nivel 
-        levels = self.skills_db.get('experience_keywords', {}).get('experience_levels', {})
-        
-        for level, keywords in levels.items():
+        for level, keywords in taxonomy.experience_levels:
             for keyword in keywords:
-                if keyword.lower() in text:
+                if document.contains(keyword):
                     experience_data["level"] = level
                     break
             if experience_data["level"] != "unknown":
                 break
         
         # Buscar periodos de tiempo
-        time_patterns = self.keywords_db.get('experience_patterns', {}).get('time_periods', [])
-        for pattern in time_patterns:
-            matches = re.findall(pattern, original_text)
+        for pattern in taxonomy.time_period_patterns:
+            matches = pattern.findall(original_text)
             experience_data["details"].extend(matches)
         
         return experience_data
     
-    def _extract_context(self, text: str) -> Dict[str, int]:
+    def _extract_context(self, document: DocumentIndex, taxonomy: Taxonomy) -> Dict[str, int]:
         context_counts = {
             "professional": 0,
             "academic": 0,
             "personal": 0
         }
         
-        context_keywords = self.skills_db.get('context_keywords', {})
-        
-        for context_type, keywords in context_keywords.items():
-            for keyword in keywords:
-                # Contar cuántas veces aparece cada keyword
-                count = len(re.findall(r'\b' + re.escape(keyword.lower()) + r'\b', text))
-                context_counts[context_type] += count
+        for context_type, key in taxonomy.context_keys:
+            # Contar cuántas veces aparece cada keyword
+            count = document.count(key)
+            context_counts[context_type] = context_counts.get(context_type, 0) + count
         
         # Calcular porcentajes
         total = sum(context_counts.values())
@@ -150,35 +118,20 @@ class CVParser:
             "dominant": max(context_percentages, key=context_percentages.get)
         }
     
-    def _extract_roles(self, text: str) -> List[str]:
-        found_roles = []
-        roles = self.skills_db.get('job_roles', [])
-        
-        for role in roles:
-            if re.search(r'\b' + re.escape(role.lower()) + r'\b', text):
-                found_roles.append(role)
-        
-        return found_roles
+    def _extract_roles(self, hits: List[SkillHit]) -> List[str]:
+        return [hit.name for hit in hits if hit.kind == "job_roles"]
     
-    def _extract_certifications(self, text: str, original_text: str) -> List[str]:
+    def _extract_certifications(self, document: DocumentIndex, taxonomy: Taxonomy) -> List[str]:
         found_certs = []
-        certifications = self.skills_db.get('certifications', [])
         
-        for cert in certifications:
-            if cert.lower() in text:
+        for cert, key in taxonomy.certification_keys:
+            if document.contains(key):
                 found_certs.append(cert)
         
         return found_certs
     
-    def _extract_methodologies(self, text: str) -> List[str]:
-        found_methods = []
-        methodologies = self.skills_db.get('methodologies', [])
-        
-        for method in methodologies:
-            if re.search(r'\b' + re.escape(method.lower()) + r'\b', text):
-                found_methods.append(method)
-        
-        return found_methods
+    def _extract_methodologies(self, hits: List[SkillHit]) -> List[str]:
+        return [hit.name for hit in hits if hit.kind == "methodologies"]
     
     def _generate_summary(
         self, 
@@ -0,0 +1,219 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from app import config
+from app.services.bulk_scoring import BulkScorer, CandidateMatrix
+from app.services.scoring_engine import ScoringEngine
+
+
+class CVStore:
+    """
+    Almacén persistente (SQLite) de CVs ya parseados con un índice invertido
+    skill / rol / metodología -> candidatos. El índice se mantiene de forma
+    incremental en altas y bajas, tanto en disco como en memoria.
+
+    La búsqueda solo puntúa a los candidatos que comparten al menos una skill
+    requerida con la oferta, usando la misma fórmula que ScoringEngine.
+    """
+
+    def __init__(
+        self,
+        db_path: str = config.CV_STORE_DB,
+        scoring_engine: Optional[ScoringEngine] = None
+    ):
+        self.scoring_engine = scoring_engine or ScoringEngine()
+        self.bulk_scorer = BulkScorer(self.scoring_engine)
+        self._lock = threading.RLock()
+
+        # (kind, term) -> ids de candidatos
+        self._postings: Dict[Tuple[str, str], Set[str]] = {}
+        # id -> términos indexados del candidato (para bajas incrementales)
+        self._candidate_terms: Dict[str, Set[Tuple[str, str]]] = {}
+        # id -> (bitset de skills, nivel, score de contexto)
+        self._rows: Dict[str, Tuple[int, str, float]] = {}
+
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._create_schema()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, cv_analysis: Dict, candidate_id: Optional[str] = None, label: Optional[str] = None) -> str:
+        candidate_id = candidate_id or uuid.uuid4().hex
+        terms = self._terms_for(cv_analysis)
+
+        with self._lock:
+            if candidate_id in self._rows:
+                self._remove_postings(candidate_id)
+
+            self._db.execute(
+                "INSERT OR REPLACE INTO candidates (id, label, analysis, created_at) VALUES (?, ?, ?, ?)",
+                (candidate_id, label, json.dumps(cv_analysis, ensure_ascii=False), time.time())
+            )
+            self._db.execute("DELETE FROM candidate_terms WHERE candidate_id = ?", (candidate_id,))
+            self._db.executemany(
+                "INSERT INTO candidate_terms (kind, term, candidate_id) VALUES (?, ?, ?)",
+                [(kind, term, candidate_id) for kind, term in terms]
+            )
+            self._db.commit()
+
+            for key in terms:
+                self._postings.setdefault(key, set()).add(candidate_id)
+            self._candidate_terms[candidate_id] = terms
+            self._rows[candidate_id] = self._encode(cv_analysis)
+
+        return candidate_id
+
+    def delete(self, candidate_id: str) -> bool:
+        with self._lock:
+            if candidate_id not in self._rows:
+                return False
+
+            self._db.execute("DELETE FROM candidate_terms WHERE candidate_id = ?", (candidate_id,))
+            self._db.execute("DELETE FROM candidates WHERE id = ?", (candidate_id,))
+            self._db.commit()
+
+            self._remove_postings(candidate_id)
+            del self._rows[candidate_id]
+            return True
+
+    def get(self, candidate_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, label, analysis, created_at FROM candidates WHERE id = ?",
+                (candidate_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return {
+            "candidate_id": row[0],
+            "label": row[1],
+            "cv_analysis": json.loads(row[2]),
+            "created_at": row[3]
+        }
+
+    def candidates_with(self, kind: str, term: str) -> Set[str]:
+        with self._lock:
+            return set(self._postings.get((kind, term.lower()), set()))
+
+    def search(self, job_analysis: Dict, top_k: int = 10) -> Dict:
+        matcher = self.scoring_engine.registry.get().skill_matcher
+        # Nombre canónico y el tal cual: los candidatos indexados antes de añadir un alias
+        # siguen con la variante que se detectó entonces
+        required_terms = {
+            ("skill", name.lower())
+            for skills_list in job_analysis.get("required_skills", {}).values()
+            for skill in skills_list
+            for name in (skill, matcher.canonical_name(skill))
+        }
+
+        with self._lock:
+            if required_terms:
+                # Poda con el índice: solo candidatos con alguna skill requerida
+                candidate_ids: Set[str] = set()
+                for key in required_terms:
+                    candidate_ids |= self._postings.get(key, set())
+            else:
+                # Sin skills requeridas no hay nada con lo que podar
+                candidate_ids = set(self._rows)
+
+            ordered_ids = sorted(candidate_ids)
+            rows = [self._rows[candidate_id] for candidate_id in ordered_ids]
+            pool_size = len(self._rows)
+
+        matrix = CandidateMatrix(
+            [row[0] for row in rows],
+            [row[1] for row in rows],
+            [row[2] for row in rows]
+        )
+        ranked = self.bulk_scorer.rank(matrix, job_analysis, top_k)
+
+        results = []
+        for result in ranked:
+            candidate_id = ordered_ids[result.pop("index")]
+            stored = self.get(candidate_id)
+            if stored is None:
+                continue
+            results.append({
+                "candidate_id": candidate_id,
+                "label": stored["label"],
+                **result,
+                "match_result": self.scoring_engine.calculate_match(stored["cv_analysis"], job_analysis)
+            })
+
+        return {
+            "pool_size": pool_size,
+            "scored": len(ordered_ids),
+            "results": results
+        }
+
+    def _terms_for(self, cv_analysis: Dict) -> Set[Tuple[str, str]]:
+        matcher = self.scoring_engine.registry.get().skill_matcher
+        terms = {
+            ("skill", matcher.canonical_name(skill).lower())
+            for skills_list in cv_analysis.get("technical_skills", {}).values()
+            for skill in skills_list
+        }
+        terms.update(("role", role.lower()) for role in cv_analysis.get("roles", []))
+        terms.update(("methodology", method.lower()) for method in cv_analysis.get("methodologies", []))
+        return terms
+
+    def _encode(self, cv_analysis: Dict) -> Tuple[int, str, float]:
+        matrix = self.bulk_scorer.build_matrix([cv_analysis])
+        return matrix.skill_bits[0], matrix.levels[0], matrix.context_scores[0]
+
+    def _remove_postings(self, candidate_id: str) -> None:
+        for key in self._candidate_terms.pop(candidate_id, set()):
+            ids = self._postings.get(key)
+            if ids is not None:
+                ids.discard(candidate_id)
+                if not ids:
+                    del self._postings[key]
+
+    def _create_schema(self) -> None:
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS candidates ("
+            "id TEXT PRIMARY KEY, label TEXT, analysis TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS candidate_terms ("
+            "kind TEXT NOT NULL, term TEXT NOT NULL, candidate_id TEXT NOT NULL, "
+            "PRIMARY KEY (kind, term, candidate_id)) WITHOUT ROWID"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_candidate_terms_candidate ON candidate_terms (candidate_id)"
+        )
+        self._db.commit()
+
+    def _load(self) -> None:
+        # El índice se lee tal cual de disco; no hace falta reconstruirlo
+        for kind, term, candidate_id in self._db.execute("SELECT kind, term, candidate_id FROM candidate_terms"):
+            self._postings.setdefault((kind, term), set()).add(candidate_id)
+            self._candidate_terms.setdefault(candidate_id, set()).add((kind, term))
+
+        for candidate_id, analysis in self._db.execute("SELECT id, analysis FROM candidates"):
+            self._rows[candidate_id] = self._encode(json.loads(analysis))
+
+
+_cv_store: Optional[CVStore] = None
+_cv_store_lock = threading.Lock()
+
+
+def get_cv_store() -> CVStore:
+    # Se abre en el primer uso para no crear la base de datos al importar
+    global _cv_store
+    if _cv_store is None:
+        with _cv_store_lock:
+            if _cv_store is None:
+                _cv_store = CVStore()
+    return _cv_store
@@ -0,0 +1,72 @@
+import re
+import unicodedata
+from collections import Counter
+from typing import List
+
+_TOKEN = re.compile(r'\w+')
+
+
+def fold_text(text: str) -> str:
+    """Minúsculas y sin acentos ni diacríticos ("Gestión" -> "gestion")."""
+    lowered = text.lower()
+    if lowered.isascii():
+        return lowered
+    decomposed = unicodedata.normalize('NFKD', lowered)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(fold_text(text))
+
+
+def phrase_key(phrase: str) -> str:
+    """Clave de búsqueda de una keyword: sus tokens normalizados separados por un espacio."""
+    return ' '.join(tokenize(phrase))
+
+
+class DocumentIndex:
+    """
+    Representación de un documento construida una sola vez y compartida por
+    todos los extractores:
+    - lowered: texto en minúsculas (para patrones regex de la taxonomía)
+    - folded: minúsculas sin acentos (para el matcher de skills)
+    - tokens: secuencia de palabras de `folded`
+    - ngrams: frecuencia de cada n-grama de 1 a max_ngram tokens
+
+    Las keywords se buscan por n-grama completo, así que "go" ya no aparece
+    dentro de "google" ni "lead" dentro de "leading".
+    """
+
+    def __init__(self, text: str, max_ngram: int = 1):
+        self.lowered = text.lower()
+        self.folded = fold_text(text)
+        self.tokens = _TOKEN.findall(self.folded)
+        self.max_ngram = max(1, max_ngram)
+
+        tokens = self.tokens
+        self.ngrams = Counter(tokens)
+        for size in range(2, self.max_ngram + 1):
+            self.ngrams.update(
+                ' '.join(tokens[start:start + size])
+                for start in range(len(tokens) - size + 1)
+            )
+
+    def count(self, key: str) -> int:
+        """Apariciones de una keyword ya convertida con phrase_key."""
+        if not key:
+            return 0
+
+        size = key.count(' ') + 1
+        if size <= self.max_ngram:
+            return self.ngrams.get(key, 0)
+
+        # Frase más larga que los n-gramas indexados: recorrido de los tokens
+        words = key.split(' ')
+        return sum(
+            1
+            for start in range(len(self.tokens) - size + 1)
+            if self.tokens[start:start + size] == words
+        )
+
+    def contains(self, key: str) -> bool:
+        return self.count(key) > 0
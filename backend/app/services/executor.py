@@ -0,0 +1,326 @@
+import asyncio
+import copy
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Union
+
+from app import config
+from app.services import pipeline
+from app.services.job_cache import JobParseCache, job_parse_cache, normalize_offer_text
+from app.services.metrics import PDF_BACKEND_DURATION, PDF_BACKEND_FALLBACKS, PDF_TRUNCATIONS
+from app.services.pdf_extractor import TextBudget
+from app.services.taxonomy import taxonomy_registry
+from app.services.worker_pool import WorkerPool, WorkerTimeoutError
+
+
+class PipelineTimeoutError(Exception):
+    pass
+
+
+class PipelineExecutor:
+    """
+    Ejecuta las etapas CPU-bound del pipeline fuera del event loop.
+    Modos:
+    - "process": pool de procesos acotado; el timeout cuenta desde que la
+      tarea empieza en un worker (no mientras espera uno libre) y al
+      superarlo se termina solo ese worker
+    - "thread": pool de hilos (el timeout no puede interrumpir la tarea)
+    - "inline": ejecución directa en el event loop, como antes; no aplica
+      el timeout (para depurar y perfilar, no para producción)
+    """
+
+    def __init__(
+        self,
+        mode: str = config.EXECUTION_MODE,
+        max_workers: int = config.MAX_WORKERS,
+        task_timeout: float = config.TASK_TIMEOUT,
+        page_parallel_threshold: int = config.PAGE_PARALLEL_THRESHOLD,
+        pages_per_chunk: int = config.PAGES_PER_CHUNK,
+        max_pages: int = config.PDF_MAX_PAGES,
+        max_chars: int = config.PDF_MAX_CHARS,
+        worker_memory_limit: int = config.WORKER_MEMORY_LIMIT,
+        job_cache: Optional[JobParseCache] = None
+    ):
+        if mode not in ("process", "thread", "inline"):
+            print(f"Modo de ejecución desconocido '{mode}', usando 'process'")
+            mode = "process"
+
+        self.mode = mode
+        self.max_workers = max(1, max_workers)
+        self.task_timeout = task_timeout
+        self.page_parallel_threshold = page_parallel_threshold
+        self.pages_per_chunk = max(1, pages_per_chunk)
+        # Límites de la extracción acotada que se aplican al repartir y unir bloques de páginas
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.worker_memory_limit = worker_memory_limit
+        # La caché de ofertas vive en este proceso, compartida por todos los workers
+        self.job_cache = job_cache or job_parse_cache
+
+        self._process_pool: Optional[WorkerPool] = None
+        # Un hilo por worker espera el resultado de su tarea sin bloquear el event loop
+        self._dispatch_pool: Optional[ThreadPoolExecutor] = None
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+
+    async def run(self, func: Callable, *args, timeout: Optional[float] = None) -> Any:
+        timeout = self.task_timeout if timeout is None else timeout
+
+        if self.mode == "inline":
+            # Sin timeout: la tarea corre en el propio event loop y no hay dónde interrumpirla
+            return func(*args)
+
+        if self.mode == "thread":
+            loop = asyncio.get_running_loop()
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(self._get_thread_pool(), func, *args),
+                    timeout
+                )
+            except asyncio.TimeoutError:
+                raise PipelineTimeoutError(f"La tarea superó el límite de {timeout}s")
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_process_pool()
+        try:
+            return await loop.run_in_executor(self._dispatch_pool, pool.call, func, args, timeout)
+        except WorkerTimeoutError:
+            raise PipelineTimeoutError(f"La tarea superó el límite de {timeout}s")
+
+    async def extract_text(
+        self,
+        pdf_source: Union[bytes, BinaryIO],
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> Dict:
+        """
+        Extrae el texto del PDF. Con on_progress(páginas_hechas, total) los
+        documentos de más de pages_per_chunk páginas se procesan por bloques
+        y se notifica cada bloque terminado.
+        """
+        result = await self._extract_text(pdf_source, on_progress)
+        record_truncation(result)
+        return result
+
+    async def _extract_text(
+        self,
+        pdf_source: Union[bytes, BinaryIO],
+        on_progress: Optional[Callable[[int, int], None]]
+    ) -> Dict:
+        if self.mode == "process":
+            # Entre procesos solo se pueden enviar bytes
+            if not isinstance(pdf_source, (bytes, bytearray)):
+                pdf_source.seek(0)
+                pdf_source = pdf_source.read()
+            pdf_source = bytes(pdf_source)
+
+        parallel = self.mode == "process" and self.page_parallel_threshold > 0
+        if not parallel and on_progress is None:
+            # En modo thread/inline el extractor lee directamente del fichero recibido
+            return await self._extract(pdf_source)
+
+        try:
+            num_pages = await self.run(pipeline.count_pdf_pages, pdf_source)
+        except PipelineTimeoutError:
+            raise
+        except Exception:
+            # PDF ilegible: que la extracción normal devuelva el error
+            return await self._extract(pdf_source)
+
+        # Solo se reparten las páginas que se van a leer
+        pages_to_read = min(num_pages, self.max_pages) if self.max_pages else num_pages
+        split = (
+            (parallel and pages_to_read >= self.page_parallel_threshold) or
+            (on_progress is not None and pages_to_read > self.pages_per_chunk)
+        )
+        if not split:
+            result = await self._extract(pdf_source)
+            if on_progress is not None and result["success"]:
+                on_progress(pages_to_read, pages_to_read)
+            return result
+
+        pages_done = 0
+
+        async def extract_chunk(first_page: int, last_page: int) -> Dict:
+            nonlocal pages_done
+            result = await self._extract(pdf_source, first_page, last_page)
+            pages_done += last_page - first_page
+            if on_progress is not None and result["success"]:
+                on_progress(pages_done, pages_to_read)
+            return result
+
+        ranges = [
+            (start, min(start + self.pages_per_chunk, pages_to_read))
+            for start in range(0, pages_to_read, self.pages_per_chunk)
+        ]
+        if self.mode == "process":
+            chunks = await asyncio.gather(*(extract_chunk(first, last) for first, last in ranges))
+        else:
+            # Un mismo fichero no se puede leer desde varios hilos a la vez; en serie se
+            # puede parar en cuanto un bloque se corta o se llena el presupuesto de caracteres
+            chunks = []
+            characters = 0
+            for first, last in ranges:
+                chunk = await extract_chunk(first, last)
+                chunks.append(chunk)
+                characters += chunk["num_characters"]
+                if not chunk["success"] or chunk.get("truncated") or (self.max_chars and characters >= self.max_chars):
+                    break
+        return self._merge_chunks(list(chunks))
+
+    async def analyze(self, cv_text: str, job_text: str) -> Dict:
+        normalized_text = normalize_offer_text(job_text)
+        cache_key = self._job_cache_key(normalized_text)
+
+        job_analysis = self.job_cache.get(cache_key)
+        if job_analysis is not None:
+            return await self.run(pipeline.analyze_parsed_job, cv_text, job_analysis)
+
+        analysis = await self.run(pipeline.analyze_texts, cv_text, normalized_text)
+        self.job_cache.put(cache_key, analysis["job_analysis"])
+        return analysis
+
+    async def parse_job(self, job_text: str) -> Dict:
+        return (await self.parse_jobs([job_text]))[0]
+
+    async def parse_jobs(self, job_texts: List[str]) -> List[Dict]:
+        results: List[Optional[Dict]] = []
+        pending: Dict[str, List[int]] = {}
+
+        for index, job_text in enumerate(job_texts):
+            normalized_text = normalize_offer_text(job_text)
+            cached = self.job_cache.get(self._job_cache_key(normalized_text))
+            results.append(cached)
+            if cached is None:
+                # Ofertas repetidas dentro del lote se parsean una sola vez
+                pending.setdefault(normalized_text, []).append(index)
+
+        if pending:
+            texts = list(pending)
+            parsed = await self._parse_uncached(texts)
+            for normalized_text, job_analysis in zip(texts, parsed):
+                self.job_cache.put(self._job_cache_key(normalized_text), job_analysis)
+                for position, index in enumerate(pending[normalized_text]):
+                    results[index] = job_analysis if position == 0 else copy.deepcopy(job_analysis)
+
+        return results
+
+    async def _parse_uncached(self, job_texts: List[str]) -> List[Dict]:
+        if self.mode == "inline" or len(job_texts) <= 1:
+            return await self.run(pipeline.parse_jobs, job_texts)
+
+        # Un lote por worker para repartir el parseo sin serializar oferta a oferta
+        batch_size = -(-len(job_texts) // self.max_workers)
+        batches = [
+            self.run(pipeline.parse_jobs, job_texts[start:start + batch_size])
+            for start in range(0, len(job_texts), batch_size)
+        ]
+        return [job for batch in await asyncio.gather(*batches) for job in batch]
+
+    async def warm_up(self) -> None:
+        """
+        Arranca los workers y carga en ellos la taxonomía y los backends de PDF antes de la
+        primera petición. El proceso principal también necesita la taxonomía
+        (versión para las claves de la caché de ofertas).
+        """
+        await asyncio.to_thread(taxonomy_registry.get)
+        if self.mode == "process":
+            # Una tarea por worker: el pool crea los procesos al recibir trabajo
+            await asyncio.gather(*(self.run(pipeline.warm_up) for _ in range(self.max_workers)))
+        else:
+            await self.run(pipeline.warm_up)
+
+    async def _extract(self, pdf_source: Union[bytes, BinaryIO], *page_range: int) -> Dict:
+        result = await self.run(pipeline.extract_pdf, pdf_source, *page_range)
+        record_backend_timings(result)
+        return result
+
+    def _job_cache_key(self, normalized_text: str) -> str:
+        return self.job_cache.key_for(normalized_text, taxonomy_registry.version)
+
+    def shutdown(self) -> None:
+        if self._dispatch_pool is not None:
+            self._dispatch_pool.shutdown(wait=False, cancel_futures=True)
+            self._dispatch_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+            self._thread_pool = None
+
+    def _merge_chunks(self, results: List[Dict]) -> Dict:
+        for result in results:
+            if not result["success"]:
+                return result
+
+        # El presupuesto de caracteres es del documento, no de cada bloque, y un bloque
+        # cortado (tiempo, tamaño) deja fuera los siguientes para que el texto sea un prefijo
+        budget = TextBudget(self.max_chars)
+        pages_extracted = 0
+        truncation_reason = None
+        for result in results:
+            if budget.full():
+                truncation_reason = "max_chars"
+                break
+            budget.add(result["text"])
+            pages_extracted += result.get("pages_extracted", 0)
+            if result.get("truncated"):
+                truncation_reason = result["truncation_reason"]
+                break
+        if truncation_reason is None and budget.truncated:
+            truncation_reason = "max_chars"
+
+        num_pages = results[0]["num_pages"]
+        if truncation_reason is None and self.max_pages and num_pages > self.max_pages:
+            truncation_reason = "max_pages"
+
+        full_text = budget.text()
+        return {
+            "success": True,
+            "text": full_text,
+            "num_pages": num_pages,
+            "num_characters": len(full_text),
+            "pages_extracted": pages_extracted,
+            "truncated": truncation_reason is not None,
+            "truncation_reason": truncation_reason,
+            "metadata": results[0].get("metadata", {}),
+            "backend": results[0].get("backend")
+        }
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="cv-pipeline"
+            )
+        return self._thread_pool
+
+    def _get_process_pool(self) -> WorkerPool:
+        if self._process_pool is None:
+            # "spawn" evita heredar hilos y estado del servidor al hacer fork
+            self._process_pool = WorkerPool(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=pipeline.init_worker,
+                initargs=(self.worker_memory_limit,)
+            )
+            self._dispatch_pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="cv-dispatch"
+            )
+        return self._process_pool
+
+
+def record_backend_timings(extraction_result: Dict) -> None:
+    # Las métricas viven en el proceso principal: los tiempos de cada backend llegan en el resultado
+    for timing in extraction_result.pop("backend_timings", []):
+        PDF_BACKEND_DURATION.observe(timing["seconds"], backend=timing["backend"], outcome=timing["outcome"])
+        if timing["outcome"] != "ok":
+            PDF_BACKEND_FALLBACKS.inc(backend=timing["backend"], reason=timing["reason"] or "")
+
+
+def record_truncation(extraction_result: Dict) -> None:
+    if extraction_result.get("truncated"):
+        PDF_TRUNCATIONS.inc(reason=extraction_result["truncation_reason"])
+
+
+pipeline_executor = PipelineExecutor()
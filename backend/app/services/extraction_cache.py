@@ -0,0 +1,190 @@
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from app import config
+
+
+def config_namespace() -> str:
+    """
+    Espacio de claves de la configuración de extracción actual: backends y
+    límites de la extracción acotada. El texto guardado depende de ellos y
+    el nivel en disco sobrevive a reinicios con otra configuración.
+    """
+    settings = [
+        config.PDF_BACKENDS,
+        config.PDF_MAX_PAGES,
+        config.PDF_MAX_CHARS,
+        config.PDF_PAGE_TIME_LIMIT,
+        config.PDF_MAX_STREAM_SIZE
+    ]
+    return hashlib.sha256(json.dumps(settings).encode('utf-8')).hexdigest()[:12]
+
+
+class ExtractionCache:
+    """
+    Caché de resultados de extracción indexada por el hash SHA-256 del PDF
+    dentro del espacio de claves de la configuración de extracción.
+    - Nivel en memoria: LRU acotado por tamaño aproximado en bytes
+    - Nivel en disco (opcional): SQLite, sobrevive a reinicios
+    Solo se guardan extracciones correctas.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = config.EXTRACTION_CACHE_MAX_BYTES,
+        db_path: Optional[str] = config.EXTRACTION_CACHE_DB,
+        max_disk_entries: int = config.EXTRACTION_CACHE_DISK_MAX_ENTRIES,
+        namespace: Optional[str] = None
+    ):
+        self.max_bytes = max_bytes
+        self.max_disk_entries = max_disk_entries
+        # Las entradas de otra configuración (backends, límites) no se leen y acaban desalojadas
+        self.namespace = config_namespace() if namespace is None else namespace
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Dict, int]]" = OrderedDict()
+        self._current_bytes = 0
+
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = self._open_db(db_path)
+
+    @staticmethod
+    def key_for(pdf_bytes: bytes) -> str:
+        return hashlib.sha256(pdf_bytes).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        key = f"{self.namespace}:{key}"
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return copy.deepcopy(entry[0])
+
+            result = self._db_get(key)
+            if result is not None:
+                self._disk_hits += 1
+                self._store(key, result)
+                return copy.deepcopy(result)
+
+            self._misses += 1
+            return None
+
+    def put(self, key: str, result: Dict) -> None:
+        if not result.get("success"):
+            return
+
+        key = f"{self.namespace}:{key}"
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._store(key, result)
+            self._db_put(key, result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM extractions")
+                self._db.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._hits + self._disk_hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round((self._hits + self._disk_hits) / lookups, 4) if lookups else 0.0,
+                "disk_enabled": self._db is not None,
+                "namespace": self.namespace
+            }
+
+    def _store(self, key: str, result: Dict) -> None:
+        size = self._estimate_size(result)
+        if size > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._current_bytes -= previous[1]
+
+        self._entries[key] = (result, size)
+        self._current_bytes += size
+
+        while self._current_bytes > self.max_bytes and self._entries:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._current_bytes -= evicted_size
+            self._evictions += 1
+
+    @staticmethod
+    def _estimate_size(result: Dict) -> int:
+        # Texto en UTF-8 más un margen fijo para metadatos y estructura
+        return len(result.get("text", "").encode("utf-8")) + 512
+
+    def _open_db(self, db_path: str) -> Optional[sqlite3.Connection]:
+        try:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(db_path, check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS extractions ("
+                "key TEXT PRIMARY KEY, result TEXT NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS idx_extractions_accessed ON extractions (accessed_at)")
+            db.commit()
+            return db
+        except Exception as e:
+            print(f"Error abriendo la caché en disco {db_path}: {e}")
+            return None
+
+    def _db_get(self, key: str) -> Optional[Dict]:
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute("SELECT result FROM extractions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE extractions SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+            return json.loads(row[0])
+        except Exception as e:
+            print(f"Error leyendo la caché en disco: {e}")
+            return None
+
+    def _db_put(self, key: str, result: Dict) -> None:
+        if self._db is None:
+            return
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO extractions (key, result, accessed_at) VALUES (?, ?, ?)",
+                (key, json.dumps(result, ensure_ascii=False), time.time())
+            )
+            (count,) = self._db.execute("SELECT COUNT(*) FROM extractions").fetchone()
+            if count > self.max_disk_entries:
+                self._db.execute(
+                    "DELETE FROM extractions WHERE key IN ("
+                    "SELECT key FROM extractions ORDER BY accessed_at ASC LIMIT ?)",
+                    (count - self.max_disk_entries,)
+                )
+            self._db.commit()
+        except Exception as e:
+            print(f"Error escribiendo la caché en disco: {e}")
+
+
+extraction_cache = ExtractionCache()
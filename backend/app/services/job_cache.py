@@ -0,0 +1,97 @@
+import copy
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app import config
+
+_HORIZONTAL_SPACE = re.compile(r'[ \t\f\v\u00a0]+')
+
+
+def normalize_offer_text(job_text: str) -> str:
+    """
+    Forma canónica de una oferta: minúsculas (JobParser solo trabaja con el
+    texto en minúsculas), saltos de línea unificados y espacios colapsados
+    dentro de cada línea. Se conservan los saltos de línea porque delimitan
+    las secciones de "nice to have".
+    """
+    text = job_text.replace('\r\n', '\n').replace('\r', '\n').lower()
+    lines = [_HORIZONTAL_SPACE.sub(' ', line).strip() for line in text.split('\n')]
+    return '\n'.join(lines).strip()
+
+
+class JobParseCache:
+    """
+    Memoización acotada de JobParser.parse por texto normalizado y versión
+    de la taxonomía. LRU con límite de memoria aproximado; se guardan y
+    devuelven copias para que nadie pueda modificar una entrada cacheada.
+    """
+
+    def __init__(self, max_bytes: int = config.JOB_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Dict, int]]" = OrderedDict()
+        self._current_bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def key_for(normalized_text: str, taxonomy_version: str) -> str:
+        digest = hashlib.sha256(normalized_text.encode('utf-8')).hexdigest()
+        return f"{taxonomy_version}:{digest}"
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return copy.deepcopy(entry[0])
+
+    def put(self, key: str, job_analysis: Dict) -> None:
+        job_analysis = copy.deepcopy(job_analysis)
+        size = len(json.dumps(job_analysis, ensure_ascii=False)) + len(key) + 256
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._current_bytes -= previous[1]
+
+            self._entries[key] = (job_analysis, size)
+            self._current_bytes += size
+
+            while self._current_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._current_bytes -= evicted_size
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0
+            }
+
+
+job_parse_cache = JobParseCache()
@@ -1,31 +1,39 @@
-import json
 import re
-from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+from app.services.document_index import DocumentIndex, fold_text
+from app.services.taxonomy import Taxonomy, TaxonomyRegistry, taxonomy_registry
+
+# Patrones de años requeridos, compilados una sola vez
+REQUIRED_YEARS_PATTERNS = [
+    re.compile(r'(\d+)\s*(?:\+|o más)?\s*años?\s+de\s+experiencia'),
+    re.compile(r'(\d+)\s*(?:\+|or more)?\s*years?\s+(?:of\s+)?experience'),
+    re.compile(r'mínimo\s+(\d+)\s+años?'),
+    re.compile(r'minimum\s+(\d+)\s+years?'),
+    re.compile(r'al menos\s+(\d+)\s+años?'),
+    re.compile(r'at least\s+(\d+)\s+years?')
+]
+
+# Patrones que indican skills opcionales
+OPTIONAL_PATTERNS = [
+    re.compile(r'(?:nice to have|deseable|valorable|se valorará|plus|bonus).*?(?:\n|$)', re.IGNORECASE | re.MULTILINE),
+    re.compile(r'(?:opcionales?|optional).*?(?:\n|$)', re.IGNORECASE | re.MULTILINE)
+]
 
 class JobParser:
     
-    def __init__(self):
-        self.skills_db = self._load_json('skills_database.json')
-        self.keywords_db = self._load_json('keywords.json')
-    
-    def _load_json(self, filename: str) -> Dict:
-        try:
-            data_path = Path(__file__).parent.parent.parent / 'data' / filename
-            with open(data_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error cargando {filename}: {e}")
-            return {}
+    def __init__(self, registry: Optional[TaxonomyRegistry] = None):
+        self.registry = registry or taxonomy_registry
     
     def parse(self, job_text: str) -> Dict:
-        # Normalizar texto
-        normalized_text = job_text.lower()
+        taxonomy = self.registry.get()
+        
+        # Normalizar y tokenizar el texto una sola vez
+        document = taxonomy.index(job_text)
         
         # Extraer requisitos
-        required_skills = self._extract_required_skills(normalized_text)
-        required_experience = self._extract_required_experience(normalized_text, job_text)
-        nice_to_have = self._extract_nice_to_have(normalized_text)
+        required_skills = self._extract_required_skills(document, taxonomy)
+        required_experience = self._extract_required_experience(document, taxonomy)
+        nice_to_have = self._extract_nice_to_have(document, taxonomy)
         
         return {
             "required_skills": required_skills,
@@ -34,58 +42,24 @@ class JobParser:
             "total_requirements": self._count_total_requirements(required_skills)
         }
     
-    def _extract_required_skills(self, text: str) -> Dict[str, List[str]]:
-        found_skills = {
-            "programming_languages": [],
-            "frameworks_backend": [],
-            "frameworks_frontend": [],
-            "mobile_development": [],
-            "databases": [],
-            "cloud_platforms": [],
-            "devops_tools": [],
-            "version_control": [],
-            "testing": [],
-            "data_science_ml": [],
-            "other_tools": []
-        }
-        
-        technical_skills = self.skills_db.get('technical_skills', {})
-        
-        for category, skills_list in technical_skills.items():
-            for skill in skills_list:
-                if re.search(r'\b' + re.escape(skill.lower()) + r'\b', text):
-                    found_skills[category].append(skill)
-        
-        found_skills = {k: v for k, v in found_skills.items() if v}
-        
-        return found_skills
+    def _extract_required_skills(self, document: DocumentIndex, taxonomy: Taxonomy) -> Dict[str, List[str]]:
+        return taxonomy.skill_matcher.find_technical_skills(document.folded)
     
-    def _extract_required_experience(self, text: str, original_text: str) -> Dict:
+    def _extract_required_experience(self, document: DocumentIndex, taxonomy: Taxonomy) -> Dict:
         experience_data = {
             "years_required": [],
             "level_required": "unknown",
             "details": []
         }
         
-        patterns = [
-            r'(\d+)\s*(?:\+|o más)?\s*años?\s+de\s+experiencia',
-            r'(\d+)\s*(?:\+|or more)?\s*years?\s+(?:of\s+)?experience',
-            r'mínimo\s+(\d+)\s+años?',
-            r'minimum\s+(\d+)\s+years?',
-            r'al menos\s+(\d+)\s+años?',
-            r'at least\s+(\d+)\s+years?'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
+        for pattern in REQUIRED_YEARS_PATTERNS:
+            matches = pattern.findall(document.lowered)
             if matches:
                 experience_data["years_required"].extend(matches)
         
-        levels = self.skills_db.get('experience_keywords', {}).get('experience_levels', {})
-        
-        for level, keywords in levels.items():
+        for level, keywords in taxonomy.experience_levels:
             for keyword in keywords:
-                if keyword.lower() in text:
+                if document.contains(keyword):
                     experience_data["level_required"] = level
                     break
             if experience_data["level_required"] != "unknown":
@@ -93,31 +67,19 @@ class JobParser:
         
         return experience_data
     
-    def _extract_nice_to_have(self, text: str) -> List[str]:
+    def _extract_nice_to_have(self, document: DocumentIndex, taxonomy: Taxonomy) -> List[str]:
         nice_to_have_skills = []
         
-        # Patrones que indican skills opcionales
-        optional_patterns = [
-            r'(?:nice to have|deseable|valorable|se valorará|plus|bonus).*?(?:\n|$)',
-            r'(?:opcionales?|optional).*?(?:\n|$)'
-        ]
-        
         # Buscar secciones opcionales
         optional_sections = []
-        for pattern in optional_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
+        for pattern in OPTIONAL_PATTERNS:
+            for match in pattern.finditer(document.lowered):
                 optional_sections.append(match.group())
         
         # Si hay secciones opcionales, buscar skills en ellas
         if optional_sections:
-            optional_text = ' '.join(optional_sections)
-            technical_skills = self.skills_db.get('technical_skills', {})
-            
-            for category, skills_list in technical_skills.items():
-                for skill in skills_list:
-                    if re.search(r'\b' + re.escape(skill.lower()) + r'\b', optional_text):
-                        nice_to_have_skills.append(skill)
+            optional_text = fold_text(' '.join(optional_sections))
+            nice_to_have_skills = taxonomy.skill_matcher.find_names(optional_text, "technical_skills")
         
         return nice_to_have_skills
     
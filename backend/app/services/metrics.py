@@ -0,0 +1,275 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+T = TypeVar("T")
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        if not values and not self.labelnames:
+            values = [((), 0)]
+        for key, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # etiquetas -> (conteo por bucket, suma, total)
+        self._series: Dict[LabelValues, List] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [[0] * len(self.buckets), 0.0, 0]
+                self._series[key] = series
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((key, [list(s[0]), s[1], s[2]]) for key, s in self._series.items())
+
+        for key, (counts, total_sum, count) in series:
+            # Buckets acumulativos, como espera Prometheus
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {count}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total_sum)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class CallbackMetric:
+    """Métrica calculada en el momento del scrape (p. ej. estadísticas de una caché)."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        metric_type: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], List[Tuple[LabelValues, float]]]
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.metric_type = metric_type
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        for key, value in self.collect():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+        lines: List[str] = []
+        for metric in metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                # Una métrica rota no debe dejar sin el resto
+                print(f"Error generando la métrica {metric.name}: {e}")
+        return "\n".join(lines) + "\n"
+
+
+class RequestTimings:
+    """
+    Tiempos de las etapas de una petición. Cada etapa medida se registra en
+    el histograma global y se puede devolver en la cabecera Server-Timing.
+    """
+
+    def __init__(self, histogram: Optional[Histogram] = None):
+        self.histogram = histogram or STAGE_DURATION
+        self.stages: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    async def measure(self, name: str, awaitable: Awaitable[T]) -> T:
+        # Para etapas lanzadas como tareas concurrentes
+        with self.stage(name):
+            return await awaitable
+
+    def record(self, name: str, seconds: float) -> None:
+        self.stages.append((name, seconds))
+        self.histogram.observe(seconds, stage=name)
+
+    def record_all(self, timings: Optional[Dict[str, float]]) -> None:
+        # Tiempos medidos dentro del worker (no incluyen la cola ni el IPC)
+        for name, seconds in (timings or {}).items():
+            self.record(name, seconds)
+
+    def server_timing(self) -> str:
+        return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.stages)
+
+
+metrics_registry = MetricsRegistry()
+
+STAGE_DURATION = metrics_registry.register(Histogram(
+    "cv_analyzer_stage_duration_seconds",
+    "Duración de cada etapa del pipeline de análisis",
+    ["stage"]
+))
+PDF_PAGES = metrics_registry.register(Counter(
+    "cv_analyzer_pdf_pages_total",
+    "Páginas de PDF extraídas (sin contar aciertos de caché)"
+))
+UPLOAD_BYTES = metrics_registry.register(Counter(
+    "cv_analyzer_upload_bytes_total",
+    "Bytes de PDF recibidos en subidas"
+))
+EXTRACTION_FAILURES = metrics_registry.register(Counter(
+    "cv_analyzer_extraction_failures_total",
+    "Extracciones de PDF fallidas",
+    ["reason"]
+))
+PDF_BACKEND_DURATION = metrics_registry.register(Histogram(
+    "cv_analyzer_pdf_backend_duration_seconds",
+    "Duración de cada intento de extracción por backend de PDF y resultado (ok, fallback, error)",
+    ["backend", "outcome"]
+))
+PDF_BACKEND_FALLBACKS = metrics_registry.register(Counter(
+    "cv_analyzer_pdf_backend_fallbacks_total",
+    "PDFs que un backend no ha sabido leer y ha pasado al siguiente, por motivo",
+    ["backend", "reason"]
+))
+PDF_TRUNCATIONS = metrics_registry.register(Counter(
+    "cv_analyzer_pdf_truncations_total",
+    "Extracciones cortadas por los límites de páginas, caracteres, tiempo o tamaño, por motivo",
+    ["reason"]
+))
+NOT_MODIFIED_RESPONSES = metrics_registry.register(Counter(
+    "cv_analyzer_not_modified_responses_total",
+    "Peticiones condicionales (If-None-Match) respondidas con 304 por endpoint",
+    ["endpoint"]
+))
+ADMISSION_WAIT = metrics_registry.register(Histogram(
+    "cv_analyzer_admission_wait_seconds",
+    "Espera en la cola del control de admisión de las peticiones admitidas",
+    ["traffic"]
+))
+ADMISSION_REJECTIONS = metrics_registry.register(Counter(
+    "cv_analyzer_admission_rejections_total",
+    "Peticiones rechazadas con 503 por el control de admisión (queue_full, timeout)",
+    ["traffic", "reason"]
+))
+BATCH_ITEMS = metrics_registry.register(Counter(
+    "cv_analyzer_batch_items_total",
+    "CVs procesados por la cola de lotes según el resultado (done, failed, retried)",
+    ["outcome"]
+))
+
+# Cachés expuestas en /metrics: nombre -> función stats() de la caché
+_cache_stats: Dict[str, Callable[[], Dict]] = {}
+
+
+def register_cache_stats(name: str, stats: Callable[[], Dict]) -> None:
+    _cache_stats[name] = stats
+
+
+def _collect_cache_field(field: str) -> Callable[[], List[Tuple[LabelValues, float]]]:
+    def collect() -> List[Tuple[LabelValues, float]]:
+        return [((name,), stats().get(field, 0)) for name, stats in sorted(_cache_stats.items())]
+    return collect
+
+
+for _field, _type, _documentation in (
+    ("hits", "counter", "Aciertos de caché"),
+    ("misses", "counter", "Fallos de caché"),
+    ("hit_rate", "gauge", "Tasa de aciertos de caché desde el arranque"),
+    ("entries", "gauge", "Entradas en memoria de la caché"),
+    ("size_bytes", "gauge", "Tamaño aproximado en memoria de la caché"),
+):
+    _suffix = f"{_field}_total" if _type == "counter" else _field
+    metrics_registry.register(CallbackMetric(
+        f"cv_analyzer_cache_{_suffix}",
+        _documentation,
+        _type,
+        ["cache"],
+        _collect_cache_field(_field)
+    ))
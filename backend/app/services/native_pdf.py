@@ -0,0 +1,1154 @@
+import base64
+import io
+import math
+import mmap
+import re
+import time
+import unicodedata
+import zlib
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+# Extractor de texto propio para los PDFs "sencillos" que generan Word,
+# Google Docs o LaTeX: xref clásica o en stream, object streams, FlateDecode,
+# operadores Tj/TJ/'/" y fuentes simples o Type0 con ToUnicode. Solo se
+# parsean los objetos de las páginas pedidas, y los de cada página se sueltan
+# al terminarla (release). Ante cualquier cosa que no sabe leer lanza
+# UnsupportedPDFError y PDFExtractor pasa a PyPDF2.
+
+_REGULAR = rb"[^\x00\t\n\x0c\r ()<>\[\]{}/%]"
+
+_TOKEN_RE = re.compile(
+    rb"(?:[\x00\t\n\x0c\r ]+|%[^\r\n]*)*"
+    rb"(?:"
+    rb"(?P<num>[+-]?(?:\d+\.?\d*|\.\d+))(?!" + _REGULAR + rb")"
+    rb"|/(?P<name>" + _REGULAR + rb"*)"
+    rb"|(?P<dict_open><<)"
+    rb"|(?P<dict_close>>>)"
+    rb"|<(?P<hex>[0-9A-Fa-f\x00\t\n\x0c\r ]*)>"
+    rb"|(?P<array_open>\[)"
+    rb"|(?P<array_close>\])"
+    rb"|(?P<string>\()"
+    rb"|(?P<keyword>" + _REGULAR + rb"+)"
+    rb"|(?P<brace>[{}])"
+    rb")"
+)
+_LITERAL_SPECIAL_RE = re.compile(rb"[()\\]")
+_NAME_ESCAPE_RE = re.compile(rb"#([0-9A-Fa-f]{2})")
+_HEX_WHITESPACE_RE = re.compile(rb"[\x00\t\n\x0c\r ]+")
+_OBJECT_HEADER_RE = re.compile(rb"[\x00\t\n\x0c\r ]*(\d+)[\x00\t\n\x0c\r ]+(\d+)[\x00\t\n\x0c\r ]+obj")
+_STREAM_RE = re.compile(rb"[\x00\t\n\x0c\r ]*stream(?:\r\n|\n|\r)?")
+_ENDSTREAM_RE = re.compile(rb"[\x00\t\n\x0c\r ]*endstream")
+_STARTXREF_RE = re.compile(rb"startxref[\x00\t\n\x0c\r ]+(\d+)")
+_XREF_SUBSECTION_RE = re.compile(rb"[\x00\t\n\x0c\r ]*(\d+)[\x00\t\n\x0c\r ]+(\d+)[\x00\t\n\x0c\r ]*(?=\d)")
+_XREF_ENTRY_RE = re.compile(rb"[\x00\t\n\x0c\r ]*(\d{1,10})[\x00\t\n\x0c\r ]+(\d{1,5})[\x00\t\n\x0c\r ]+([nf])")
+_TRAILER_RE = re.compile(rb"[\x00\t\n\x0c\r ]*trailer")
+_INLINE_IMAGE_END_RE = re.compile(rb"[\x00\t\n\x0c\r ]EI(?=[\x00\t\n\x0c\r ]|$)")
+
+_ESCAPES = {
+    ord("n"): b"\n", ord("r"): b"\r", ord("t"): b"\t", ord("b"): b"\b", ord("f"): b"\f",
+    ord("("): b"(", ord(")"): b")", ord("\\"): b"\\"
+}
+
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+# Límites contra ficheros malformados o maliciosos
+MAX_NESTING = 64
+MAX_FORM_DEPTH = 8
+MAX_CMAP_RANGE = 65536
+
+
+class UnsupportedPDFError(Exception):
+    """El PDF usa algo que este extractor no sabe leer; `reason` se usa como etiqueta de métricas."""
+
+    def __init__(self, reason: str, detail: str = ""):
+        super().__init__(f"{reason}: {detail}" if detail else reason)
+        self.reason = reason
+
+
+class PDFLimitExceeded(Exception):
+    """Se ha alcanzado un límite de la extracción acotada ("stream_size", "page_time")."""
+
+    def __init__(self, reason: str, detail: str = ""):
+        super().__init__(f"{reason}: {detail}" if detail else reason)
+        self.reason = reason
+
+
+class Name(str):
+    """Nombre PDF (/Type); las cadenas son bytes y los operadores Keyword."""
+
+
+class Keyword(str):
+    pass
+
+
+class Ref(NamedTuple):
+    number: int
+    generation: int
+
+
+class Stream:
+    __slots__ = ("dict", "raw")
+
+    def __init__(self, stream_dict: Dict, raw: bytes):
+        self.dict = stream_dict
+        self.raw = raw
+
+
+class _Lexer:
+    def __init__(self, data, pos: int = 0):
+        self.data = data
+        self.pos = pos
+
+    def next(self) -> Tuple[Optional[str], object]:
+        match = _TOKEN_RE.match(self.data, self.pos)
+        if match is None or match.lastgroup is None:
+            return None, None
+        self.pos = match.end()
+        kind = match.lastgroup
+
+        if kind == "num":
+            text = match.group("num")
+            return kind, float(text) if b"." in text else int(text)
+        if kind == "name":
+            raw = match.group("name")
+            if b"#" in raw:
+                raw = _NAME_ESCAPE_RE.sub(lambda escape: bytes([int(escape.group(1), 16)]), raw)
+            return kind, Name(raw.decode("latin-1"))
+        if kind == "hex":
+            digits = _HEX_WHITESPACE_RE.sub(b"", match.group("hex"))
+            if len(digits) % 2:
+                digits += b"0"
+            return "string", bytes.fromhex(digits.decode("ascii"))
+        if kind == "string":
+            value, self.pos = _read_literal(self.data, self.pos)
+            return kind, value
+        if kind == "keyword":
+            return kind, Keyword(match.group("keyword").decode("latin-1"))
+        return kind, None
+
+    def parse(self, allow_refs: bool = True, depth: int = 0) -> object:
+        kind, value = self.next()
+        return self.value(kind, value, allow_refs, depth)
+
+    def value(self, kind: Optional[str], value: object, allow_refs: bool = True, depth: int = 0) -> object:
+        if depth > MAX_NESTING:
+            raise UnsupportedPDFError("syntax", "anidamiento excesivo")
+
+        if kind == "num":
+            if allow_refs and isinstance(value, int) and value >= 0:
+                # Posible referencia "n g R"
+                saved = self.pos
+                kind2, generation = self.next()
+                if kind2 == "num" and isinstance(generation, int):
+                    kind3, keyword = self.next()
+                    if kind3 == "keyword" and keyword == "R":
+                        return Ref(value, generation)
+                self.pos = saved
+            return value
+        if kind in ("name", "string"):
+            return value
+        if kind == "array_open":
+            items = []
+            while True:
+                kind, item = self.next()
+                if kind == "array_close":
+                    return items
+                if kind is None:
+                    raise UnsupportedPDFError("syntax", "array sin cerrar")
+                items.append(self.value(kind, item, allow_refs, depth + 1))
+        if kind == "dict_open":
+            result = {}
+            while True:
+                kind, key = self.next()
+                if kind == "dict_close":
+                    return result
+                if kind != "name":
+                    raise UnsupportedPDFError("syntax", "clave de diccionario inválida")
+                result[key] = self.parse(allow_refs, depth + 1)
+        if kind == "keyword":
+            if value == "true":
+                return True
+            if value == "false":
+                return False
+            if value == "null":
+                return None
+            return value
+        if kind is None:
+            raise UnsupportedPDFError("syntax", "fin de datos inesperado")
+        raise UnsupportedPDFError("syntax", f"token inesperado {kind}")
+
+
+def _read_literal(data, pos: int) -> Tuple[bytes, int]:
+    output = bytearray()
+    depth = 1
+    while True:
+        match = _LITERAL_SPECIAL_RE.search(data, pos)
+        if match is None:
+            raise UnsupportedPDFError("syntax", "cadena sin cerrar")
+        output += data[pos:match.start()]
+        char = data[match.start()]
+        pos = match.end()
+
+        if char == 0x5C:  # "\"
+            if pos >= len(data):
+                raise UnsupportedPDFError("syntax", "cadena sin cerrar")
+            escaped = data[pos]
+            if escaped in _ESCAPES:
+                output += _ESCAPES[escaped]
+                pos += 1
+            elif 0x30 <= escaped <= 0x37:
+                end = pos
+                while end < pos + 3 and end < len(data) and 0x30 <= data[end] <= 0x37:
+                    end += 1
+                output.append(int(data[pos:end], 8) & 0xFF)
+                pos = end
+            elif escaped == 0x0D:
+                pos += 2 if data[pos + 1:pos + 2] == b"\n" else 1
+            elif escaped == 0x0A:
+                pos += 1
+            else:
+                output.append(escaped)
+                pos += 1
+        elif char == 0x28:  # "("
+            depth += 1
+            output += b"("
+        else:
+            depth -= 1
+            if depth == 0:
+                return bytes(output), pos
+            output += b")"
+
+
+# ===== FILTROS =====
+
+def _inflate(raw: bytes, max_size: int = 0) -> bytes:
+    # decompressobj tolera basura tras el final del stream comprimido
+    decompressor = zlib.decompressobj()
+    try:
+        data = decompressor.decompress(raw, max_size)
+    except zlib.error as e:
+        raise UnsupportedPDFError("filter", f"FlateDecode: {e}")
+    if max_size and decompressor.unconsumed_tail:
+        # Se para sin descomprimir el resto: protege de streams de tamaño desproporcionado
+        raise PDFLimitExceeded("stream_size", f"stream de más de {max_size} bytes descomprimido")
+    return data
+
+
+def _png_unpredict(data: bytes, columns: int, colors: int, bits: int) -> bytes:
+    bpp = max(1, colors * bits // 8)
+    row_length = (columns * colors * bits + 7) // 8
+    output = bytearray()
+    previous = bytearray(row_length)
+
+    for start in range(0, len(data), row_length + 1):
+        filter_type = data[start]
+        row = bytearray(data[start + 1:start + 1 + row_length])
+        row.extend(bytes(row_length - len(row)))
+        if filter_type == 1:
+            for i in range(bpp, row_length):
+                row[i] = (row[i] + row[i - bpp]) & 0xFF
+        elif filter_type == 2:
+            for i in range(row_length):
+                row[i] = (row[i] + previous[i]) & 0xFF
+        elif filter_type == 3:
+            for i in range(row_length):
+                left = row[i - bpp] if i >= bpp else 0
+                row[i] = (row[i] + ((left + previous[i]) >> 1)) & 0xFF
+        elif filter_type == 4:
+            for i in range(row_length):
+                left = row[i - bpp] if i >= bpp else 0
+                up = previous[i]
+                up_left = previous[i - bpp] if i >= bpp else 0
+                estimate = left + up - up_left
+                distances = (abs(estimate - left), abs(estimate - up), abs(estimate - up_left))
+                predictor = left if distances[0] <= distances[1] and distances[0] <= distances[2] else (
+                    up if distances[1] <= distances[2] else up_left
+                )
+                row[i] = (row[i] + predictor) & 0xFF
+        elif filter_type != 0:
+            raise UnsupportedPDFError("filter", f"predictor PNG {filter_type}")
+        output += row
+        previous = row
+    return bytes(output)
+
+
+def _ascii85(raw: bytes) -> bytes:
+    data = _HEX_WHITESPACE_RE.sub(b"", raw)
+    if data.endswith(b"~>"):
+        data = data[:-2]
+    try:
+        return base64.a85decode(data)
+    except ValueError as e:
+        raise UnsupportedPDFError("filter", f"ASCII85Decode: {e}")
+
+
+# ===== CODIFICACIONES Y NOMBRES DE GLIFO =====
+
+def _codec_table(codec: str) -> List[Optional[str]]:
+    table: List[Optional[str]] = [None] * 256
+    for code in range(32, 256):
+        try:
+            table[code] = bytes([code]).decode(codec)
+        except UnicodeDecodeError:
+            pass
+    return table
+
+
+def _standard_table() -> List[Optional[str]]:
+    table: List[Optional[str]] = [None] * 256
+    for code in range(32, 127):
+        table[code] = chr(code)
+    table[0x27] = "’"
+    table[0x60] = "‘"
+    for code, char in {
+        0xA1: "¡", 0xA2: "¢", 0xA3: "£", 0xA4: "⁄", 0xA5: "¥", 0xA6: "ƒ", 0xA7: "§", 0xA8: "¤",
+        0xA9: "'", 0xAA: "“", 0xAB: "«", 0xAC: "‹", 0xAD: "›", 0xAE: "fi", 0xAF: "fl", 0xB1: "–",
+        0xB2: "†", 0xB3: "‡", 0xB4: "·", 0xB6: "¶", 0xB7: "•", 0xB8: "‚", 0xB9: "„", 0xBA: "”",
+        0xBB: "»", 0xBC: "…", 0xBD: "‰", 0xBF: "¿", 0xC1: "`", 0xC2: "´", 0xC3: "ˆ", 0xC4: "˜",
+        0xC5: "¯", 0xC6: "˘", 0xC7: "˙", 0xC8: "¨", 0xCA: "˚", 0xCB: "¸", 0xCD: "˝", 0xCE: "˛",
+        0xCF: "ˇ", 0xD0: "—", 0xE1: "Æ", 0xE3: "ª", 0xE8: "Ł", 0xE9: "Ø", 0xEA: "Œ", 0xEB: "º",
+        0xF1: "æ", 0xF5: "ı", 0xF8: "ł", 0xF9: "ø", 0xFA: "œ", 0xFB: "ß",
+    }.items():
+        table[code] = char
+    return table
+
+
+_BASE_ENCODINGS = {
+    "WinAnsiEncoding": _codec_table("cp1252"),
+    "MacRomanEncoding": _codec_table("mac_roman"),
+    "StandardEncoding": _standard_table(),
+    "PDFDocEncoding": _codec_table("latin-1"),
+}
+
+# Subconjunto de la Adobe Glyph List suficiente para texto en español e inglés
+_GLYPH_NAMES = {
+    "space": " ", "exclam": "!", "quotedbl": '"', "numbersign": "#", "dollar": "$", "percent": "%",
+    "ampersand": "&", "quotesingle": "'", "parenleft": "(", "parenright": ")", "asterisk": "*",
+    "plus": "+", "comma": ",", "hyphen": "-", "period": ".", "slash": "/", "colon": ":",
+    "semicolon": ";", "less": "<", "equal": "=", "greater": ">", "question": "?", "at": "@",
+    "bracketleft": "[", "backslash": "\\", "bracketright": "]", "asciicircum": "^",
+    "underscore": "_", "grave": "`", "braceleft": "{", "bar": "|", "braceright": "}",
+    "asciitilde": "~", "quoteright": "’", "quoteleft": "‘", "quotedblleft": "“",
+    "quotedblright": "”", "quotesinglbase": "‚", "quotedblbase": "„", "endash": "–",
+    "emdash": "—", "bullet": "•", "ellipsis": "…", "periodcentered": "·", "copyright": "©",
+    "registered": "®", "trademark": "™", "degree": "°", "section": "§", "paragraph": "¶",
+    "exclamdown": "¡", "questiondown": "¿", "guillemotleft": "«", "guillemotright": "»",
+    "guilsinglleft": "‹", "guilsinglright": "›", "ordfeminine": "ª", "ordmasculine": "º",
+    "fi": "fi", "fl": "fl", "ff": "ff", "ffi": "ffi", "ffl": "ffl", "dotlessi": "ı",
+    "minus": "−", "multiply": "×", "divide": "÷", "Euro": "€", "sterling": "£", "yen": "¥",
+    "cent": "¢", "germandbls": "ß", "ae": "æ", "AE": "Æ", "oe": "œ", "OE": "Œ", "oslash": "ø",
+    "Oslash": "Ø", "eth": "ð", "Eth": "Ð", "thorn": "þ", "Thorn": "Þ", "lslash": "ł",
+    "Lslash": "Ł", "nbspace": " ", "dagger": "†", "daggerdbl": "‡", "perthousand": "‰",
+    "florin": "ƒ", "fraction": "⁄", "plusminus": "±", "logicalnot": "¬", "mu": "µ",
+    "onehalf": "½", "onequarter": "¼", "threequarters": "¾", "acute": "´", "dieresis": "¨",
+    "circumflex": "ˆ", "tilde": "˜", "cedilla": "¸", "macron": "¯", "breve": "˘",
+    "dotaccent": "˙", "ring": "˚", "ogonek": "˛", "caron": "ˇ", "hungarumlaut": "˝",
+    "zero": "0", "one": "1", "two": "2", "three": "3", "four": "4", "five": "5", "six": "6",
+    "seven": "7", "eight": "8", "nine": "9", "arrowright": "→", "arrowleft": "←",
+    "checkmark": "✓", "visiblespace": "␣", "currency": "¤", "brokenbar": "¦",
+}
+# Letra + diacrítico: "aacute", "ntilde", "Udieresis"...
+_GLYPH_ACCENTS = {
+    "acute": "́", "grave": "̀", "circumflex": "̂", "dieresis": "̈",
+    "tilde": "̃", "cedilla": "̧", "ring": "̊", "caron": "̌",
+}
+_GLYPH_UNI_RE = re.compile(r"uni((?:[0-9A-F]{4})+)$")
+_GLYPH_U_RE = re.compile(r"u([0-9A-F]{4,6})$")
+
+
+def glyph_to_unicode(name: str) -> Optional[str]:
+    base = name.split(".", 1)[0]
+    if not base:
+        return None
+    if "_" in base:
+        parts = [glyph_to_unicode(part) for part in base.split("_")]
+        return None if None in parts else "".join(parts)
+    if len(base) == 1 and base.isascii() and base.isalpha():
+        return base
+    if base in _GLYPH_NAMES:
+        return _GLYPH_NAMES[base]
+
+    match = _GLYPH_UNI_RE.match(base)
+    if match:
+        digits = match.group(1)
+        return "".join(chr(int(digits[i:i + 4], 16)) for i in range(0, len(digits), 4))
+    match = _GLYPH_U_RE.match(base)
+    if match:
+        return chr(int(match.group(1), 16))
+
+    for accent, combining in _GLYPH_ACCENTS.items():
+        if base.endswith(accent) and len(base) == len(accent) + 1 and base[0].isalpha():
+            return unicodedata.normalize("NFC", base[0] + combining)
+    return None
+
+
+def _utf16(data: bytes) -> str:
+    return data.decode("utf-16-be", errors="replace")
+
+
+def _text_string(value: object) -> str:
+    # Cadenas de texto del PDF (metadatos): UTF-16 con BOM o PDFDocEncoding
+    if not isinstance(value, bytes):
+        return str(value) if value is not None else ""
+    if value.startswith(b"\xfe\xff"):
+        return value[2:].decode("utf-16-be", errors="replace")
+    if value.startswith(b"\xef\xbb\xbf"):
+        return value[3:].decode("utf-8", errors="replace")
+    return value.decode("latin-1")
+
+
+# ===== DOCUMENTO =====
+
+class NativePDFDocument:
+    """Acceso perezoso a los objetos del PDF a través de la tabla xref."""
+
+    def __init__(self, data, max_stream_size: int = 0):
+        self.data = data
+        self.max_stream_size = max_stream_size
+        # número de objeto -> (1, offset) o (2, nº del object stream, índice)
+        self._xref: Dict[int, Tuple[int, int, int]] = {}
+        self._objects: Dict[int, object] = {}
+        self._object_streams: Dict[int, Tuple[bytes, int, Dict[int, int]]] = {}
+        self._pages: Optional[List[Tuple[Dict, Dict]]] = None
+        self._fonts: Dict[object, "_Font"] = {}
+        self.trailer = self._read_xref()
+        if "Encrypt" in self.trailer:
+            raise UnsupportedPDFError("encrypted")
+
+    # --- xref ---
+
+    def _read_xref(self) -> Dict:
+        tail_start = max(0, len(self.data) - 2048)
+        tail = self.data[tail_start:]
+        index = tail.rfind(b"startxref")
+        match = _STARTXREF_RE.match(tail, index) if index >= 0 else None
+        if match is None:
+            raise UnsupportedPDFError("xref", "sin startxref")
+
+        trailer: Optional[Dict] = None
+        offset: Optional[int] = int(match.group(1))
+        seen = set()
+        # Actualizaciones incrementales: la sección más reciente tiene prioridad
+        while offset is not None and offset not in seen:
+            seen.add(offset)
+            section_trailer = self._read_xref_section(offset)
+            if trailer is None:
+                trailer = section_trailer
+            hybrid = section_trailer.get("XRefStm")
+            if isinstance(hybrid, int) and hybrid not in seen:
+                seen.add(hybrid)
+                self._read_xref_section(hybrid)
+            previous = section_trailer.get("Prev")
+            offset = previous if isinstance(previous, int) else None
+
+        if not trailer or "Root" not in trailer:
+            raise UnsupportedPDFError("xref", "trailer sin /Root")
+        return trailer
+
+    def _read_xref_section(self, offset: int) -> Dict:
+        if offset >= len(self.data):
+            raise UnsupportedPDFError("xref", "offset fuera del fichero")
+
+        lexer = _Lexer(self.data, offset)
+        kind, keyword = lexer.next()
+        if kind == "keyword" and keyword == "xref":
+            return self._read_xref_table(lexer.pos)
+
+        stream = self._read_object_at(offset)
+        if not isinstance(stream, Stream) or stream.dict.get("Type") != "XRef":
+            raise UnsupportedPDFError("xref", "sección xref no reconocida")
+        self._read_xref_stream(stream)
+        return stream.dict
+
+    def _read_xref_table(self, pos: int) -> Dict:
+        while True:
+            match = _XREF_SUBSECTION_RE.match(self.data, pos)
+            if match is None:
+                break
+            first, count = int(match.group(1)), int(match.group(2))
+            pos = match.end()
+            for number in range(first, first + count):
+                entry = _XREF_ENTRY_RE.match(self.data, pos)
+                if entry is None:
+                    raise UnsupportedPDFError("xref", "entrada xref inválida")
+                pos = entry.end()
+                if entry.group(3) == b"n" and number not in self._xref:
+                    self._xref[number] = (1, int(entry.group(1)), 0)
+
+        match = _TRAILER_RE.match(self.data, pos)
+        if match is None:
+            raise UnsupportedPDFError("xref", "sin trailer")
+        trailer = _Lexer(self.data, match.end()).parse()
+        if not isinstance(trailer, dict):
+            raise UnsupportedPDFError("xref", "trailer inválido")
+        return trailer
+
+    def _read_xref_stream(self, stream: Stream) -> None:
+        widths = self.resolve(stream.dict.get("W"))
+        if not isinstance(widths, list) or len(widths) != 3 or not all(isinstance(w, int) for w in widths):
+            raise UnsupportedPDFError("xref", "/W inválido")
+        size = self.resolve(stream.dict.get("Size"))
+        index = self.resolve(stream.dict.get("Index")) or [0, size]
+        data = self.stream_data(stream)
+
+        entry_length = sum(widths)
+        pos = 0
+        for section in range(0, len(index) - 1, 2):
+            first, count = index[section], index[section + 1]
+            for number in range(first, first + count):
+                if pos + entry_length > len(data):
+                    return
+                fields = []
+                for width in widths:
+                    fields.append(int.from_bytes(data[pos:pos + width], "big"))
+                    pos += width
+                entry_type = fields[0] if widths[0] else 1
+                if entry_type in (1, 2) and number not in self._xref:
+                    self._xref[number] = (entry_type, fields[1], fields[2])
+
+    # --- objetos ---
+
+    def resolve(self, value: object) -> object:
+        for _ in range(32):
+            if not isinstance(value, Ref):
+                return value
+            value = self.get_object(value.number)
+        raise UnsupportedPDFError("object", "cadena de referencias demasiado larga")
+
+    def get_object(self, number: int) -> object:
+        if number in self._objects:
+            return self._objects[number]
+
+        entry = self._xref.get(number)
+        if entry is None:
+            return None
+        # Marca para cortar ciclos (p. ej. /Length que apunta a su propio objeto)
+        self._objects[number] = None
+        if entry[0] == 1:
+            value = self._read_object_at(entry[1], number)
+        else:
+            value = self._read_compressed(entry[1], number)
+        self._objects[number] = value
+        return value
+
+    def _read_object_at(self, offset: int, number: Optional[int] = None) -> object:
+        match = _OBJECT_HEADER_RE.match(self.data, offset)
+        if match is None or (number is not None and int(match.group(1)) != number):
+            # Offsets desplazados: PyPDF2 sabe reconstruir la tabla
+            raise UnsupportedPDFError("xref", f"objeto {number} no encontrado en su offset")
+
+        lexer = _Lexer(self.data, match.end())
+        value = lexer.parse()
+        if isinstance(value, dict):
+            stream_match = _STREAM_RE.match(self.data, lexer.pos)
+            if stream_match is not None:
+                return Stream(value, self._stream_bytes(value, stream_match.end()))
+        return value
+
+    def _stream_bytes(self, stream_dict: Dict, start: int) -> bytes:
+        length = self.resolve(stream_dict.get("Length"))
+        if isinstance(length, int) and length >= 0 and _ENDSTREAM_RE.match(self.data, start + length):
+            return self.data[start:start + length]
+        # /Length incorrecto: se busca el final del stream
+        end = self.data.find(b"endstream", start)
+        if end < 0:
+            raise UnsupportedPDFError("object", "stream sin endstream")
+        raw = self.data[start:end]
+        return raw[:-2] if raw.endswith(b"\r\n") else raw[:-1] if raw.endswith((b"\n", b"\r")) else raw
+
+    def _read_compressed(self, stream_number: int, number: int) -> object:
+        cached = self._object_streams.get(stream_number)
+        if cached is None:
+            stream = self.get_object(stream_number)
+            if not isinstance(stream, Stream):
+                raise UnsupportedPDFError("object", f"object stream {stream_number} inválido")
+            data = self.stream_data(stream)
+            count = self.resolve(stream.dict.get("N"))
+            first = self.resolve(stream.dict.get("First"))
+            if not isinstance(count, int) or not isinstance(first, int):
+                raise UnsupportedPDFError("object", "object stream sin /N o /First")
+
+            lexer = _Lexer(data)
+            offsets = {}
+            for _ in range(count):
+                object_number = lexer.parse(allow_refs=False)
+                object_offset = lexer.parse(allow_refs=False)
+                offsets[object_number] = object_offset
+            cached = (data, first, offsets)
+            self._object_streams[stream_number] = cached
+
+        data, first, offsets = cached
+        if number not in offsets:
+            return None
+        return _Lexer(data, first + offsets[number]).parse()
+
+    def stream_data(self, stream: Stream) -> bytes:
+        filters = self.resolve(stream.dict.get("Filter"))
+        params = self.resolve(stream.dict.get("DecodeParms"))
+        if filters is None:
+            return stream.raw
+        if not isinstance(filters, list):
+            filters, params = [filters], [params]
+        elif not isinstance(params, list):
+            params = [params] * len(filters)
+
+        data = stream.raw
+        for position, name in enumerate(filters):
+            name = self.resolve(name)
+            param = self.resolve(params[position]) if position < len(params) else None
+            if name in ("FlateDecode", "Fl"):
+                data = _inflate(data, self.max_stream_size)
+                predictor = self.resolve(param.get("Predictor", 1)) if isinstance(param, dict) else 1
+                if predictor >= 10:
+                    data = _png_unpredict(
+                        data,
+                        self.resolve(param.get("Columns", 1)),
+                        self.resolve(param.get("Colors", 1)),
+                        self.resolve(param.get("BitsPerComponent", 8))
+                    )
+                elif predictor != 1:
+                    raise UnsupportedPDFError("filter", f"predictor {predictor}")
+            elif name in ("ASCIIHexDecode", "AHx"):
+                digits = _HEX_WHITESPACE_RE.sub(b"", data).split(b">", 1)[0]
+                if len(digits) % 2:
+                    digits += b"0"
+                data = bytes.fromhex(digits.decode("ascii"))
+            elif name in ("ASCII85Decode", "A85"):
+                data = _ascii85(data)
+            else:
+                raise UnsupportedPDFError("filter", str(name))
+        return data
+
+    # --- páginas ---
+
+    def pages(self) -> List[Tuple[Dict, Dict]]:
+        """Hojas del árbol de páginas en orden, con sus /Resources (heredados si hace falta)."""
+        if self._pages is not None:
+            return self._pages
+
+        root = self.resolve(self.trailer.get("Root"))
+        tree = self.resolve(root.get("Pages")) if isinstance(root, dict) else None
+        if not isinstance(tree, dict):
+            raise UnsupportedPDFError("structure", "catálogo sin /Pages")
+
+        pages: List[Tuple[Dict, Dict]] = []
+        visited = set()
+
+        def walk(node: Dict, resources: Optional[Dict], depth: int) -> None:
+            if depth > MAX_NESTING:
+                raise UnsupportedPDFError("structure", "árbol de páginas demasiado profundo")
+            resources = node.get("Resources", resources)
+            kids = self.resolve(node.get("Kids"))
+            if node.get("Type") == "Page" or not isinstance(kids, list):
+                pages.append((node, resources))
+                return
+            for kid in kids:
+                if isinstance(kid, Ref):
+                    if kid.number in visited:
+                        raise UnsupportedPDFError("structure", "ciclo en el árbol de páginas")
+                    visited.add(kid.number)
+                child = self.resolve(kid)
+                if isinstance(child, dict):
+                    walk(child, resources, depth + 1)
+
+        walk(tree, None, 0)
+        self._pages = pages
+        return pages
+
+    @property
+    def num_pages(self) -> int:
+        return len(self.pages())
+
+    def page_text(self, index: int, time_limit: float = 0.0) -> str:
+        """Texto de la página; con time_limit > 0 se corta con PDFLimitExceeded("page_time")."""
+        page, resources = self.pages()[index]
+        contents = self.resolve(page.get("Contents"))
+        if contents is None:
+            return ""
+        streams = contents if isinstance(contents, list) else [contents]
+
+        parts = []
+        for item in streams:
+            stream = self.resolve(item)
+            if not isinstance(stream, Stream):
+                raise UnsupportedPDFError("structure", "/Contents inválido")
+            parts.append(self.stream_data(stream))
+
+        builder = _TextBuilder()
+        deadline = time.perf_counter() + time_limit if time_limit > 0 else 0.0
+        _ContentInterpreter(self, builder, deadline).run(
+            b"\n".join(parts), self.resolve(resources) or {}, IDENTITY, 0
+        )
+        return builder.text()
+
+    def release(self, index: int) -> None:
+        # Los streams de contenido de una página ya leída no se vuelven a necesitar
+        contents = self.pages()[index][0].get("Contents")
+        references = [contents]
+        if isinstance(contents, Ref) and isinstance(self._objects.get(contents.number), list):
+            references.extend(self._objects[contents.number])
+        elif isinstance(contents, list):
+            references = contents
+        for reference in references:
+            if isinstance(reference, Ref):
+                self._objects.pop(reference.number, None)
+
+    def metadata(self) -> Dict[str, str]:
+        try:
+            info = self.resolve(self.trailer.get("Info"))
+        except UnsupportedPDFError:
+            return {}
+        if not isinstance(info, dict):
+            return {}
+        return {
+            "author": _text_string(self.resolve(info.get("Author", b""))),
+            "title": _text_string(self.resolve(info.get("Title", b""))),
+            "subject": _text_string(self.resolve(info.get("Subject", b""))),
+            "creator": _text_string(self.resolve(info.get("Creator", b"")))
+        }
+
+    def font(self, resources: Dict, name: str) -> "_Font":
+        fonts = self.resolve(resources.get("Font"))
+        reference = fonts.get(name) if isinstance(fonts, dict) else None
+        if reference is None:
+            raise UnsupportedPDFError("font", f"fuente {name} no encontrada")
+
+        key = reference if isinstance(reference, Ref) else id(reference)
+        font = self._fonts.get(key)
+        if font is None:
+            font_dict = self.resolve(reference)
+            if not isinstance(font_dict, dict):
+                raise UnsupportedPDFError("font", f"fuente {name} inválida")
+            font = _Font.build(self, font_dict)
+            self._fonts[key] = font
+        return font
+
+
+# ===== FUENTES =====
+
+class _Font:
+    """Decodificación de códigos a Unicode y anchos de glifo (para detectar espacios)."""
+
+    __slots__ = ("code_length", "chars", "widths", "default_width", "char_table", "width_table")
+
+    def __init__(self, code_length: int, chars: Dict[int, str], widths: Dict[int, float], default_width: float):
+        self.code_length = code_length
+        self.chars = chars
+        self.widths = widths
+        self.default_width = default_width
+        if code_length == 1:
+            # Tablas de 256 entradas: el texto de una fuente simple se decodifica con map()
+            self.char_table = [chars.get(code) for code in range(256)]
+            self.width_table = [widths.get(code, default_width) for code in range(256)]
+
+    @classmethod
+    def build(cls, document: NativePDFDocument, font: Dict) -> "_Font":
+        subtype = font.get("Subtype")
+        to_unicode = document.resolve(font.get("ToUnicode"))
+        cmap_length, cmap = (
+            _parse_cmap(document.stream_data(to_unicode)) if isinstance(to_unicode, Stream) else (None, {})
+        )
+
+        if subtype == "Type0":
+            encoding = document.resolve(font.get("Encoding"))
+            if encoding not in ("Identity-H", "Identity-V") or not cmap:
+                raise UnsupportedPDFError("font", "Type0 sin Identity-H y ToUnicode")
+            descendants = document.resolve(font.get("DescendantFonts"))
+            descendant = document.resolve(descendants[0]) if isinstance(descendants, list) and descendants else {}
+            default_width = document.resolve(descendant.get("DW", 1000))
+            return cls(2, cmap, _cid_widths(document, document.resolve(descendant.get("W"))), default_width)
+
+        if subtype == "Type3":
+            raise UnsupportedPDFError("font", "Type3")
+
+        chars: Dict[int, str] = {}
+        encoding = document.resolve(font.get("Encoding"))
+        base_name, differences = None, None
+        if isinstance(encoding, dict):
+            base_name = document.resolve(encoding.get("BaseEncoding"))
+            differences = document.resolve(encoding.get("Differences"))
+        elif encoding is not None:
+            base_name = encoding
+
+        descriptor = document.resolve(font.get("FontDescriptor"))
+        flags = document.resolve(descriptor.get("Flags", 0)) if isinstance(descriptor, dict) else 0
+        base_font = str(font.get("BaseFont", ""))
+        # Fuentes simbólicas sin mapa a Unicode: la codificación base no significa nada
+        symbolic = bool(flags & 4) and not flags & 32 or base_font.endswith(("Symbol", "Dingbats"))
+        if symbolic and not cmap and not differences and base_name is None:
+            raise UnsupportedPDFError("font", f"fuente simbólica {base_font}")
+
+        if base_name is not None and base_name not in _BASE_ENCODINGS:
+            raise UnsupportedPDFError("font", f"codificación {base_name}")
+        table = _BASE_ENCODINGS[base_name or "StandardEncoding"]
+        for code, char in enumerate(table):
+            if char is not None:
+                chars[code] = char
+
+        if isinstance(differences, list):
+            code = 0
+            for item in differences:
+                item = document.resolve(item)
+                if isinstance(item, int):
+                    code = item
+                elif isinstance(item, Name):
+                    char = glyph_to_unicode(item)
+                    if char is None:
+                        chars.pop(code, None)
+                    else:
+                        chars[code] = char
+                    code += 1
+
+        if cmap:
+            if cmap_length not in (None, 1):
+                raise UnsupportedPDFError("font", "ToUnicode multibyte en fuente simple")
+            chars.update(cmap)
+
+        widths: Dict[int, float] = {}
+        first_char = document.resolve(font.get("FirstChar", 0))
+        width_list = document.resolve(font.get("Widths"))
+        if isinstance(width_list, list) and isinstance(first_char, int):
+            for offset, width in enumerate(width_list):
+                width = document.resolve(width)
+                if isinstance(width, (int, float)):
+                    widths[first_char + offset] = width
+        missing = document.resolve(descriptor.get("MissingWidth", 0)) if isinstance(descriptor, dict) else 0
+        # Las 14 fuentes estándar no incluyen /Widths: se aproxima media eme
+        default_width = missing or (500 if not widths else 0)
+        return cls(1, chars, widths, default_width)
+
+    def decode(self, data: bytes) -> Tuple[str, float, int, int]:
+        """Devuelve (texto, ancho en milésimas de eme, nº de códigos, nº de espacios de un byte)."""
+        if self.code_length == 1:
+            try:
+                text = "".join(map(self.char_table.__getitem__, data))
+            except TypeError:
+                code = next(code for code in data if self.char_table[code] is None)
+                raise UnsupportedPDFError("encoding", f"código {code} sin mapear")
+            return text, sum(map(self.width_table.__getitem__, data)), len(data), data.count(b" ")
+
+        chars = self.chars
+        widths = self.widths
+        default_width = self.default_width
+        text = []
+        width = 0.0
+        count = len(data) // 2
+        for position in range(0, count * 2, 2):
+            code = (data[position] << 8) | data[position + 1]
+            char = chars.get(code)
+            if char is None:
+                raise UnsupportedPDFError("encoding", f"CID {code} sin mapear")
+            text.append(char)
+            width += widths.get(code, default_width)
+        return "".join(text), width, count, 0
+
+
+def _cid_widths(document: NativePDFDocument, w_array: object) -> Dict[int, float]:
+    widths: Dict[int, float] = {}
+    if not isinstance(w_array, list):
+        return widths
+    position = 0
+    while position + 1 < len(w_array):
+        first = document.resolve(w_array[position])
+        second = document.resolve(w_array[position + 1])
+        if isinstance(second, list):
+            for offset, width in enumerate(second):
+                widths[first + offset] = document.resolve(width)
+            position += 2
+        elif position + 2 < len(w_array):
+            width = document.resolve(w_array[position + 2])
+            if isinstance(first, int) and isinstance(second, int) and second - first <= MAX_CMAP_RANGE:
+                for cid in range(first, second + 1):
+                    widths[cid] = width
+            position += 3
+        else:
+            break
+    return widths
+
+
+def _parse_cmap(data: bytes) -> Tuple[Optional[int], Dict[int, str]]:
+    """Mapa código -> texto de un CMap ToUnicode (bfchar y bfrange)."""
+    lexer = _Lexer(data)
+    mapping: Dict[int, str] = {}
+    code_length: Optional[int] = None
+    operands: List[object] = []
+
+    while True:
+        kind, value = lexer.next()
+        if kind is None:
+            break
+        if kind != "keyword":
+            if kind in ("string", "name", "num"):
+                operands.append(value)
+            elif kind == "array_open":
+                operands.append(lexer.value(kind, value, allow_refs=False))
+            continue
+
+        if value == "endcodespacerange":
+            lengths = {len(operand) for operand in operands if isinstance(operand, bytes)}
+            if len(lengths) > 1:
+                raise UnsupportedPDFError("font", "CMap con códigos de longitud variable")
+            if lengths:
+                code_length = lengths.pop()
+        elif value == "endbfchar":
+            for source, target in zip(operands[0::2], operands[1::2]):
+                if isinstance(source, bytes):
+                    text = _utf16(target) if isinstance(target, bytes) else glyph_to_unicode(str(target))
+                    if text is not None:
+                        mapping[int.from_bytes(source, "big")] = text
+        elif value == "endbfrange":
+            for low, high, target in zip(operands[0::3], operands[1::3], operands[2::3]):
+                if not isinstance(low, bytes) or not isinstance(high, bytes):
+                    continue
+                low_code, high_code = int.from_bytes(low, "big"), int.from_bytes(high, "big")
+                if high_code < low_code or high_code - low_code > MAX_CMAP_RANGE:
+                    continue
+                if isinstance(target, list):
+                    for offset, item in enumerate(target[:high_code - low_code + 1]):
+                        if isinstance(item, bytes):
+                            mapping[low_code + offset] = _utf16(item)
+                elif isinstance(target, bytes) and target:
+                    base = int.from_bytes(target, "big")
+                    for offset in range(high_code - low_code + 1):
+                        mapping[low_code + offset] = _utf16((base + offset).to_bytes(len(target), "big"))
+        operands = []
+
+    if code_length is None and mapping:
+        code_length = 2 if max(mapping) > 0xFF else 1
+    return code_length, mapping
+
+
+# ===== CONTENIDO DE LAS PÁGINAS =====
+
+def _multiply(m1: Tuple[float, ...], m2: Tuple[float, ...]) -> Tuple[float, ...]:
+    a1, b1, c1, d1, e1, f1 = m1
+    a2, b2, c2, d2, e2, f2 = m2
+    return (
+        a1 * a2 + b1 * c2,
+        a1 * b2 + b1 * d2,
+        c1 * a2 + d1 * c2,
+        c1 * b2 + d1 * d2,
+        e1 * a2 + f1 * c2 + e2,
+        e1 * b2 + f1 * d2 + f2
+    )
+
+
+class _TextBuilder:
+    """
+    Une los fragmentos de texto en líneas: salto de línea cuando cambia la
+    línea base y espacio cuando hay un hueco horizontal entre fragmentos.
+    """
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.y: Optional[float] = None
+        self.end_x = 0.0
+
+    def add(self, text: str, x: float, y: float, size: float) -> None:
+        if not text:
+            return
+        if self.y is not None:
+            last = self.parts[-1][-1:] if self.parts else ""
+            if abs(y - self.y) > size * 0.5:
+                if last != "\n":
+                    self.parts.append("\n")
+            elif x - self.end_x > size * 0.15 and not last.isspace() and not text[0].isspace():
+                self.parts.append(" ")
+        self.parts.append(text)
+        self.y = y
+
+    def text(self) -> str:
+        return "".join(self.parts)
+
+
+class _TextState:
+    __slots__ = ("font", "size", "char_spacing", "word_spacing", "scale", "leading")
+
+    def __init__(self):
+        self.font: Optional[_Font] = None
+        self.size = 0.0
+        self.char_spacing = 0.0
+        self.word_spacing = 0.0
+        self.scale = 1.0
+        self.leading = 0.0
+
+    def copy(self) -> "_TextState":
+        state = _TextState()
+        state.font, state.size = self.font, self.size
+        state.char_spacing, state.word_spacing = self.char_spacing, self.word_spacing
+        state.scale, state.leading = self.scale, self.leading
+        return state
+
+
+class _ContentInterpreter:
+    # Cada cuántos operadores se mira el reloj cuando hay límite de tiempo
+    DEADLINE_CHECK_INTERVAL = 256
+
+    def __init__(self, document: NativePDFDocument, builder: _TextBuilder, deadline: float = 0.0):
+        self.document = document
+        self.builder = builder
+        self.deadline = deadline
+        self._operations = 0
+
+    def run(self, content: bytes, resources: Dict, ctm: Tuple[float, ...], depth: int) -> None:
+        lexer = _Lexer(content)
+        state = _TextState()
+        stack: List[Tuple[Tuple[float, ...], _TextState]] = []
+        tm = tlm = IDENTITY
+        operands: List[object] = []
+
+        while True:
+            kind, value = lexer.next()
+            if kind is None:
+                break
+            if kind != "keyword":
+                if kind in ("array_open", "dict_open"):
+                    value = lexer.value(kind, value, allow_refs=False)
+                operands.append(value)
+                continue
+
+            op = value
+            if self.deadline:
+                self._operations += 1
+                if self._operations % self.DEADLINE_CHECK_INTERVAL == 0 and time.perf_counter() > self.deadline:
+                    raise PDFLimitExceeded("page_time", "la página supera el tiempo máximo de extracción")
+            try:
+                if op in ("Tj", "'", '"'):
+                    if op != "Tj":
+                        if op == '"':
+                            state.word_spacing, state.char_spacing = operands[0], operands[1]
+                        tm = tlm = (*tlm[:4], tlm[4] - state.leading * tlm[2], tlm[5] - state.leading * tlm[3])
+                    tm = self._show(operands[-1], state, tm, ctm)
+                elif op == "TJ":
+                    for item in operands[-1]:
+                        if isinstance(item, bytes):
+                            tm = self._show(item, state, tm, ctm)
+                        elif isinstance(item, (int, float)):
+                            shift = -item / 1000 * state.size * state.scale
+                            tm = (*tm[:4], tm[4] + shift * tm[0], tm[5] + shift * tm[1])
+                elif op == "Td" or op == "TD":
+                    tx, ty = operands[-2], operands[-1]
+                    if op == "TD":
+                        state.leading = -ty
+                    tm = tlm = (*tlm[:4], tlm[4] + tx * tlm[0] + ty * tlm[2], tlm[5] + tx * tlm[1] + ty * tlm[3])
+                elif op == "T*":
+                    tm = tlm = (*tlm[:4], tlm[4] - state.leading * tlm[2], tlm[5] - state.leading * tlm[3])
+                elif op == "Tm":
+                    tm = tlm = tuple(float(number) for number in operands[-6:])
+                elif op == "Tf":
+                    state.font = self.document.font(resources, operands[-2])
+                    state.size = operands[-1]
+                elif op == "BT":
+                    tm = tlm = IDENTITY
+                elif op == "TL":
+                    state.leading = operands[-1]
+                elif op == "Tc":
+                    state.char_spacing = operands[-1]
+                elif op == "Tw":
+                    state.word_spacing = operands[-1]
+                elif op == "Tz":
+                    state.scale = operands[-1] / 100
+                elif op == "cm":
+                    ctm = _multiply(tuple(float(number) for number in operands[-6:]), ctm)
+                elif op == "q":
+                    stack.append((ctm, state.copy()))
+                elif op == "Q":
+                    if stack:
+                        ctm, state = stack.pop()
+                elif op == "Do":
+                    self._do(operands[-1], resources, ctm, depth)
+                elif op == "BI":
+                    self._skip_inline_image(lexer)
+            except (IndexError, TypeError, ValueError):
+                # Operador con operandos incorrectos: se ignora, como hacen los visores
+                pass
+            operands = []
+
+    def _show(self, data: bytes, state: _TextState, tm: Tuple[float, ...], ctm: Tuple[float, ...]) -> Tuple[float, ...]:
+        if state.font is None:
+            raise UnsupportedPDFError("font", "texto sin fuente seleccionada")
+        text, width, codes, spaces = state.font.decode(data)
+
+        start = _multiply(tm, ctm)
+        size = abs(state.size) * math.hypot(start[2], start[3]) or abs(state.size)
+        self.builder.add(text, start[4], start[5], size)
+
+        advance = (width / 1000 * state.size + state.char_spacing * codes + state.word_spacing * spaces) * state.scale
+        tm = (*tm[:4], tm[4] + advance * tm[0], tm[5] + advance * tm[1])
+        self.builder.end_x = _multiply(tm, ctm)[4]
+        return tm
+
+    def _do(self, name: str, resources: Dict, ctm: Tuple[float, ...], depth: int) -> None:
+        xobjects = self.document.resolve(resources.get("XObject"))
+        xobject = self.document.resolve(xobjects.get(name)) if isinstance(xobjects, dict) else None
+        if not isinstance(xobject, Stream) or xobject.dict.get("Subtype") != "Form":
+            return
+        if depth >= MAX_FORM_DEPTH:
+            raise UnsupportedPDFError("structure", "XObjects anidados en exceso")
+
+        matrix = self.document.resolve(xobject.dict.get("Matrix"))
+        if isinstance(matrix, list) and len(matrix) == 6:
+            ctm = _multiply(tuple(float(number) for number in matrix), ctm)
+        form_resources = self.document.resolve(xobject.dict.get("Resources"))
+        self.run(
+            self.document.stream_data(xobject),
+            form_resources if isinstance(form_resources, dict) else resources,
+            ctm,
+            depth + 1
+        )
+
+    @staticmethod
+    def _skip_inline_image(lexer: _Lexer) -> None:
+        while True:
+            kind, value = lexer.next()
+            if kind is None:
+                return
+            if kind == "keyword" and value == "ID":
+                break
+        match = _INLINE_IMAGE_END_RE.search(lexer.data, lexer.pos)
+        lexer.pos = match.end() if match else len(lexer.data)
+
+
+# ===== BACKEND =====
+
+@contextmanager
+def _pdf_bytes(pdf_source: Union[bytes, BinaryIO]) -> Iterator[object]:
+    if isinstance(pdf_source, (bytes, bytearray)):
+        yield pdf_source
+        return
+    if isinstance(pdf_source, memoryview):
+        yield pdf_source.tobytes()
+        return
+
+    # Ficheros en disco (CLI por lotes): mmap sin copiar el PDF a memoria
+    if isinstance(pdf_source, (io.BufferedReader, io.FileIO)):
+        try:
+            mapped = mmap.mmap(pdf_source.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            mapped = None
+        if mapped is not None:
+            try:
+                yield mapped
+            finally:
+                mapped.close()
+            return
+
+    pdf_source.seek(0)
+    yield pdf_source.read()
+
+
+class NativePDFBackend:
+    name = "native"
+
+    def load(self) -> None:
+        # Sin dependencias que importar
+        pass
+
+    @contextmanager
+    def open(self, pdf_source: Union[bytes, BinaryIO], max_stream_size: int = 0) -> Iterator[NativePDFDocument]:
+        with _pdf_bytes(pdf_source) as data:
+            yield NativePDFDocument(data, max_stream_size)
+
+    def count_pages(self, pdf_source: Union[bytes, BinaryIO]) -> int:
+        with self.open(pdf_source) as document:
+            return document.num_pages
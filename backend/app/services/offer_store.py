@@ -0,0 +1,272 @@
+import heapq
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from app import config
+from app.services.scoring_engine import ScoringEngine
+
+
+class OfferStore:
+    """
+    Catálogo persistente (SQLite) de ofertas ya parseadas con un índice
+    invertido skill -> ofertas y el número de requisitos de cada oferta
+    precalculado. Para un CV se cuentan las coincidencias recorriendo solo
+    las listas de sus skills, sin volver a parsear el texto de las ofertas.
+
+    Las ofertas sin ninguna skill en común comparten score dentro de cada
+    grupo (nivel requerido, tiene o no requisitos), así que solo se puntúan
+    las k primeras de cada grupo y el top-k sigue siendo exacto.
+    """
+
+    def __init__(
+        self,
+        db_path: str = config.OFFER_STORE_DB,
+        scoring_engine: Optional[ScoringEngine] = None
+    ):
+        self.scoring_engine = scoring_engine or ScoringEngine()
+        self._lock = threading.RLock()
+
+        # skill -> ids de ofertas que la requieren
+        self._postings: Dict[str, Set[str]] = {}
+        # id -> (skills requeridas, nº de requisitos, nivel requerido)
+        self._offers: Dict[str, Tuple[Set[str], int, str]] = {}
+        # (nivel requerido, sin requisitos técnicos) -> ids de ofertas
+        self._groups: Dict[Tuple[str, bool], Set[str]] = {}
+
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._create_schema()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._offers)
+
+    def add(
+        self,
+        job_analysis: Dict,
+        offer_id: Optional[str] = None,
+        label: Optional[str] = None,
+        offer_text: Optional[str] = None
+    ) -> str:
+        offer_id = offer_id or uuid.uuid4().hex
+        skills, required_count, level_required = self._summarize(job_analysis)
+
+        with self._lock:
+            if offer_id in self._offers:
+                self._unindex(offer_id)
+
+            self._db.execute(
+                "INSERT OR REPLACE INTO offers "
+                "(id, label, offer_text, analysis, required_count, level_required, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    offer_id,
+                    label,
+                    offer_text,
+                    json.dumps(job_analysis, ensure_ascii=False),
+                    required_count,
+                    level_required,
+                    time.time()
+                )
+            )
+            self._db.execute("DELETE FROM offer_skills WHERE offer_id = ?", (offer_id,))
+            self._db.executemany(
+                "INSERT INTO offer_skills (skill, offer_id) VALUES (?, ?)",
+                [(skill, offer_id) for skill in skills]
+            )
+            self._db.commit()
+
+            self._index(offer_id, skills, required_count, level_required)
+
+        return offer_id
+
+    def delete(self, offer_id: str) -> bool:
+        with self._lock:
+            if offer_id not in self._offers:
+                return False
+
+            self._db.execute("DELETE FROM offer_skills WHERE offer_id = ?", (offer_id,))
+            self._db.execute("DELETE FROM offers WHERE id = ?", (offer_id,))
+            self._db.commit()
+
+            self._unindex(offer_id)
+            return True
+
+    def get(self, offer_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, label, offer_text, analysis, created_at FROM offers WHERE id = ?",
+                (offer_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return {
+            "offer_id": row[0],
+            "label": row[1],
+            "offer_text": row[2],
+            "job_analysis": json.loads(row[3]),
+            "created_at": row[4]
+        }
+
+    def search(self, cv_analysis: Dict, top_k: int = 10) -> Dict:
+        weights = self.scoring_engine.weights
+        taxonomy = self.scoring_engine.registry.get()
+        matcher = taxonomy.skill_matcher
+        # Nombre canónico y el tal cual: las ofertas guardadas antes de añadir un alias
+        # siguen indexadas con la variante que se detectó entonces
+        cv_skills = {
+            name.lower()
+            for skills_list in cv_analysis.get("technical_skills", {}).values()
+            for skill in skills_list
+            for name in (skill, matcher.canonical_name(skill))
+        }
+        cv_level = cv_analysis.get("experience", {}).get("level", "unknown")
+        context_score = self.scoring_engine._calculate_context_match(cv_analysis.get("context", {}))["score"]
+
+        with self._lock:
+            # Coincidencias por oferta recorriendo solo las skills del CV
+            found_counts: Dict[str, int] = {}
+            for skill in cv_skills:
+                for offer_id in self._postings.get(skill, ()):
+                    found_counts[offer_id] = found_counts.get(offer_id, 0) + 1
+
+            experience_table = {
+                level: self.scoring_engine._calculate_experience_match(
+                    {"level": cv_level},
+                    {"level_required": level},
+                    taxonomy
+                )["score"]
+                for level, _ in self._groups
+            }
+
+            scored: List[Tuple[float, str, int]] = []
+
+            def add_score(offer_id: str, found: int) -> None:
+                _, required_count, level_required = self._offers[offer_id]
+                if required_count == 0:
+                    skills_score = 100.0
+                else:
+                    # Una oferta antigua puede tener dos variantes de la misma skill
+                    found = min(found, required_count)
+                    skills_score = (found / required_count) * 100
+                total_score = (
+                    skills_score * weights["skills"] +
+                    experience_table[level_required] * weights["experience"] +
+                    context_score * weights["context"]
+                )
+                scored.append((round(total_score, 2), offer_id, found))
+
+            for offer_id, found in found_counts.items():
+                add_score(offer_id, found)
+
+            # Ofertas sin skills en común: mismo score dentro de cada grupo
+            for offer_ids in self._groups.values():
+                remaining = (offer_id for offer_id in offer_ids if offer_id not in found_counts)
+                for offer_id in heapq.nsmallest(top_k, remaining):
+                    add_score(offer_id, 0)
+
+            catalog_size = len(self._offers)
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+
+        results = []
+        for total_score, offer_id, found in scored[:top_k]:
+            stored = self.get(offer_id)
+            if stored is None:
+                continue
+            results.append({
+                "offer_id": offer_id,
+                "label": stored["label"],
+                "total_score": total_score,
+                "skills_found": found,
+                # Análisis guardado: la oferta no se vuelve a parsear
+                "match_result": self.scoring_engine.calculate_match(cv_analysis, stored["job_analysis"])
+            })
+
+        return {
+            "catalog_size": catalog_size,
+            "matched_by_index": len(found_counts),
+            "results": results
+        }
+
+    def _summarize(self, job_analysis: Dict) -> Tuple[Set[str], int, str]:
+        # Se indexa y cuenta por skill canónica: "Vue" y "Vue.js" son un solo requisito
+        taxonomy = self.scoring_engine.registry.get()
+        matcher = taxonomy.skill_matcher
+        skills = {
+            matcher.canonical_name(skill).lower()
+            for skills_list in job_analysis.get("required_skills", {}).values()
+            for skill in skills_list
+        }
+        level_required = job_analysis.get("required_experience", {}).get("level_required", "unknown")
+        return skills, len(skills), level_required
+
+    def _index(self, offer_id: str, skills: Set[str], required_count: int, level_required: str) -> None:
+        for skill in skills:
+            self._postings.setdefault(skill, set()).add(offer_id)
+        self._offers[offer_id] = (skills, required_count, level_required)
+        self._groups.setdefault((level_required, required_count == 0), set()).add(offer_id)
+
+    def _unindex(self, offer_id: str) -> None:
+        skills, required_count, level_required = self._offers.pop(offer_id)
+        for skill in skills:
+            ids = self._postings.get(skill)
+            if ids is not None:
+                ids.discard(offer_id)
+                if not ids:
+                    del self._postings[skill]
+
+        group = (level_required, required_count == 0)
+        group_ids = self._groups.get(group)
+        if group_ids is not None:
+            group_ids.discard(offer_id)
+            if not group_ids:
+                del self._groups[group]
+
+    def _create_schema(self) -> None:
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS offers ("
+            "id TEXT PRIMARY KEY, label TEXT, offer_text TEXT, analysis TEXT NOT NULL, "
+            "required_count INTEGER NOT NULL, level_required TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS offer_skills ("
+            "skill TEXT NOT NULL, offer_id TEXT NOT NULL, "
+            "PRIMARY KEY (skill, offer_id)) WITHOUT ROWID"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_offer_skills_offer ON offer_skills (offer_id)"
+        )
+        self._db.commit()
+
+    def _load(self) -> None:
+        # Se cargan el índice y los conteos precalculados, sin leer los análisis
+        skills_by_offer: Dict[str, Set[str]] = {}
+        for skill, offer_id in self._db.execute("SELECT skill, offer_id FROM offer_skills"):
+            skills_by_offer.setdefault(offer_id, set()).add(skill)
+
+        for offer_id, required_count, level_required in self._db.execute(
+            "SELECT id, required_count, level_required FROM offers"
+        ):
+            self._index(offer_id, skills_by_offer.get(offer_id, set()), required_count, level_required)
+
+
+_offer_store: Optional[OfferStore] = None
+_offer_store_lock = threading.Lock()
+
+
+def get_offer_store() -> OfferStore:
+    global _offer_store
+    if _offer_store is None:
+        with _offer_store_lock:
+            if _offer_store is None:
+                _offer_store = OfferStore()
+    return _offer_store
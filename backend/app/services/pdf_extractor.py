@@ -1,47 +1,43 @@
-import PyPDF2
+import time
+from contextlib import contextmanager
 from io import BytesIO
-from typing import Dict, Optional
+from types import ModuleType
+from typing import TYPE_CHECKING, BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Sequence, Union
 
-class PDFExtractor:
-    
-    def extract_text(self, pdf_bytes: bytes) -> Dict[str, any]:
-        try:
-            pdf_file = BytesIO(pdf_bytes)
-            
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            
-            num_pages = len(pdf_reader.pages)
-            
-            text_content = []
-            for page_num in range(num_pages):
-                page = pdf_reader.pages[page_num]
-                text = page.extract_text()
-                if text.strip():  # Solo añadir si hay texto
-                    text_content.append(text)
-            
-            # Unir todo el texto
-            full_text = "\n\n".join(text_content)
-            
-            return {
-                "success": True,
-                "text": full_text,
-                "num_pages": num_pages,
-                "num_characters": len(full_text),
-                "metadata": self._extract_metadata(pdf_reader)
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "text": "",
-                "num_pages": 0,
-                "num_characters": 0
-            }
-    
-    def _extract_metadata(self, pdf_reader: PyPDF2.PdfReader) -> Dict[str, Optional[str]]:
+from app import config
+from app.services.native_pdf import NativePDFBackend, PDFLimitExceeded, UnsupportedPDFError
+
+if TYPE_CHECKING:
+    import PyPDF2
+
+
+class _PyPDF2Document:
+    """Misma interfaz que NativePDFDocument sobre un PdfReader."""
+
+    def __init__(self, reader: "PyPDF2.PdfReader"):
+        self.reader = reader
+        self.num_pages = len(reader.pages)
+
+    def page_text(self, index: int, time_limit: float = 0.0) -> str:
+        # PyPDF2 no se puede interrumpir a mitad de página: el límite de tiempo
+        # lo comprueba PDFExtractor al terminarla
+        return self.reader.pages[index].extract_text()
+
+    def release(self, index: int) -> None:
+        # Suelta los streams de contenido ya leídos de la caché de objetos del reader
+        contents = self.reader.pages[index].get("/Contents")
+        references = list(contents) if isinstance(contents, list) else [contents]
+        if hasattr(contents, "idnum"):
+            resolved = self.reader.resolved_objects.get((contents.generation, contents.idnum))
+            if isinstance(resolved, list):
+                references.extend(resolved)
+        for reference in references:
+            if hasattr(reference, "idnum"):
+                self.reader.resolved_objects.pop((reference.generation, reference.idnum), None)
+
+    def metadata(self) -> Dict[str, Optional[str]]:
         try:
-            metadata = pdf_reader.metadata
+            metadata = self.reader.metadata
             if metadata:
                 return {
                     "author": metadata.get("/Author", ""),
@@ -51,5 +47,254 @@ class PDFExtractor:
                 }
         except:
             pass
-        
-        return {}
\ No newline at end of file
+
+        return {}
+
+
+class PyPDF2Backend:
+    name = "pypdf2"
+
+    def load(self) -> ModuleType:
+        # PyPDF2 se importa en el primer uso (o en warm_up), no al importar el módulo:
+        # es la mayor parte del tiempo de import de la aplicación
+        import PyPDF2
+        return PyPDF2
+
+    @contextmanager
+    def open(self, pdf_source: Union[bytes, BinaryIO], max_stream_size: int = 0) -> Iterator[_PyPDF2Document]:
+        yield _PyPDF2Document(self.load().PdfReader(_as_stream(pdf_source)))
+
+    def count_pages(self, pdf_source: Union[bytes, BinaryIO]) -> int:
+        return len(self.load().PdfReader(_as_stream(pdf_source)).pages)
+
+
+BACKENDS = {
+    NativePDFBackend.name: NativePDFBackend,
+    PyPDF2Backend.name: PyPDF2Backend
+}
+
+
+def _as_stream(pdf_source: Union[bytes, BinaryIO]) -> BinaryIO:
+    # Los ficheros (p. ej. el spooled de la subida) se leen sin copiarlos
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        return BytesIO(pdf_source)
+    pdf_source.seek(0)
+    return pdf_source
+
+
+class ExtractionLimits(NamedTuple):
+    """Límites de la extracción acotada (0 = sin límite)."""
+    max_pages: int = 0
+    max_chars: int = 0
+    page_time_limit: float = 0.0
+    max_stream_size: int = 0
+
+    @classmethod
+    def from_config(cls) -> "ExtractionLimits":
+        return cls(
+            config.PDF_MAX_PAGES,
+            config.PDF_MAX_CHARS,
+            config.PDF_PAGE_TIME_LIMIT,
+            config.PDF_MAX_STREAM_SIZE
+        )
+
+
+class TextBudget:
+    """
+    Acumula el texto página a página sin pasar de max_chars: la página que
+    no cabe entera se corta (truncated) y full() indica que no hace falta
+    seguir.
+    """
+
+    SEPARATOR = "\n\n"
+
+    def __init__(self, max_chars: int = 0):
+        self.max_chars = max_chars
+        self.parts: List[str] = []
+        self.size = 0
+        self.truncated = False
+
+    def add(self, text: str) -> None:
+        # Solo las páginas con texto
+        if not text.strip() or self.full():
+            return
+        if self.parts:
+            text = self.SEPARATOR + text
+        if self.max_chars and self.size + len(text) > self.max_chars:
+            text = text[:self.max_chars - self.size]
+            self.truncated = True
+        self.parts.append(text)
+        self.size += len(text)
+
+    def full(self) -> bool:
+        return bool(self.max_chars) and self.size >= self.max_chars
+
+    def text(self) -> str:
+        return "".join(self.parts)
+
+
+class PDFExtractor:
+    """
+    Prueba los backends en orden: el primero que devuelve texto gana. Un
+    backend que no sabe leer el PDF (UnsupportedPDFError) o falla cede el
+    turno al siguiente; el resultado incluye el backend usado y el tiempo
+    de cada intento ("backend_timings") para las métricas.
+
+    La extracción está acotada por ExtractionLimits: se leen como mucho
+    max_pages páginas, se para al llegar a max_chars caracteres, una página
+    que tarda más de page_time_limit corta la extracción y los objetos de
+    cada página se sueltan al terminarla. Si se ha cortado, el resultado lo
+    indica con "truncated" y "truncation_reason".
+    """
+
+    def __init__(self, backends: Optional[Sequence[str]] = None, limits: Optional[ExtractionLimits] = None):
+        names = config.PDF_BACKENDS if backends is None else backends
+        self.limits = ExtractionLimits.from_config() if limits is None else limits
+        self.backends = []
+        for name in names:
+            if name in BACKENDS:
+                self.backends.append(BACKENDS[name]())
+            else:
+                print(f"Backend de PDF desconocido '{name}', se ignora")
+        if not self.backends:
+            self.backends = [PyPDF2Backend()]
+
+    def load_backends(self) -> None:
+        for backend in self.backends:
+            backend.load()
+
+    def extract_text(
+        self,
+        pdf_source: Union[bytes, BinaryIO],
+        first_page: int = 0,
+        last_page: Optional[int] = None
+    ) -> Dict[str, any]:
+        timings: List[Dict] = []
+        error = "Ningún backend ha podido leer el PDF"
+        # Cifrado o por encima de los límites: otro intento daría el mismo error
+        retryable = True
+
+        for position, backend in enumerate(self.backends):
+            start = time.perf_counter()
+            try:
+                # Rango de páginas [first_page, last_page) para extracción por bloques
+                result = self._extract_with(backend, pdf_source, first_page, last_page)
+            except UnsupportedPDFError as e:
+                timings.append(_timing(backend.name, start, "fallback", e.reason))
+                error = str(e)
+                if e.reason == "encrypted":
+                    retryable = False
+                continue
+            except (PDFLimitExceeded, MemoryError) as e:
+                # Un PDF que agota los límites no se reintenta con otro backend
+                timings.append(_timing(backend.name, start, "error", type(e).__name__))
+                error = f"El PDF supera los límites de extracción ({e})"
+                retryable = False
+                break
+            except Exception as e:
+                timings.append(_timing(backend.name, start, "error", type(e).__name__))
+                error = str(e)
+                continue
+
+            if not result["text"] and result["pages_extracted"] and position < len(self.backends) - 1:
+                # Sin texto: puede ser un escaneo o algo que este backend no ha sabido leer
+                timings.append(_timing(backend.name, start, "fallback", "empty"))
+                error = "empty"
+                continue
+            timings.append(_timing(backend.name, start, "ok"))
+
+            result.update({
+                "success": True,
+                "num_characters": len(result["text"]),
+                "backend": backend.name,
+                "backend_timings": timings
+            })
+            return result
+
+        return {
+            "success": False,
+            "error": error,
+            "retryable": retryable,
+            "text": "",
+            "num_pages": 0,
+            "num_characters": 0,
+            "backend_timings": timings
+        }
+
+    def _extract_with(
+        self,
+        backend: Union[NativePDFBackend, PyPDF2Backend],
+        pdf_source: Union[bytes, BinaryIO],
+        first_page: int,
+        last_page: Optional[int]
+    ) -> Dict[str, any]:
+        limits = self.limits
+        budget = TextBudget(limits.max_chars)
+        truncation_reason = None
+
+        with backend.open(pdf_source, limits.max_stream_size) as document:
+            num_pages = document.num_pages
+            stop = num_pages if last_page is None else min(last_page, num_pages)
+            if limits.max_pages and stop > limits.max_pages:
+                stop = limits.max_pages
+                truncation_reason = "max_pages"
+
+            pages_extracted = 0
+            for index in range(first_page, stop):
+                if budget.full():
+                    truncation_reason = "max_chars"
+                    break
+                page_start = time.perf_counter()
+                try:
+                    budget.add(document.page_text(index, limits.page_time_limit))
+                except PDFLimitExceeded as e:
+                    # Una página imposible corta la extracción pero se devuelve lo ya leído
+                    truncation_reason = e.reason
+                    break
+                finally:
+                    document.release(index)
+                pages_extracted += 1
+                if limits.page_time_limit and time.perf_counter() - page_start > limits.page_time_limit:
+                    truncation_reason = "page_time"
+                    break
+
+            if budget.truncated and truncation_reason is None:
+                truncation_reason = "max_chars"
+            metadata = document.metadata()
+
+        return {
+            "text": budget.text(),
+            "num_pages": num_pages,
+            "pages_extracted": pages_extracted,
+            "truncated": truncation_reason is not None,
+            "truncation_reason": truncation_reason,
+            "metadata": metadata
+        }
+
+    def count_pages(self, pdf_source: Union[bytes, BinaryIO]) -> int:
+        for backend in self.backends[:-1]:
+            try:
+                return backend.count_pages(pdf_source)
+            except Exception:
+                continue
+        return self.backends[-1].count_pages(pdf_source)
+
+
+def extraction_summary(extraction_result: Dict) -> Dict:
+    """Campos de la extracción que se devuelven en cv_info."""
+    return {
+        "num_pages": extraction_result["num_pages"],
+        "num_characters": extraction_result["num_characters"],
+        "pages_extracted": extraction_result["pages_extracted"],
+        "truncated": extraction_result["truncated"],
+        "truncation_reason": extraction_result["truncation_reason"]
+    }
+
+
+def _timing(backend: str, start: float, outcome: str, reason: Optional[str] = None) -> Dict:
+    return {
+        "backend": backend,
+        "seconds": time.perf_counter() - start,
+        "outcome": outcome,
+        "reason": reason
+    }
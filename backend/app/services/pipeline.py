@@ -0,0 +1,164 @@
+import cProfile
+import time
+from typing import BinaryIO, Dict, List, Optional, Union
+
+from app.services.pdf_extractor import PDFExtractor
+from app.services.cv_parser import CVParser
+from app.services.job_parser import JobParser
+from app.services.scoring_engine import ScoringEngine
+from app.services.recommendations import RecommendationsEngine
+from app.services.bulk_scoring import BulkScorer
+from app.services.job_cache import normalize_offer_text
+from app.services.taxonomy import taxonomy_registry
+
+# Etapas del pipeline como funciones de módulo para poder enviarlas a un
+# pool de procesos. Cada proceso mantiene sus propias instancias de servicios.
+pdf_extractor = PDFExtractor()
+cv_parser = CVParser()
+job_parser = JobParser()
+scoring_engine = ScoringEngine()
+recommendations_engine = RecommendationsEngine()
+bulk_scorer = BulkScorer(scoring_engine)
+
+
+def init_worker(memory_limit: int = 0) -> None:
+    """
+    Inicializador de los procesos del pool: limita su memoria (RLIMIT_AS)
+    para que un PDF hostil acabe en MemoryError dentro del worker y no
+    agotando la de la máquina, y después hace warm_up.
+    """
+    if memory_limit > 0:
+        import resource
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            memory_limit = min(memory_limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, hard))
+    warm_up()
+
+
+def warm_up() -> None:
+    # Carga la taxonomía e importa los backends de PDF al arrancar el worker en lugar de en la primera petición
+    taxonomy_registry.get()
+    pdf_extractor.load_backends()
+
+
+def count_pdf_pages(pdf_source: Union[bytes, BinaryIO]) -> int:
+    return pdf_extractor.count_pages(pdf_source)
+
+
+def extract_pdf(pdf_source: Union[bytes, BinaryIO], first_page: int = 0, last_page: Optional[int] = None) -> Dict:
+    return pdf_extractor.extract_text(pdf_source, first_page, last_page)
+
+
+def analyze_texts(cv_text: str, job_text: str) -> Dict:
+    start = time.perf_counter()
+    job_analysis = job_parser.parse(job_text)
+    job_parsing = time.perf_counter() - start
+
+    analysis = analyze_parsed_job(cv_text, job_analysis)
+    analysis["timings"]["job_parsing"] = job_parsing
+    return analysis
+
+
+def analyze_parsed_job(cv_text: str, job_analysis: Dict) -> Dict:
+    # Tiempos medidos en el propio worker, sin cola ni serialización entre procesos
+    timings = {}
+
+    start = time.perf_counter()
+    cv_analysis = cv_parser.parse(cv_text)
+    timings["cv_parsing"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    match_result = scoring_engine.calculate_match(cv_analysis, job_analysis)
+    timings["scoring"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    recommendations = recommendations_engine.generate(
+        cv_analysis,
+        job_analysis,
+        match_result
+    )
+    timings["recommendations"] = time.perf_counter() - start
+
+    return {
+        "cv_analysis": cv_analysis,
+        "job_analysis": job_analysis,
+        "match_result": match_result,
+        "recommendations": recommendations,
+        "timings": timings
+    }
+
+
+def profile_analysis(pdf_bytes: bytes, job_text: str) -> Dict:
+    """
+    Extracción y análisis completos bajo cProfile dentro del worker, sin
+    pasar por las cachés para que el perfil muestre el trabajo real.
+    """
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+
+    profiler.enable()
+    try:
+        extraction_result = extract_pdf(pdf_bytes)
+        analysis = None
+        if extraction_result["success"]:
+            analysis = analyze_texts(extraction_result["text"], normalize_offer_text(job_text))
+    finally:
+        profiler.disable()
+
+    profiler.create_stats()
+    return {
+        "extraction": extraction_result,
+        "analysis": analysis,
+        "stats": profiler.stats,
+        "wall_time": time.perf_counter() - start
+    }
+
+
+def parse_cv(cv_text: str) -> Dict:
+    return cv_parser.parse(cv_text)
+
+
+def parse_jobs(job_texts: List[str]) -> List[Dict]:
+    return [job_parser.parse(job_text) for job_text in job_texts]
+
+
+def match_cv(cv_analysis: Dict, job_analysis: Dict) -> Dict:
+    return scoring_engine.calculate_match(cv_analysis, job_analysis)
+
+
+def recommend(cv_analysis: Dict, job_analysis: Dict, match_result: Dict) -> Dict:
+    return recommendations_engine.generate(cv_analysis, job_analysis, match_result)
+
+
+def rank_job_offers(cv_analysis: Dict, job_analyses: List[Dict], top_k: Optional[int] = None) -> List[Dict]:
+    results = [
+        {
+            "offer_index": index,
+            "job_analysis": job_analysis,
+            "match_result": scoring_engine.calculate_match(cv_analysis, job_analysis)
+        }
+        for index, job_analysis in enumerate(job_analyses)
+    ]
+
+    # Orden estable: a igualdad de score se respeta el orden de envío
+    results.sort(key=lambda result: -result["match_result"]["total_score"])
+
+    for rank, result in enumerate(results, start=1):
+        result["rank"] = rank
+        # Las recomendaciones solo se generan para las k mejores ofertas
+        if top_k is None or rank <= top_k:
+            result["recommendations"] = recommendations_engine.generate(
+                cv_analysis,
+                result["job_analysis"],
+                result["match_result"]
+            )
+        else:
+            result["recommendations"] = None
+
+    return results
+
+
+def score_candidates(cv_analyses: List[Dict], job_analysis: Dict, top_k: Optional[int] = None) -> List[Dict]:
+    matrix = bulk_scorer.build_matrix(cv_analyses)
+    return bulk_scorer.rank(matrix, job_analysis, top_k)
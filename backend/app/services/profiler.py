@@ -0,0 +1,93 @@
+import io
+import json
+import marshal
+import pstats
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app import config
+
+PROFILE_FORMATS = {
+    # Fichero estándar de cProfile: pstats.Stats(ruta), snakeviz, gprof2dot...
+    "pstats": ("pstats", "application/octet-stream"),
+    # Resumen legible ordenado por tiempo acumulado
+    "text": ("txt", "text/plain; charset=utf-8"),
+}
+
+_PROFILE_ID = re.compile(r'^\d{13}-[0-9a-f]{8}$')
+
+
+class _StatsHolder:
+    # pstats.Stats acepta cualquier objeto con create_stats() y stats
+    def __init__(self, stats: Dict):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+def render_summary(stats: Dict, limit: int = 40) -> str:
+    stream = io.StringIO()
+    summary = pstats.Stats(_StatsHolder(stats), stream=stream)
+    summary.sort_stats("cumulative").print_stats(limit)
+    return stream.getvalue()
+
+
+class ProfileStore:
+    """
+    Buffer circular en disco de perfiles de cProfile. Cada perfil se guarda
+    como .pstats, un resumen .txt y sus metadatos .json; al superar
+    max_entries se borran los más antiguos.
+    """
+
+    def __init__(self, directory: str = config.PROFILE_DIR, max_entries: int = config.PROFILE_MAX_ENTRIES):
+        self.directory = Path(directory)
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+
+    def save(self, stats: Dict, metadata: Dict) -> str:
+        # El ID empieza por el timestamp en ms: el orden alfabético es el cronológico
+        profile_id = f"{int(time.time() * 1000):013d}-{uuid.uuid4().hex[:8]}"
+        metadata = {"profile_id": profile_id, "created_at": time.time(), **metadata}
+
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / f"{profile_id}.pstats").write_bytes(marshal.dumps(stats))
+            (self.directory / f"{profile_id}.txt").write_text(render_summary(stats), encoding='utf-8')
+            # Los metadatos se escriben al final: un perfil sin .json no se lista
+            (self.directory / f"{profile_id}.json").write_text(
+                json.dumps(metadata, ensure_ascii=False),
+                encoding='utf-8'
+            )
+            self._evict()
+
+        return profile_id
+
+    def list(self) -> List[Dict]:
+        profiles = []
+        for meta_path in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                profiles.append(json.loads(meta_path.read_text(encoding='utf-8')))
+            except (OSError, ValueError):
+                # Borrado por la rotación mientras se listaba
+                continue
+        return profiles
+
+    def path_for(self, profile_id: str, fmt: str = "pstats") -> Optional[Path]:
+        if not _PROFILE_ID.match(profile_id) or fmt not in PROFILE_FORMATS:
+            return None
+        path = self.directory / f"{profile_id}.{PROFILE_FORMATS[fmt][0]}"
+        return path if path.exists() else None
+
+    def _evict(self) -> None:
+        profile_ids = sorted(path.stem for path in self.directory.glob("*.json"))
+        for profile_id in profile_ids[:max(0, len(profile_ids) - self.max_entries)]:
+            for extension in ("json", "pstats", "txt"):
+                (self.directory / f"{profile_id}.{extension}").unlink(missing_ok=True)
+
+
+profile_store = ProfileStore()
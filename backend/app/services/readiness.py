@@ -0,0 +1,56 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.services.metrics import CallbackMetric, LabelValues, metrics_registry
+
+
+class Readiness:
+    """
+    Estado del arranque del servidor. Mide el cold start por fases desde que
+    se importa la aplicación: import de módulos, inicio del lifespan y
+    warm-up (workers arrancados y taxonomía cargada).
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.ready = False
+        self.error: Optional[str] = None
+
+    def mark(self, phase: str) -> None:
+        # Segundos desde el import de la aplicación hasta el final de la fase
+        self.phases[phase] = time.perf_counter() - self.started
+
+    def set_ready(self, error: Optional[str] = None) -> None:
+        self.error = error
+        self.mark("ready")
+        self.ready = True
+
+    def snapshot(self) -> Dict:
+        return {
+            "ready": self.ready,
+            "uptime_seconds": round(time.perf_counter() - self.started, 3),
+            "startup_seconds": {phase: round(seconds, 4) for phase, seconds in self.phases.items()},
+            "warm_up_error": self.error
+        }
+
+    def _collect_phases(self) -> List[Tuple[LabelValues, float]]:
+        return [((phase,), seconds) for phase, seconds in self.phases.items()]
+
+
+readiness = Readiness()
+
+metrics_registry.register(CallbackMetric(
+    "cv_analyzer_startup_seconds",
+    "Segundos desde el import de la aplicación hasta el final de cada fase del arranque",
+    "gauge",
+    ["phase"],
+    readiness._collect_phases
+))
+metrics_registry.register(CallbackMetric(
+    "cv_analyzer_ready",
+    "1 cuando el warm-up ha terminado y el servidor está listo",
+    "gauge",
+    [],
+    lambda: [((), 1 if readiness.ready else 0)]
+))
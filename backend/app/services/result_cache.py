@@ -0,0 +1,106 @@
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app import config
+
+
+class ResultCache:
+    """
+    Caché de análisis completos de /api/analyze por PDF, oferta normalizada
+    y versión de la taxonomía: reenviar el mismo CV con la misma oferta
+    (recargar la página, reintentos de un integrador) no vuelve a pasar por
+    el pipeline. LRU acotado por tamaño aproximado en bytes y con caducidad
+    (TTL); max_bytes = 0 la desactiva. Se guardan y devuelven copias.
+    """
+
+    def __init__(self, max_bytes: int = config.RESULT_CACHE_MAX_BYTES, ttl: float = config.RESULT_CACHE_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # clave -> (resultado, tamaño, instante de caducidad)
+        self._entries: "OrderedDict[str, Tuple[Dict, int, float]]" = OrderedDict()
+        self._current_bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @staticmethod
+    def key_for(pdf_sha256: str, normalized_offer: str, taxonomy_version: str) -> str:
+        offer_digest = hashlib.sha256(normalized_offer.encode('utf-8')).hexdigest()
+        return f"{taxonomy_version}:{pdf_sha256}:{offer_digest}"
+
+    def get(self, key: str) -> Optional[Dict]:
+        if self.max_bytes <= 0:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= time.monotonic():
+                self._remove(key)
+                self._expirations += 1
+                entry = None
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return copy.deepcopy(entry[0])
+
+    def put(self, key: str, result: Dict) -> None:
+        if self.max_bytes <= 0:
+            return
+
+        result = copy.deepcopy(result)
+        size = len(json.dumps(result, ensure_ascii=False)) + len(key) + 256
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (result, size, time.monotonic() + self.ttl)
+            self._current_bytes += size
+
+            while self._current_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._current_bytes -= evicted_size
+                self._evictions += 1
+
+    def clear(self) -> int:
+        """Vacía la caché y devuelve cuántas entradas había."""
+        with self._lock:
+            purged = len(self._entries)
+            self._entries.clear()
+            self._current_bytes = 0
+            return purged
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0
+            }
+
+    def _remove(self, key: str) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._current_bytes -= previous[1]
+
+
+result_cache = ResultCache()
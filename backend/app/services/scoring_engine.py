@@ -1,4 +1,6 @@
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
+from app.services.skill_matcher import SkillEncoder
+from app.services.taxonomy import Taxonomy, TaxonomyRegistry, taxonomy_registry
 
 class ScoringEngine:
     """
@@ -9,7 +11,8 @@ class ScoringEngine:
     - 10% Contexto profesional
     """
     
-    def __init__(self):
+    def __init__(self, registry: Optional[TaxonomyRegistry] = None):
+        self.registry = registry or taxonomy_registry
         self.weights = {
             "skills": 0.60,
             "experience": 0.30,
@@ -22,14 +25,23 @@ class ScoringEngine:
         job_analysis: Dict
     ) -> Dict:
 
+        # Una sola versión de la taxonomía por cálculo aunque se recargue a mitad
+        taxonomy = self.registry.get()
+
+        # Skills como IDs canónicos: variantes y alias ("Vue"/"Vue.js", "k8s") cuentan como la misma
+        encoder = SkillEncoder(taxonomy.skill_matcher)
+        cv_skill_ids = encoder.encode(cv_analysis.get("technical_skills", {}))
+
         skills_score = self._calculate_skills_match(
-            cv_analysis.get("technical_skills", {}),
-            job_analysis.get("required_skills", {})
+            cv_skill_ids,
+            job_analysis.get("required_skills", {}),
+            encoder
         )
         
         experience_score = self._calculate_experience_match(
             cv_analysis.get("experience", {}),
-            job_analysis.get("required_experience", {})
+            job_analysis.get("required_experience", {}),
+            taxonomy
         )
         
         context_score = self._calculate_context_match(
@@ -43,8 +55,9 @@ class ScoringEngine:
         )
         
         skills_comparison = self._compare_skills(
-            cv_analysis.get("technical_skills", {}),
-            job_analysis.get("required_skills", {})
+            cv_skill_ids,
+            job_analysis.get("required_skills", {}),
+            encoder
         )
         
         return {
@@ -77,8 +90,9 @@ class ScoringEngine:
     
     def _calculate_skills_match(
         self, 
-        cv_skills: Dict[str, List[str]], 
-        job_skills: Dict[str, List[str]]
+        cv_skill_ids: Set[int], 
+        job_skills: Dict[str, List[str]],
+        encoder: SkillEncoder
     ) -> Dict:
         if not job_skills:
             return {
@@ -86,45 +100,36 @@ class ScoringEngine:
                 "details": "No hay requisitos técnicos específicos en la oferta"
             }
         
-        cv_skills_flat = set()
-        for skills_list in cv_skills.values():
-            cv_skills_flat.update([s.lower() for s in skills_list])
+        job_skill_ids = encoder.encode(job_skills)
         
-        job_skills_flat = set()
-        for skills_list in job_skills.values():
-            job_skills_flat.update([s.lower() for s in skills_list])
+        matching_skills = cv_skill_ids & job_skill_ids
         
-        matching_skills = cv_skills_flat.intersection(job_skills_flat)
-        
-        if len(job_skills_flat) == 0:
+        if len(job_skill_ids) == 0:
             match_percentage = 100.0
         else:
-            match_percentage = (len(matching_skills) / len(job_skills_flat)) * 100
+            match_percentage = (len(matching_skills) / len(job_skill_ids)) * 100
         
         return {
             "score": match_percentage,
             "details": {
-                "required": len(job_skills_flat),
+                "required": len(job_skill_ids),
                 "found": len(matching_skills),
-                "missing": len(job_skills_flat) - len(matching_skills),
-                "match_rate": f"{len(matching_skills)}/{len(job_skills_flat)}"
+                "missing": len(job_skill_ids) - len(matching_skills),
+                "match_rate": f"{len(matching_skills)}/{len(job_skill_ids)}"
             }
         }
     
     def _calculate_experience_match(
         self, 
         cv_experience: Dict, 
-        job_experience: Dict
+        job_experience: Dict,
+        taxonomy: Optional[Taxonomy] = None
     ) -> Dict:
         score = 0
         details = {}
         
-        level_scores = {
-            "junior": 1,
-            "mid": 2,
-            "senior": 3,
-            "unknown": 0
-        }
+        # junior = 1, mid = 2, senior = 3 según el orden de la taxonomía
+        level_scores = (taxonomy or self.registry.get()).level_scores
         
         cv_level = cv_experience.get("level", "unknown")
         required_level = job_experience.get("level_required", "unknown")
@@ -192,23 +197,20 @@ class ScoringEngine:
     
     def _compare_skills(
         self, 
-        cv_skills: Dict[str, List[str]], 
-        job_skills: Dict[str, List[str]]
+        cv_skill_ids: Set[int], 
+        job_skills: Dict[str, List[str]],
+        encoder: SkillEncoder
     ) -> Dict:
         found = {}
         missing = {}
         
         for category, required_skills in job_skills.items():
-            cv_skills_in_category = cv_skills.get(category, [])
-            
-            cv_skills_lower = [s.lower() for s in cv_skills_in_category]
-            required_skills_lower = [s.lower() for s in required_skills]
-            
             found_in_category = []
             missing_in_category = []
             
+            # La skill cuenta como encontrada aunque el CV la tenga en otra categoría
             for skill in required_skills:
-                if skill.lower() in cv_skills_lower:
+                if encoder.skill_id(skill) in cv_skill_ids:
                     found_in_category.append(skill)
                 else:
                     missing_in_category.append(skill)
@@ -227,4 +229,4 @@ class ScoringEngine:
             "missing": missing,
             "total_required": total_required,
             "total_found": total_found
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,270 @@
+import re
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from app.services.document_index import fold_text
+
+_WORD_CHAR = re.compile(r'\w')
+
+
+class SkillHit(NamedTuple):
+    kind: str
+    category: Optional[str]
+    name: str
+    order: int
+    # ID canónico: variantes y alias de una misma skill comparten ID
+    skill_id: int
+
+
+class SkillMatcher:
+    """
+    Matcher multi-patrón compilado una sola vez a partir de la taxonomía.
+    Los términos se organizan en un trie que se traduce a una única regex,
+    de modo que el texto se recorre en una sola pasada sin importar
+    cuántas skills contenga la base de datos. Términos y texto se comparan
+    sin acentos (ver fold_text).
+
+    Cada skill tiene un nombre canónico y un ID entero. Los alias
+    ("postgres" -> PostgreSQL) y las variantes listadas como skills aparte
+    ("Vue" y "Vue.js") son términos más del trie que apuntan al mismo hit,
+    así que no añaden pasadas. Una skill canónica está en una sola
+    categoría: la primera en la que aparece.
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[Tuple[str, Optional[str], str]],
+        aliases: Optional[Dict[str, Iterable[str]]] = None
+    ):
+        # alias (en minúsculas y sin acentos) -> nombre canónico
+        canonical_names: Dict[str, str] = {}
+        for canonical, alias_list in (aliases or {}).items():
+            for alias in alias_list:
+                canonical_names[fold_text(alias).strip()] = canonical
+
+        # term (en minúsculas y sin acentos) -> lista de hits (una skill puede ser de varios tipos)
+        self._hits_by_term: Dict[str, List[SkillHit]] = {}
+        # nombre canónico sin acentos -> ID, y los nombres en orden de ID
+        self._ids_by_term: Dict[str, int] = {}
+        # Los mismos IDs por el nombre tal cual: los análisis traen los nombres de la taxonomía
+        # y así no hace falta normalizarlos en cada comparación
+        self._ids_by_name: Dict[str, int] = {}
+        self.skill_names: List[str] = []
+        hits_by_key: Dict[Tuple[str, int], SkillHit] = {}
+
+        for order, (kind, category, name) in enumerate(entries):
+            term = fold_text(name).strip()
+            if not term:
+                continue
+            canonical = canonical_names.get(term, name)
+            skill_id = self._register(canonical)
+
+            hit = hits_by_key.get((kind, skill_id))
+            if hit is None:
+                hit = SkillHit(kind, category, canonical, order, skill_id)
+                hits_by_key[(kind, skill_id)] = hit
+            self._add_term(term, hit)
+            self._ids_by_term[term] = skill_id
+            self._ids_by_name.setdefault(name, skill_id)
+
+        for skill_id, name in enumerate(self.skill_names):
+            self._ids_by_name.setdefault(name, skill_id)
+
+        for alias, canonical in canonical_names.items():
+            skill_id = self._ids_by_term.get(fold_text(canonical).strip())
+            if skill_id is None:
+                print(f"Alias '{alias}' de una skill que no está en la taxonomía: '{canonical}'")
+                continue
+            self._ids_by_term.setdefault(alias, skill_id)
+            for hit in hits_by_key.values():
+                if hit.skill_id == skill_id:
+                    self._add_term(alias, hit)
+
+        self._pattern = self._compile(self._hits_by_term.keys())
+
+        # Términos contenidos dentro de otros ("spring" en "spring boot"):
+        # la regex devuelve el más largo en cada posición y el resto se deriva
+        self._implied: Dict[str, List[str]] = {
+            term: self._prefix_terms(term) for term in self._hits_by_term
+        }
+
+    @classmethod
+    def from_skills_db(cls, skills_db: Dict) -> "SkillMatcher":
+        entries = []
+
+        for category, skills_list in skills_db.get('technical_skills', {}).items():
+            for skill in skills_list:
+                entries.append(("technical_skills", category, skill))
+
+        for role in skills_db.get('job_roles', []):
+            entries.append(("job_roles", None, role))
+
+        for method in skills_db.get('methodologies', []):
+            entries.append(("methodologies", None, method))
+
+        return cls(entries, skills_db.get('skill_aliases', {}))
+
+    @property
+    def size(self) -> int:
+        return len(self._hits_by_term)
+
+    def skill_id(self, name: str) -> Optional[int]:
+        """ID canónico de un nombre de skill, variante o alias; None si no está en la taxonomía."""
+        skill_id = self._ids_by_name.get(name)
+        if skill_id is None:
+            skill_id = self._ids_by_term.get(fold_text(name).strip())
+        return skill_id
+
+    def canonical_name(self, name: str) -> str:
+        skill_id = self.skill_id(name)
+        return name if skill_id is None else self.skill_names[skill_id]
+
+    def find(self, text: str, kinds: Optional[Iterable[str]] = None) -> List[SkillHit]:
+        """Devuelve los hits encontrados en `text` (ya pasado por fold_text), en orden de taxonomía."""
+        if self._pattern is None or not text:
+            return []
+
+        terms = set()
+        for term in self._scan_terms(text):
+            if term not in terms:
+                terms.add(term)
+                terms.update(self._implied.get(term, []))
+
+        wanted = set(kinds) if kinds is not None else None
+        # Variantes y alias de una misma skill devuelven el mismo hit una sola vez
+        hits = list({
+            hit
+            for term in terms
+            for hit in self._hits_by_term[term]
+            if wanted is None or hit.kind in wanted
+        })
+        hits.sort(key=lambda hit: hit.order)
+        return hits
+
+    def find_technical_skills(self, text: str) -> Dict[str, List[str]]:
+        found_skills: Dict[str, List[str]] = {}
+        for hit in self.find(text, kinds=("technical_skills",)):
+            found_skills.setdefault(hit.category, []).append(hit.name)
+        return found_skills
+
+    def find_names(self, text: str, kind: str) -> List[str]:
+        return [hit.name for hit in self.find(text, kinds=(kind,))]
+
+    def _register(self, canonical: str) -> int:
+        key = fold_text(canonical).strip()
+        skill_id = self._ids_by_term.get(key)
+        if skill_id is None:
+            skill_id = len(self.skill_names)
+            self.skill_names.append(canonical)
+            self._ids_by_term[key] = skill_id
+        return skill_id
+
+    def _add_term(self, term: str, hit: SkillHit) -> None:
+        hits = self._hits_by_term.setdefault(term, [])
+        if hit not in hits:
+            hits.append(hit)
+
+    def _scan_terms(self, text: str) -> List[str]:
+        if self._pattern is None:
+            return []
+        return [match.group(1) for match in self._pattern.finditer(text)]
+
+    def _prefix_terms(self, term: str) -> List[str]:
+        return [
+            term[:end]
+            for end in range(1, len(term))
+            if term[:end] in self._hits_by_term and not _WORD_CHAR.match(term, end)
+        ]
+
+    @staticmethod
+    def _compile(terms: Iterable[str]) -> Optional["re.Pattern"]:
+        trie: Dict = {}
+        for term in terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[""] = True
+
+        if not trie:
+            return None
+
+        # Límites de palabra con lookarounds: a diferencia de \b funcionan
+        # también con términos que empiezan o acaban en símbolos (C#, C++, .NET)
+        body = SkillMatcher._trie_to_regex(trie)
+        return re.compile(r'(?<!\w)(?=(' + body + r')(?!\w))')
+
+    @staticmethod
+    def _trie_to_regex(node: Dict) -> str:
+        terminal = "" in node
+        branches = [
+            re.escape(char) + SkillMatcher._trie_to_regex(child)
+            for char, child in sorted(node.items())
+            if char != ""
+        ]
+
+        if not branches:
+            return ""
+
+        if len(branches) == 1:
+            body = branches[0]
+        else:
+            body = "(?:" + "|".join(branches) + ")"
+
+        # Cuantificador voraz: intenta primero el término más largo
+        if terminal:
+            return "(?:" + body + ")?" if len(branches) == 1 else body + "?"
+        return body
+
+
+class SkillEncoder:
+    """
+    Traduce los nombres de skills de un análisis (variantes y alias
+    incluidos) a IDs canónicos enteros. Empieza con los IDs del matcher y
+    nunca reasigna uno: los nombres fuera de la taxonomía (análisis antiguos,
+    skills enviadas por el cliente) y las skills de una taxonomía recargada
+    (ver refresh) reciben IDs nuevos a continuación, así que los bitsets ya
+    construidos siguen siendo válidos.
+
+    Se comparte entre hilos (BulkScorer en modo "thread"): la asignación de
+    IDs nuevos va bajo un lock; lo que resuelve el matcher inicial no lo toca.
+    """
+
+    def __init__(self, matcher: SkillMatcher):
+        self.matcher = matcher
+        self._seed = matcher
+        self._lock = threading.Lock()
+        # nombre canónico sin acentos -> ID; solo se construye si aparece algo que no
+        # resuelve directamente el matcher inicial
+        self._ids: Optional[Dict[str, int]] = None
+
+    def refresh(self, matcher: SkillMatcher) -> None:
+        # Tras una recarga de la taxonomía: alias nuevos, mismos IDs para lo ya visto
+        self.matcher = matcher
+
+    def skill_id(self, name: str) -> int:
+        matcher = self.matcher
+        skill_id = matcher.skill_id(name)
+        if skill_id is not None:
+            if matcher is self._seed:
+                return skill_id
+            name = matcher.skill_names[skill_id]
+        key = fold_text(name).strip()
+        with self._lock:
+            if self._ids is None:
+                self._ids = {
+                    fold_text(seed_name).strip(): seed_id for seed_id, seed_name in enumerate(self._seed.skill_names)
+                }
+            skill_id = self._ids.get(key)
+            if skill_id is None:
+                skill_id = len(self._ids)
+                self._ids[key] = skill_id
+            return skill_id
+
+    def encode(self, skills: Dict[str, List[str]]) -> Set[int]:
+        return {self.skill_id(skill) for skills_list in skills.values() for skill in skills_list}
+
+    def encode_bits(self, skills: Dict[str, List[str]]) -> int:
+        bits = 0
+        for skill_id in self.encode(skills):
+            bits |= 1 << skill_id
+        return bits
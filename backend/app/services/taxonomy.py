@@ -0,0 +1,229 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app import config
+from app.services.document_index import DocumentIndex, phrase_key
+from app.services.skill_matcher import SkillMatcher
+from app.services.taxonomy_artifact import load_artifact
+
+DATA_DIR = Path(__file__).parent.parent.parent / 'data'
+SKILLS_FILE = 'skills_database.json'
+KEYWORDS_FILE = 'keywords.json'
+
+
+class Taxonomy:
+    """
+    Snapshot inmutable de la taxonomía con todo lo que se puede precompilar:
+    matcher de skills, regex de experiencia y periodos, keywords de nivel
+    y de contexto. `version` es un hash del contenido de los ficheros.
+    """
+
+    def __init__(self, skills_db: Dict, keywords_db: Dict, version: str):
+        self.skills_db = skills_db
+        self.keywords_db = keywords_db
+        self.version = version
+
+        self.skill_matcher = SkillMatcher.from_skills_db(skills_db)
+
+        experience_patterns = keywords_db.get('experience_patterns', {})
+        self.years_patterns = self._compile_all(experience_patterns.get('years_experience', []))
+        self.time_period_patterns = self._compile_all(experience_patterns.get('time_periods', []))
+
+        # Niveles en orden de la taxonomía (junior < mid < senior), con las
+        # keywords ya como claves de n-grama de DocumentIndex
+        levels = skills_db.get('experience_keywords', {}).get('experience_levels', {})
+        self.experience_levels: List[Tuple[str, List[str]]] = [
+            (level, self._phrase_keys(keywords))
+            for level, keywords in levels.items()
+        ]
+        self.level_scores: Dict[str, int] = {"unknown": 0}
+        for rank, (level, _) in enumerate(self.experience_levels, start=1):
+            self.level_scores[level] = rank
+
+        self.soft_skills: List[str] = skills_db.get('soft_skills', [])
+        self.certifications: List[str] = skills_db.get('certifications', [])
+        # (nombre original, clave de n-grama)
+        self.soft_skill_keys = [(skill, phrase_key(skill)) for skill in self.soft_skills]
+        self.certification_keys = [(cert, phrase_key(cert)) for cert in self.certifications]
+
+        self.context_keys: List[Tuple[str, str]] = [
+            (context_type, key)
+            for context_type, keywords in skills_db.get('context_keywords', {}).items()
+            for key in self._phrase_keys(keywords)
+        ]
+
+        # N-gramas que necesita el índice para resolver cualquier keyword con un lookup
+        all_keys = (
+            [key for _, keys in self.experience_levels for key in keys] +
+            [key for _, key in self.soft_skill_keys] +
+            [key for _, key in self.certification_keys] +
+            [key for _, key in self.context_keys]
+        )
+        self.max_ngram = max((key.count(' ') + 1 for key in all_keys if key), default=1)
+
+    def index(self, text: str) -> DocumentIndex:
+        return DocumentIndex(text, self.max_ngram)
+
+    @staticmethod
+    def _phrase_keys(keywords: List[str]) -> List[str]:
+        # Sin duplicados: "master" y "máster" comparten clave y no deben contar doble
+        keys = (phrase_key(keyword) for keyword in keywords)
+        return list(dict.fromkeys(key for key in keys if key))
+
+    @staticmethod
+    def _compile_all(patterns: List[str]) -> List[re.Pattern]:
+        compiled = []
+        for pattern in patterns:
+            try:
+                compiled.append(re.compile(pattern))
+            except re.error as e:
+                print(f"Patrón inválido en la taxonomía '{pattern}': {e}")
+        return compiled
+
+
+class TaxonomyRegistry:
+    """
+    Registro compartido por todo el proceso. Comprueba periódicamente si los
+    ficheros de datos han cambiado y, si es así, compila un nuevo snapshot y lo
+    sustituye de forma atómica. Las peticiones en curso conservan el snapshot
+    que obtuvieron al empezar.
+
+    Con `artifact_path`, el snapshot se carga del artefacto precompilado
+    (ver taxonomy_artifact) si coincide con el hash de los JSON actuales.
+    """
+
+    def __init__(
+        self,
+        data_dir: Path = DATA_DIR,
+        check_interval: float = 2.0,
+        artifact_path: Optional[Path] = None
+    ):
+        self.data_dir = Path(data_dir)
+        self.check_interval = check_interval
+        self.artifact_path = Path(artifact_path) if artifact_path else None
+        self._lock = threading.Lock()
+        self._taxonomy: Optional[Taxonomy] = None
+        self._signature: Optional[Tuple] = None
+        self._last_check = 0.0
+        # Origen ("artifact" o "json") y duración de la última carga
+        self.source: Optional[str] = None
+        self.load_seconds = 0.0
+
+    def get(self) -> Taxonomy:
+        taxonomy = self._taxonomy
+        if taxonomy is None or time.monotonic() - self._last_check >= self.check_interval:
+            self.reload()
+            taxonomy = self._taxonomy
+        return taxonomy
+
+    @property
+    def version(self) -> str:
+        return self.get().version
+
+    def status(self) -> Dict:
+        # Sin forzar la carga: para /ready
+        taxonomy = self._taxonomy
+        return {
+            "version": taxonomy.version if taxonomy is not None else None,
+            "source": self.source,
+            "load_seconds": round(self.load_seconds, 4)
+        }
+
+    def reload(self, force: bool = False) -> bool:
+        """Recarga la taxonomía si los ficheros han cambiado. Devuelve True si hubo cambio."""
+        with self._lock:
+            self._last_check = time.monotonic()
+            signature = self._file_signature()
+            if not force and self._taxonomy is not None and signature == self._signature:
+                return False
+
+            raw = {name: self._read_bytes(name) for name in (SKILLS_FILE, KEYWORDS_FILE)}
+            if self._taxonomy is not None and not all(raw.values()):
+                # Fichero vacío, truncado a cero o ilegible: es un error de carga, no una
+                # taxonomía vacía; se mantiene el snapshot actual hasta que vuelva a cambiar
+                print("Error recargando la taxonomía: fichero vacío o ilegible")
+                self._signature = signature
+                return False
+
+            version = self._content_hash(raw)
+            if not force and self._taxonomy is not None and version == self._taxonomy.version:
+                self._signature = signature
+                return False
+
+            start = time.perf_counter()
+            taxonomy = load_artifact(self.artifact_path, version) if self.artifact_path else None
+            if taxonomy is not None:
+                self._install(taxonomy, signature, "artifact", start)
+                return True
+
+            try:
+                taxonomy = Taxonomy(
+                    self._decode(SKILLS_FILE, raw[SKILLS_FILE]),
+                    self._decode(KEYWORDS_FILE, raw[KEYWORDS_FILE]),
+                    version
+                )
+            except Exception as e:
+                # Un fichero a medio escribir no debe tumbar el snapshot actual
+                print(f"Error recargando la taxonomía: {e}")
+                if self._taxonomy is not None:
+                    # No reintentar hasta que el fichero vuelva a cambiar
+                    self._signature = signature
+                    return False
+                taxonomy = Taxonomy({}, {}, version)
+
+            self._install(taxonomy, signature, "json", start)
+            return True
+
+    def _install(self, taxonomy: Taxonomy, signature: Tuple, source: str, start: float) -> None:
+        self._taxonomy = taxonomy
+        self._signature = signature
+        self.source = source
+        self.load_seconds = time.perf_counter() - start
+
+    def _file_signature(self) -> Tuple:
+        signature = []
+        for name in (SKILLS_FILE, KEYWORDS_FILE):
+            try:
+                stat = (self.data_dir / name).stat()
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _read_bytes(self, filename: str) -> bytes:
+        try:
+            return (self.data_dir / filename).read_bytes()
+        except Exception as e:
+            print(f"Error cargando {filename}: {e}")
+            return b""
+
+    def _decode(self, filename: str, raw: bytes) -> Dict:
+        if not raw:
+            return {}
+        try:
+            return json.loads(raw.decode('utf-8'))
+        except ValueError as e:
+            if self._taxonomy is not None:
+                raise
+            print(f"Error cargando {filename}: {e}")
+            return {}
+
+    @staticmethod
+    def _content_hash(raw: Dict[str, bytes]) -> str:
+        digest = hashlib.sha256()
+        for name in sorted(raw):
+            digest.update(name.encode('utf-8'))
+            digest.update(raw[name])
+        return digest.hexdigest()[:16]
+
+
+taxonomy_registry = TaxonomyRegistry(artifact_path=config.TAXONOMY_ARTIFACT)
+
+
+def get_taxonomy() -> Taxonomy:
+    return taxonomy_registry.get()
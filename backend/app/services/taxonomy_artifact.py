@@ -0,0 +1,138 @@
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sys
+import time
+from pathlib import Path
+
+# Cabecera: magic + una línea JSON con formato, versión de la taxonomía y hash del contenido
+MAGIC = b"CVTAX\n"
+ARTIFACT_FORMAT = 1
+# Módulos que definen lo que se serializa: si cambian, el artefacto no vale aunque los JSON sean los mismos
+_COMPILER_MODULES = ("taxonomy.py", "skill_matcher.py", "document_index.py")
+
+
+def _python_tag() -> str:
+    # pickle de objetos internos (SkillHit, re.Pattern): solo se reutiliza con la misma versión
+    return f"{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def _code_fingerprint() -> str:
+    digest = hashlib.sha256()
+    services_dir = Path(__file__).parent
+    for name in _COMPILER_MODULES:
+        digest.update((services_dir / name).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def write_artifact(path: Path, taxonomy) -> int:
+    """
+    Serializa una Taxonomy ya compilada (trie del matcher, claves de n-grama,
+    niveles...). Escritura atómica. Devuelve el tamaño en bytes.
+    """
+    payload = pickle.dumps(taxonomy, protocol=pickle.HIGHEST_PROTOCOL)
+    header = json.dumps({
+        "format": ARTIFACT_FORMAT,
+        "python": _python_tag(),
+        "code": _code_fingerprint(),
+        "version": taxonomy.version,
+        "sha256": hashlib.sha256(payload).hexdigest()
+    }).encode("utf-8")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + ".tmp")
+    with open(temporary, "wb") as artifact_file:
+        artifact_file.write(MAGIC + header + b"\n" + payload)
+    os.replace(temporary, path)
+    return len(MAGIC) + len(header) + 1 + len(payload)
+
+
+def load_artifact(path: Path, version: str):
+    """
+    Devuelve la Taxonomy del artefacto si corresponde exactamente a `version`
+    (hash del contenido de los JSON actuales) y el payload no está dañado.
+    En cualquier otro caso None: quien llama compila desde los JSON.
+    El artefacto es un pickle generado localmente; no cargar ficheros de terceros.
+    """
+    try:
+        with open(path, "rb") as artifact_file:
+            data = artifact_file.read()
+    except OSError:
+        return None
+
+    if not data.startswith(MAGIC):
+        print(f"Artefacto de taxonomía no reconocido: {path}")
+        return None
+
+    header_end = data.find(b"\n", len(MAGIC))
+    try:
+        header = json.loads(data[len(MAGIC):header_end])
+    except ValueError:
+        print(f"Cabecera del artefacto de taxonomía ilegible: {path}")
+        return None
+
+    if header.get("format") != ARTIFACT_FORMAT or header.get("python") != _python_tag():
+        print(f"Artefacto de taxonomía de otro formato o versión de Python, se ignora: {path}")
+        return None
+    if header.get("code") != _code_fingerprint():
+        print(f"Artefacto de taxonomía generado con otra versión del código, se compila desde JSON: {path}")
+        return None
+    if header.get("version") != version:
+        # Los JSON han cambiado desde el build: el artefacto está obsoleto
+        print(f"Artefacto de taxonomía obsoleto ({header.get('version')} != {version}), se compila desde JSON")
+        return None
+
+    payload = data[header_end + 1:]
+    if hashlib.sha256(payload).hexdigest() != header.get("sha256"):
+        print(f"Artefacto de taxonomía dañado, se compila desde JSON: {path}")
+        return None
+
+    try:
+        taxonomy = pickle.loads(payload)
+    except Exception as e:
+        print(f"Error cargando el artefacto de taxonomía: {e}")
+        return None
+    return taxonomy if getattr(taxonomy, "version", None) == version else None
+
+
+def main(argv=None) -> int:
+    from app import config
+    from app.services.taxonomy import DATA_DIR, TaxonomyRegistry
+
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.taxonomy_artifact",
+        description="Compila skills_database.json y keywords.json en un artefacto binario listo para cargar"
+    )
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR, help="Directorio de los JSON de la taxonomía")
+    parser.add_argument("--output", "-o", type=Path, default=Path(config.TAXONOMY_ARTIFACT), help="Fichero de salida")
+    args = parser.parse_args(argv)
+
+    # Sin artefacto: siempre se compila desde los JSON
+    registry = TaxonomyRegistry(args.data_dir)
+    start = time.perf_counter()
+    taxonomy = registry.get()
+    compile_seconds = time.perf_counter() - start
+
+    if not taxonomy.skills_db or not taxonomy.keywords_db:
+        print(f"No se han podido leer los JSON de {args.data_dir}", file=sys.stderr)
+        return 1
+
+    size = write_artifact(args.output, taxonomy)
+
+    start = time.perf_counter()
+    loaded = load_artifact(args.output, taxonomy.version)
+    load_seconds = time.perf_counter() - start
+    if loaded is None:
+        print("El artefacto generado no se puede cargar", file=sys.stderr)
+        return 1
+
+    print(f"Taxonomía {taxonomy.version}: {taxonomy.skill_matcher.size} términos -> {args.output} ({size} bytes)")
+    print(f"Compilar desde JSON: {compile_seconds * 1000:.2f} ms; cargar el artefacto: {load_seconds * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
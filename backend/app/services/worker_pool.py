@@ -0,0 +1,151 @@
+import queue
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.context import BaseContext
+from typing import Any, Callable, Optional, Sequence, Set, Tuple
+
+
+class WorkerTimeoutError(Exception):
+    pass
+
+
+def _serve(conn, initializer: Optional[Callable], initargs: Tuple) -> None:
+    # Bucle de cada worker: avisa cuando está listo y responde (ok, resultado o excepción) por tarea
+    if initializer is not None:
+        initializer(*initargs)
+    conn.send(True)
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+
+        func, args = task
+        try:
+            reply = (True, func(*args))
+        except BaseException as e:
+            reply = (False, e)
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # Resultado o excepción que no se puede serializar
+            conn.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class _Worker:
+    def __init__(self, context: BaseContext, initializer: Optional[Callable], initargs: Tuple):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_serve,
+            args=(child_conn, initializer, initargs),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join(timeout=1.0)
+        self.conn.close()
+
+
+class WorkerPool:
+    """
+    Pool de procesos en el que cada tarea ocupa un worker concreto. A
+    diferencia de ProcessPoolExecutor, que da el pool entero por roto en
+    cuanto muere uno de sus procesos, aquí una tarea que supera su timeout
+    solo termina el worker que la ejecuta; el resto sigue con sus tareas y
+    el hueco se rellena con un worker nuevo en la siguiente.
+
+    call() es bloqueante y está pensado para llamarse desde un hilo por
+    tarea: espera un worker libre sin contar para el timeout, que empieza
+    cuando la tarea llega a un worker ya arrancado.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        mp_context: BaseContext,
+        initializer: Optional[Callable] = None,
+        initargs: Tuple = ()
+    ):
+        self.max_workers = max(1, max_workers)
+        self._context = mp_context
+        self._initializer = initializer
+        self._initargs = initargs
+        self._lock = threading.Lock()
+        self._workers: Set[_Worker] = set()
+        self._closed = False
+
+        # Huecos libres; None es un hueco sin proceso (se arranca al recibir trabajo)
+        self._idle: "queue.Queue[Optional[_Worker]]" = queue.Queue()
+        for _ in range(self.max_workers):
+            self._idle.put(None)
+
+    def call(self, func: Callable, args: Sequence = (), timeout: Optional[float] = None) -> Any:
+        worker = self._idle.get()
+        try:
+            if self._closed:
+                raise BrokenProcessPool("El pool de workers está cerrado")
+            if worker is not None and not worker.process.is_alive():
+                self._discard(worker)
+                worker = None
+            if worker is None:
+                worker = self._start_worker()
+
+            try:
+                worker.conn.send((func, tuple(args)))
+            except OSError:
+                self._discard(worker)
+                worker = None
+                raise BrokenProcessPool("El worker terminó de forma abrupta")
+
+            if not worker.conn.poll(timeout):
+                # Una tarea en curso no se puede cancelar: se termina solo su worker
+                self._discard(worker)
+                worker = None
+                raise WorkerTimeoutError(f"La tarea superó el límite de {timeout}s")
+
+            try:
+                ok, value = worker.conn.recv()
+            except (EOFError, OSError):
+                self._discard(worker)
+                worker = None
+                raise BrokenProcessPool("El worker terminó de forma abrupta durante la tarea")
+        finally:
+            self._idle.put(worker)
+
+        if ok:
+            return value
+        raise value
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.kill()
+
+    def _start_worker(self) -> _Worker:
+        worker = _Worker(self._context, self._initializer, self._initargs)
+        with self._lock:
+            self._workers.add(worker)
+        # El arranque (imports, taxonomía) no cuenta para el timeout de la tarea
+        try:
+            worker.conn.recv()
+        except (EOFError, OSError):
+            self._discard(worker)
+            raise BrokenProcessPool("El worker terminó de forma abrupta al arrancar")
+        return worker
+
+    def _discard(self, worker: Optional[_Worker]) -> None:
+        if worker is None:
+            return
+        with self._lock:
+            self._workers.discard(worker)
+        worker.kill()
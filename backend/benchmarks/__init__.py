@@ -0,0 +1,10 @@
+"""
+Benchmarks del pipeline de análisis.
+
+- corpus: generador determinista de CVs en PDF, ofertas y taxonomías
+  sintéticas de distintos tamaños
+- stages: microbenchmarks por etapa (p50/p95/p99 y throughput)
+- baseline: referencia guardada y comprobación de regresiones
+
+Uso (desde backend/): python -m benchmarks --check
+"""
@@ -0,0 +1,100 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from benchmarks.baseline import BASELINE_FILE, compare, load_baseline, save_baseline
+from benchmarks.corpus import DEFAULT_SCENARIOS, Scenario
+from benchmarks.stages import STAGES, run_scenario
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Microbenchmarks por etapa del pipeline sobre un corpus sintético"
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Ejecuciones medidas por etapa")
+    parser.add_argument("--quick", action="store_true", help="Pocas repeticiones (comprobación rápida)")
+    parser.add_argument("--scenario", action="append", choices=[s.name for s in DEFAULT_SCENARIOS],
+                        help="Escenarios a ejecutar (por defecto todos)")
+    parser.add_argument("--pages", type=int, help="Escenario a medida: nº de páginas del CV")
+    parser.add_argument("--skills", type=int, help="Escenario a medida: nº de skills de la taxonomía")
+    parser.add_argument("--stage", action="append", choices=STAGES, help="Etapas a medir (por defecto todas)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="Fichero de referencia")
+    parser.add_argument("--check", action="store_true", help="Falla si alguna etapa es más lenta que la referencia")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Margen permitido (0.25 = +25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05,
+                        help="Diferencia absoluta mínima para considerar una regresión")
+    parser.add_argument("--metric", default="p50_ms", choices=["p50_ms", "p95_ms", "p99_ms", "mean_ms"])
+    parser.add_argument("--update-baseline", action="store_true", help="Guarda los resultados como referencia")
+    parser.add_argument("--json", action="store_true", help="Imprime los resultados en JSON")
+    return parser.parse_args(argv)
+
+
+def select_scenarios(args: argparse.Namespace):
+    if args.pages or args.skills:
+        return [Scenario(f"custom-{args.pages or 1}p-{args.skills or 200}s", args.pages or 1, args.skills or 200)]
+    if args.scenario:
+        return [s for s in DEFAULT_SCENARIOS if s.name in args.scenario]
+    return DEFAULT_SCENARIOS
+
+
+def print_table(results) -> None:
+    header = f"{'escenario':<22} {'etapa':<16} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'ops/s':>10} {'unid/s':>10}"
+    print(header)
+    print("-" * len(header))
+    for scenario, stages in results.items():
+        for stage, stats in stages.items():
+            print(
+                f"{scenario:<22} {stage:<16} {stats['p50_ms']:>10.3f} {stats['p95_ms']:>10.3f} "
+                f"{stats['p99_ms']:>10.3f} {stats['ops_per_s']:>10.1f} {stats['units_per_s']:>10.1f}"
+            )
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    repeat = 5 if args.quick else args.repeat
+    stages = args.stage or STAGES
+
+    results = {}
+    for scenario in select_scenarios(args):
+        print(f"Midiendo {scenario.name} ({scenario.pages} páginas, {scenario.num_skills} skills)...", file=sys.stderr)
+        results[scenario.name] = run_scenario(scenario, repeat, stages)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+    if args.update_baseline:
+        save_baseline(results, args.baseline)
+        print(f"\nReferencia guardada en {args.baseline}")
+        return 0
+
+    if args.check:
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            print(f"\nNo existe la referencia {args.baseline}; usa --update-baseline", file=sys.stderr)
+            return 2
+
+        rows = compare(results, baseline, args.tolerance, args.metric, args.min_delta_ms)
+        regressions = [row for row in rows if row["regression"]]
+
+        print(f"\nComparación con la referencia ({args.metric}, tolerancia +{args.tolerance:.0%}):")
+        for row in rows:
+            if row["baseline"] is None:
+                status = "sin referencia"
+            else:
+                status = "REGRESIÓN" if row["regression"] else "ok"
+                status = f"{status} (x{row['ratio']:.2f})"
+            print(f"  {row['scenario']:<22} {row['stage']:<16} {status}")
+
+        if regressions:
+            print(f"\n{len(regressions)} etapa(s) más lentas que la referencia", file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import json
+import platform
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BASELINE_FILE = Path(__file__).parent / 'baseline.json'
+
+
+def load_baseline(path: Path = BASELINE_FILE) -> Optional[Dict]:
+    path = Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def save_baseline(results: Dict[str, Dict[str, Dict]], path: Path = BASELINE_FILE) -> None:
+    baseline = {
+        "environment": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine()
+        },
+        "results": results
+    }
+    Path(path).write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding='utf-8')
+
+
+def compare(
+    results: Dict[str, Dict[str, Dict]],
+    baseline: Dict,
+    tolerance: float,
+    metric: str = "p50_ms",
+    min_delta_ms: float = 0.05
+) -> List[Dict]:
+    """
+    Compara cada escenario/etapa con la referencia. Una etapa es regresión
+    si `metric` supera el valor de referencia en más de `tolerance`
+    (0.25 = un 25 % más lenta) y en más de `min_delta_ms`, para que el ruido
+    de las etapas de microsegundos no dé falsos positivos. Las etapas sin
+    referencia no se evalúan.
+    """
+    reference = baseline.get("results", {})
+    rows = []
+
+    for scenario, stages in results.items():
+        for stage, stats in stages.items():
+            expected = reference.get(scenario, {}).get(stage, {}).get(metric)
+            current = stats[metric]
+
+            if not expected:
+                rows.append({
+                    "scenario": scenario, "stage": stage, "current": current,
+                    "baseline": None, "ratio": None, "regression": False
+                })
+                continue
+
+            ratio = current / expected
+            rows.append({
+                "scenario": scenario,
+                "stage": stage,
+                "current": current,
+                "baseline": expected,
+                "ratio": round(ratio, 3),
+                "regression": ratio > 1 + tolerance and current - expected > min_delta_ms
+            })
+
+    return rows
@@ -0,0 +1,110 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+from app.services.taxonomy import TaxonomyRegistry
+from app.services.taxonomy_artifact import write_artifact
+
+from benchmarks.corpus import make_cv_pdf, make_offer, make_taxonomy, write_taxonomy
+from benchmarks.stages import summarize
+
+PHASES = ["import", "warm_up", "first_request"]
+
+# Se ejecuta en un intérprete nuevo en cada muestra: import, warm-up y primera petición
+_CHILD = """
+import json, sys, time
+from pathlib import Path
+start = time.perf_counter()
+import app.main
+from app.services import pipeline
+from app.services.taxonomy import taxonomy_registry
+imported = time.perf_counter()
+data_dir, artifact, pdf_path, offer_path = sys.argv[1:5]
+taxonomy_registry.data_dir = Path(data_dir)
+taxonomy_registry.artifact_path = Path(artifact) if artifact else None
+pipeline.warm_up()
+warm = time.perf_counter()
+extraction = pipeline.extract_pdf(Path(pdf_path).read_bytes())
+pipeline.analyze_texts(extraction["text"], Path(offer_path).read_text(encoding="utf-8"))
+done = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "warm_up": warm - imported,
+    "first_request": done - warm,
+    "source": taxonomy_registry.source
+}))
+"""
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.cold_start",
+        description="Cold start en procesos nuevos: import de la app, warm-up y primera petición, "
+                    "compilando la taxonomía desde JSON o cargando el artefacto precompilado"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Procesos lanzados por modo")
+    parser.add_argument("--skills", type=int, default=2000, help="Skills de la taxonomía sintética")
+    parser.add_argument("--pages", type=int, default=1, help="Páginas del CV de la primera petición")
+    parser.add_argument("--json", action="store_true", help="Imprime los resultados en JSON")
+    return parser.parse_args(argv)
+
+
+def run_child(data_dir: Path, artifact: str, pdf_path: Path, offer_path: Path) -> Dict:
+    env = dict(os.environ, CV_ANALYZER_WARM_UP_ON_STARTUP="false")
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD, str(data_dir), artifact, str(pdf_path), str(offer_path)],
+        capture_output=True, text=True, check=True, env=env,
+        cwd=Path(__file__).resolve().parent.parent
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    skills_db, keywords_db = make_taxonomy(args.skills)
+
+    results: Dict[str, Dict[str, Dict]] = {}
+    with tempfile.TemporaryDirectory(prefix="cv-cold-") as tmp:
+        data_dir = Path(tmp)
+        write_taxonomy(data_dir, skills_db, keywords_db)
+        artifact = data_dir / "taxonomy.bin"
+        write_artifact(artifact, TaxonomyRegistry(data_dir).get())
+
+        pdf_path = data_dir / "cv.pdf"
+        pdf_path.write_bytes(make_cv_pdf(skills_db, args.pages))
+        offer_path = data_dir / "offer.txt"
+        offer_path.write_text(make_offer(skills_db), encoding="utf-8")
+
+        for mode, artifact_arg in (("json", ""), ("artifact", str(artifact))):
+            print(f"Midiendo el arranque con la taxonomía desde {mode} ({args.repeat} procesos)...", file=sys.stderr)
+            samples: Dict[str, List[float]] = {phase: [] for phase in PHASES + ["total"]}
+            for _ in range(args.repeat):
+                timings = run_child(data_dir, artifact_arg, pdf_path, offer_path)
+                if timings["source"] != mode:
+                    print(f"La taxonomía se cargó desde {timings['source']}, no desde {mode}", file=sys.stderr)
+                    return 1
+                for phase in PHASES:
+                    samples[phase].append(timings[phase])
+                samples["total"].append(sum(timings[phase] for phase in PHASES))
+            results[mode] = {phase: summarize(values) for phase, values in samples.items()}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    header = f"{'taxonomía':<10} {'fase':<14} {'p50 ms':>10} {'p95 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for mode, phases in results.items():
+        for phase, stats in phases.items():
+            print(f"{mode:<10} {phase:<14} {stats['p50_ms']:>10.2f} {stats['p95_ms']:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
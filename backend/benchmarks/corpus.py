@@ -0,0 +1,222 @@
+import copy
+import json
+import random
+import zlib
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+from app.services.taxonomy import DATA_DIR, KEYWORDS_FILE, SKILLS_FILE
+
+LINES_PER_PAGE = 45
+
+_SYLLABLES = [
+    "ka", "zo", "ri", "mu", "tel", "vor", "xa", "ne", "dra", "quil",
+    "pe", "lon", "si", "bra", "tux", "fen", "go", "ly", "mar", "cto"
+]
+_SUFFIXES = ["", "DB", "JS", "ML", "Ops", "Kit", "Flow", "Hub", "Lang", "Stack"]
+
+_FILLER = [
+    "Participación en reuniones de planificación con el equipo de producto.",
+    "Responsable de la revisión de código y de la documentación técnica.",
+    "Colaboración con clientes para definir requisitos y prioridades.",
+    "Mantenimiento de servicios en producción y resolución de incidencias.",
+    "Mentoring de perfiles junior y entrevistas técnicas.",
+    "Worked closely with stakeholders to deliver features on time.",
+    "Improved monitoring and alerting for critical services.",
+    "Optimicé consultas y reduje el tiempo de respuesta de la API.",
+]
+_COMPANIES = ["Acme Software", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Digital"]
+
+
+class Scenario(NamedTuple):
+    name: str
+    pages: int
+    num_skills: int
+    seed: int = 42
+
+
+# De 1 a 50 páginas y de 10 a 2.000 skills en la taxonomía
+DEFAULT_SCENARIOS = [
+    Scenario("small", 1, 10),
+    Scenario("medium", 10, 200),
+    Scenario("large", 50, 2000),
+]
+
+
+def load_base_taxonomy() -> Tuple[Dict, Dict]:
+    skills_db = json.loads((DATA_DIR / SKILLS_FILE).read_text(encoding='utf-8'))
+    keywords_db = json.loads((DATA_DIR / KEYWORDS_FILE).read_text(encoding='utf-8'))
+    return skills_db, keywords_db
+
+
+def make_taxonomy(num_skills: int, seed: int = 42) -> Tuple[Dict, Dict]:
+    """
+    Taxonomía con exactamente num_skills skills técnicas: primero las reales,
+    repartidas por categoría, y si no llegan se completan con nombres
+    sintéticos deterministas. El resto de secciones se conserva.
+    """
+    skills_db, keywords_db = load_base_taxonomy()
+    skills_db = copy.deepcopy(skills_db)
+    categories = list(skills_db.get('technical_skills', {}).items())
+
+    technical_skills: Dict[str, List[str]] = {category: [] for category, _ in categories}
+    used = set()
+    count = 0
+
+    # Reparto round-robin para que todas las categorías tengan skills
+    position = 0
+    while count < num_skills and any(position < len(skills) for _, skills in categories):
+        for category, skills in categories:
+            if count < num_skills and position < len(skills):
+                technical_skills[category].append(skills[position])
+                used.add(skills[position].lower())
+                count += 1
+        position += 1
+
+    rng = random.Random(seed)
+    names = [category for category, _ in categories]
+    while count < num_skills:
+        name = synthetic_skill_name(rng)
+        if name.lower() in used:
+            continue
+        used.add(name.lower())
+        technical_skills[names[count % len(names)]].append(name)
+        count += 1
+
+    skills_db['technical_skills'] = technical_skills
+    return skills_db, keywords_db
+
+
+def write_taxonomy(data_dir: Path, skills_db: Dict, keywords_db: Dict) -> Path:
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    (data_dir / SKILLS_FILE).write_text(json.dumps(skills_db, ensure_ascii=False), encoding='utf-8')
+    (data_dir / KEYWORDS_FILE).write_text(json.dumps(keywords_db, ensure_ascii=False), encoding='utf-8')
+    return data_dir
+
+
+def synthetic_skill_name(rng: random.Random) -> str:
+    stem = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 3)))
+    return stem.capitalize() + rng.choice(_SUFFIXES)
+
+
+def all_skills(skills_db: Dict) -> List[str]:
+    return [
+        skill
+        for skills in skills_db.get('technical_skills', {}).values()
+        for skill in skills
+    ]
+
+
+def make_cv_pages(skills_db: Dict, pages: int, seed: int = 42) -> List[List[str]]:
+    """
+    Líneas de texto de un CV sintético: cabecera, experiencia por empresa
+    con periodos, roles y skills de la taxonomía, y relleno hasta completar
+    LINES_PER_PAGE líneas por página.
+    """
+    rng = random.Random(seed * 1000 + pages)
+    skills = all_skills(skills_db)
+    roles = skills_db.get('job_roles', []) or ["developer"]
+    methodologies = skills_db.get('methodologies', []) or ["Scrum"]
+    soft_skills = skills_db.get('soft_skills', [])
+
+    lines = [
+        "Ana García López - Senior Backend Developer",
+        "Madrid · ana.garcia@example.com · remoto",
+        f"Más de {rng.randint(3, 15)} años de experiencia desarrollando productos.",
+        "",
+    ]
+
+    year = 2024
+    total_lines = pages * LINES_PER_PAGE
+    while len(lines) < total_lines:
+        start = year - rng.randint(1, 4)
+        lines.append(f"{rng.choice(roles).title()} en {rng.choice(_COMPANIES)} ({start} - {year})")
+        mentioned = rng.sample(skills, min(len(skills), rng.randint(3, 8)))
+        lines.append("Tecnologías: " + ", ".join(mentioned))
+        lines.append(f"Equipo {rng.choice(methodologies)} de {rng.randint(3, 12)} personas.")
+        if soft_skills:
+            lines.append(f"Destaco por {rng.choice(soft_skills).lower()} y trabajo profesional con cliente.")
+        for _ in range(rng.randint(3, 8)):
+            lines.append(rng.choice(_FILLER))
+        lines.append("")
+        year = max(start, 1990)
+
+    lines = lines[:total_lines]
+    return [lines[index:index + LINES_PER_PAGE] for index in range(0, total_lines, LINES_PER_PAGE)]
+
+
+def make_cv_pdf(skills_db: Dict, pages: int, seed: int = 42) -> bytes:
+    return build_pdf(make_cv_pages(skills_db, pages, seed))
+
+
+def make_offer(skills_db: Dict, seed: int = 42, required: int = 12, optional: int = 5) -> str:
+    rng = random.Random(seed)
+    skills = all_skills(skills_db)
+    chosen = rng.sample(skills, min(len(skills), required + optional))
+    required_skills, optional_skills = chosen[:required], chosen[required:]
+
+    lines = [
+        "Buscamos Senior Backend Developer para equipo de producto",
+        f"Requisitos: {rng.randint(3, 6)}+ años de experiencia profesional.",
+        "Stack: " + ", ".join(required_skills),
+        "Trabajo en equipo Scrum con despliegue continuo.",
+    ]
+    if optional_skills:
+        lines.append("Nice to have: " + ", ".join(optional_skills))
+    return "\n".join(lines)
+
+
+def build_pdf(pages: List[List[str]], compress: bool = True) -> bytes:
+    """PDF mínimo (Helvetica, WinAnsi) con una línea de texto por entrada."""
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    pages_id = add(b"")
+
+    kids = []
+    for lines in pages:
+        operations = [b"BT /F1 10 Tf 40 800 Td 16 TL"]
+        for line in lines:
+            encoded = line.encode('cp1252', errors='replace')
+            encoded = encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+            operations.append(b"(" + encoded + b") Tj T*")
+        operations.append(b"ET")
+        stream = b"\n".join(operations)
+
+        if compress:
+            stream = zlib.compress(stream)
+            header = b"<< /Length %d /Filter /FlateDecode >>" % len(stream)
+        else:
+            header = b"<< /Length %d >>" % len(stream)
+        content_id = add(header + b"\nstream\n" + stream + b"\nendstream")
+
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font_id, content_id)
+        ))
+
+    objects[pages_id - 1] = (
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % kid for kid in kids) +
+        b"] /Count %d >>" % len(kids)
+    )
+    catalog_id = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_id, xref_offset
+    )
+    return bytes(output)
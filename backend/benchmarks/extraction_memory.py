@@ -0,0 +1,100 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict
+
+from app.services.pdf_extractor import ExtractionLimits
+
+from benchmarks.corpus import make_cv_pdf, make_taxonomy
+
+# Se ejecuta en un intérprete nuevo por medida para que el pico de memoria
+# (ru_maxrss) sea solo el de esa extracción
+_CHILD = """
+import json, resource, sys, time, tracemalloc
+from pathlib import Path
+from app.services.pdf_extractor import ExtractionLimits, PDFExtractor
+backend, pdf_path = sys.argv[1:3]
+limits = ExtractionLimits(*json.loads(sys.argv[3]))
+extractor = PDFExtractor([backend], limits)
+extractor.load_backends()
+pdf_bytes = Path(pdf_path).read_bytes()
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+tracemalloc.start()
+start = time.perf_counter()
+result = extractor.extract_text(pdf_bytes)
+seconds = time.perf_counter() - start
+_, peak = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+print(json.dumps({
+    "seconds": seconds,
+    "peak_python_bytes": peak,
+    "rss_delta_bytes": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) * 1024,
+    "success": result["success"],
+    "pages_extracted": result.get("pages_extracted", 0),
+    "num_characters": result["num_characters"],
+    "truncation_reason": result.get("truncation_reason")
+}))
+"""
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.extraction_memory",
+        description="Pico de memoria y tiempo de la extracción de un PDF grande, con y sin los "
+                    "límites de extracción acotada (CV_ANALYZER_PDF_*), por backend"
+    )
+    parser.add_argument("--pages", type=int, default=300, help="Páginas del PDF sintético")
+    parser.add_argument("--skills", type=int, default=200, help="Skills de la taxonomía sintética")
+    parser.add_argument("--backend", action="append", choices=["native", "pypdf2"],
+                        help="Backends a medir (por defecto los dos)")
+    parser.add_argument("--json", action="store_true", help="Imprime los resultados en JSON")
+    return parser.parse_args(argv)
+
+
+def run_child(backend: str, pdf_path: Path, limits: ExtractionLimits) -> Dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD, backend, str(pdf_path), json.dumps(list(limits))],
+        capture_output=True, text=True, check=True, env=dict(os.environ),
+        cwd=Path(__file__).resolve().parent.parent
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    skills_db, _ = make_taxonomy(args.skills)
+    modes = {"sin_limites": ExtractionLimits(), "acotada": ExtractionLimits.from_config()}
+
+    results: Dict[str, Dict[str, Dict]] = {}
+    with tempfile.TemporaryDirectory(prefix="cv-memory-") as tmp:
+        pdf_path = Path(tmp) / "cv.pdf"
+        pdf_path.write_bytes(make_cv_pdf(skills_db, args.pages))
+        for backend in args.backend or ["native", "pypdf2"]:
+            for mode, limits in modes.items():
+                print(f"Midiendo {backend} {mode} ({args.pages} páginas)...", file=sys.stderr)
+                results.setdefault(backend, {})[mode] = run_child(backend, pdf_path, limits)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    header = (f"{'backend':<8} {'modo':<12} {'ms':>9} {'pico py MB':>11} {'RSS +MB':>9} "
+              f"{'páginas':>8} {'caracteres':>11}  corte")
+    print(header)
+    print("-" * len(header))
+    for backend, modes_results in results.items():
+        for mode, stats in modes_results.items():
+            print(
+                f"{backend:<8} {mode:<12} {stats['seconds'] * 1000:>9.1f} "
+                f"{stats['peak_python_bytes'] / 2 ** 20:>11.2f} {stats['rss_delta_bytes'] / 2 ** 20:>9.2f} "
+                f"{stats['pages_extracted']:>8} {stats['num_characters']:>11}  {stats['truncation_reason'] or '-'}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+import gc
+import math
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from app.services.cv_parser import CVParser
+from app.services.job_parser import JobParser
+from app.services.pdf_extractor import ExtractionLimits, PDFExtractor
+from app.services.recommendations import RecommendationsEngine
+from app.services.scoring_engine import ScoringEngine
+from app.services.taxonomy import TaxonomyRegistry
+
+from benchmarks.corpus import Scenario, make_cv_pdf, make_offer, make_taxonomy, write_taxonomy
+
+# pdf_extraction usa la cadena de backends configurada; pdf_pypdf2 solo PyPDF2, como referencia
+STAGES = ["pdf_extraction", "pdf_pypdf2", "cv_parsing", "job_parsing", "scoring", "recommendations"]
+
+
+def percentile(sorted_samples: List[float], fraction: float) -> float:
+    # Nearest-rank: siempre devuelve una muestra real
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def measure(func: Callable[[], object], repeat: int, warmup: int = 2) -> List[float]:
+    """Ejecuta func `repeat` veces y devuelve la duración de cada una en segundos."""
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    # El GC desactivado evita pausas que no dependen de la etapa medida
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return samples
+
+
+def summarize(samples: List[float], units_per_op: int = 1) -> Dict:
+    ordered = sorted(samples)
+    mean = sum(ordered) / len(ordered)
+    return {
+        "runs": len(ordered),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 4),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 4),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 4),
+        "mean_ms": round(mean * 1000, 4),
+        "ops_per_s": round(1 / mean, 2) if mean > 0 else None,
+        "units_per_s": round(units_per_op / mean, 2) if mean > 0 else None
+    }
+
+
+def run_scenario(scenario: Scenario, repeat: int, stages: List[str] = STAGES) -> Dict[str, Dict]:
+    """
+    Mide cada etapa del pipeline por separado sobre el corpus sintético del
+    escenario. Cada etapa recibe como entrada la salida real de la anterior.
+    units_per_s son páginas/s en la extracción y documentos/s en el resto.
+    """
+    skills_db, keywords_db = make_taxonomy(scenario.num_skills, scenario.seed)
+    pdf_bytes = make_cv_pdf(skills_db, scenario.pages, scenario.seed)
+    offer_text = make_offer(skills_db, scenario.seed)
+
+    with tempfile.TemporaryDirectory(prefix="cv-bench-") as data_dir:
+        write_taxonomy(data_dir, skills_db, keywords_db)
+        registry = TaxonomyRegistry(data_dir)
+        registry.get()
+
+        # Sin límites de extracción acotada: el throughput se mide sobre todas las páginas
+        extractor = PDFExtractor(limits=ExtractionLimits())
+        pypdf2_extractor = PDFExtractor(["pypdf2"], ExtractionLimits())
+        cv_parser = CVParser(registry)
+        job_parser = JobParser(registry)
+        scoring_engine = ScoringEngine(registry)
+        recommendations_engine = RecommendationsEngine()
+
+        extraction = extractor.extract_text(pdf_bytes)
+        if not extraction["success"]:
+            raise RuntimeError(f"El PDF sintético no se pudo extraer: {extraction.get('error')}")
+
+        cv_text = extraction["text"]
+        cv_analysis = cv_parser.parse(cv_text)
+        job_analysis = job_parser.parse(offer_text)
+        match_result = scoring_engine.calculate_match(cv_analysis, job_analysis)
+
+        workloads = {
+            "pdf_extraction": (lambda: extractor.extract_text(pdf_bytes), scenario.pages),
+            "pdf_pypdf2": (lambda: pypdf2_extractor.extract_text(pdf_bytes), scenario.pages),
+            "cv_parsing": (lambda: cv_parser.parse(cv_text), 1),
+            "job_parsing": (lambda: job_parser.parse(offer_text), 1),
+            "scoring": (lambda: scoring_engine.calculate_match(cv_analysis, job_analysis), 1),
+            "recommendations": (
+                lambda: recommendations_engine.generate(cv_analysis, job_analysis, match_result),
+                1
+            ),
+        }
+
+        results = {}
+        for stage in stages:
+            func, units = workloads[stage]
+            results[stage] = summarize(measure(func, repeat), units)
+
+    return results
@@ -0,0 +1,10 @@
+"""
+Análisis por lotes de directorios de CVs en PDF, sin pasar por HTTP.
+
+- worker: análisis de un PDF contra todas las ofertas dentro de cada
+  proceso del pool (PDFExtractor, CVParser y ScoringEngine del pipeline)
+- output: filas de resultado, escritura incremental en CSV/JSONL,
+  reanudación y ranking final por oferta
+
+Uso (desde backend/): python -m screening cvs/ --offer oferta.txt --output ranking.csv
+"""
@@ -0,0 +1,150 @@
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List
+
+from screening.output import (
+    FORMATS,
+    ResultWriter,
+    completed_files,
+    detect_format,
+    full_rows_path,
+    load_rows,
+    write_ranked
+)
+from screening.worker import analyze_file, init_worker, parse_offers
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m screening",
+        description="Analiza directorios de CVs en PDF contra una o varias ofertas y genera un ranking"
+    )
+    parser.add_argument("inputs", nargs="+", help="Directorios (se recorren recursivamente) o patrones glob de PDFs")
+    parser.add_argument("--offer", action="append", required=True, type=Path,
+                        help="Fichero de texto con una oferta (repetible)")
+    parser.add_argument("--output", "-o", required=True, type=Path, help="Fichero de salida (.csv o .jsonl)")
+    parser.add_argument("--format", choices=FORMATS, help="Formato de salida (por defecto, según la extensión)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Procesos del pool")
+    parser.add_argument("--resume", action="store_true",
+                        help="Reutiliza la salida existente y solo analiza los CVs que faltan o fallaron")
+    parser.add_argument("--top-k", type=int, help="Solo las k mejores filas por oferta en la salida final")
+    parser.add_argument("--quiet", action="store_true", help="Sin progreso por stderr")
+    return parser.parse_args(argv)
+
+
+def collect_pdfs(inputs: List[str]) -> List[str]:
+    paths = set()
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            matches = (str(path) for path in Path(pattern).rglob("*") if path.suffix.lower() == ".pdf")
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        paths.update(os.path.normpath(path) for path in matches if os.path.isfile(path))
+    return sorted(paths)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    fmt = detect_format(args.output, args.format)
+
+    offer_texts = []
+    for offer_path in args.offer:
+        try:
+            offer_texts.append((offer_path.stem, offer_path.read_text(encoding="utf-8")))
+        except OSError as e:
+            print(f"No se puede leer la oferta {offer_path}: {e}", file=sys.stderr)
+            return 2
+
+    offer_names = [name for name, _ in offer_texts]
+    if len(set(offer_names)) != len(offer_names):
+        print("Los ficheros de oferta deben tener nombres distintos (se usan como identificador)", file=sys.stderr)
+        return 2
+
+    paths = collect_pdfs(args.inputs)
+    if not paths:
+        print("No se ha encontrado ningún PDF", file=sys.stderr)
+        return 2
+
+    # Con --top-k la salida solo tiene las k mejores filas por oferta: todas las filas van
+    # a un fichero aparte, que es el que permite reanudar
+    full_path = full_rows_path(args.output)
+    log_path = full_path if args.top_k is not None else args.output
+
+    # Reanudación: se conservan los CVs con resultado para todas las ofertas
+    kept_rows = []
+    if args.resume:
+        previous = load_rows(full_path if full_path.exists() else args.output, fmt)
+        done = completed_files(previous, offer_names)
+        kept_rows = [row for row in previous if row["file"] in done and row["offer"] in offer_names]
+        paths = [path for path in paths if path not in done]
+        if not args.quiet:
+            print(f"Reanudando: {len(done)} CV(s) ya analizados, {len(paths)} pendientes", file=sys.stderr)
+
+    offers = parse_offers(offer_texts)
+    writer = ResultWriter(log_path, fmt, kept_rows)
+
+    workers = max(1, min(args.workers, len(paths) or 1))
+    # Lotes pequeños: reparto equilibrado sin un IPC por documento
+    chunksize = max(1, min(16, len(paths) // (workers * 4)))
+
+    docs = pages = failures = 0
+    backends: Counter = Counter()
+    start = time.perf_counter()
+    last_report = start
+
+    try:
+        if paths:
+            # "spawn", como el pool del servidor
+            context = multiprocessing.get_context("spawn")
+            with context.Pool(workers, initializer=init_worker, initargs=(offers,)) as pool:
+                for result in pool.imap_unordered(analyze_file, paths, chunksize):
+                    writer.write_all(result["rows"])
+                    docs += 1
+                    pages += result["pages"]
+                    if result["backend"]:
+                        backends[result["backend"]] += 1
+                    failures += any(row["status"] != "ok" for row in result["rows"])
+
+                    now = time.perf_counter()
+                    if not args.quiet and (now - last_report >= 1 or docs == len(paths)):
+                        last_report = now
+                        print(f"\r{docs}/{len(paths)} CVs ({docs / (now - start):.1f} docs/s)",
+                              end="", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("\nInterrumpido; usa --resume para continuar", file=sys.stderr)
+        return 130
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    if args.top_k is not None:
+        write_ranked(full_path, fmt)
+        ok_rows, error_rows = write_ranked(args.output, fmt, args.top_k, source=full_path)
+    else:
+        ok_rows, error_rows = write_ranked(args.output, fmt)
+        # La salida ya tiene todas las filas: un fichero completo de otra ejecución quedaría desfasado
+        if full_path.exists():
+            full_path.unlink()
+
+    print(file=sys.stderr)
+    reused = len({row["file"] for row in kept_rows})
+    print(f"CVs analizados:  {docs} ({failures} con errores), {reused} reutilizados de la salida anterior")
+    print(f"Páginas:         {pages}")
+    if backends:
+        print(f"Extractor PDF:   {', '.join(f'{name} {count}' for name, count in backends.most_common())}")
+    print(f"Tiempo:          {elapsed:.2f} s con {workers} proceso(s)")
+    print(f"Throughput:      {docs / elapsed if elapsed else 0:.1f} docs/s, {pages / elapsed if elapsed else 0:.1f} páginas/s")
+    print(f"Salida:          {args.output} ({ok_rows} filas, {error_rows} errores)")
+    if args.top_k is not None:
+        print(f"Todas las filas: {full_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import csv
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+FIELDS = [
+    "offer", "rank", "file", "status", "total_score", "skills_score", "experience_score",
+    "context_score", "skills_found", "skills_required", "skills_missing", "experience_level",
+    "level_required", "num_pages", "pages_extracted", "error"
+]
+FLOAT_FIELDS = {"total_score", "skills_score", "experience_score", "context_score"}
+INT_FIELDS = {"rank", "skills_found", "skills_required", "num_pages", "pages_extracted"}
+FORMATS = ("csv", "jsonl")
+
+
+def detect_format(path: Path, requested: Optional[str] = None) -> str:
+    if requested:
+        return requested
+    return "jsonl" if path.suffix.lower() in (".jsonl", ".ndjson") else "csv"
+
+
+def _to_csv(row: Dict) -> Dict:
+    values = {}
+    for field in FIELDS:
+        value = row.get(field)
+        if field == "skills_missing":
+            value = ";".join(value or [])
+        values[field] = "" if value is None else value
+    return values
+
+
+def _from_csv(values: Dict) -> Dict:
+    row = {}
+    for field in FIELDS:
+        value = values.get(field) or ""
+        if field == "skills_missing":
+            row[field] = value.split(";") if value else []
+        elif not value:
+            row[field] = None
+        elif field in FLOAT_FIELDS:
+            row[field] = float(value)
+        elif field in INT_FIELDS:
+            row[field] = int(value)
+        else:
+            row[field] = value
+    return row
+
+
+def full_rows_path(path: Path) -> Path:
+    """
+    Fichero con todas las filas cuando la salida se recorta con --top-k:
+    ranking.csv -> ranking.all.csv. Es el que se reanuda con --resume.
+    """
+    return path.with_name(f"{path.stem}.all{path.suffix}")
+
+
+def load_rows(path: Path, fmt: str) -> List[Dict]:
+    """
+    Filas ya escritas en una salida anterior. Una última línea a medias
+    (proceso cortado mientras escribía) se descarta.
+    """
+    if not path.exists():
+        return []
+
+    rows = []
+    with open(path, newline="", encoding="utf-8") as output_file:
+        if fmt == "csv":
+            for values in csv.DictReader(output_file):
+                try:
+                    if values.get("status") in ("ok", "error"):
+                        rows.append(_from_csv(values))
+                except ValueError:
+                    continue
+        else:
+            for line in output_file:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(row, dict) and row.get("status") in ("ok", "error"):
+                    rows.append(row)
+    return rows
+
+
+def completed_files(rows: Iterable[Dict], offers: Iterable[str]) -> Set[str]:
+    # Un CV está hecho si tiene fila correcta para todas las ofertas; los errores se reintentan
+    done: Dict[str, Set[str]] = {}
+    for row in rows:
+        if row["status"] == "ok":
+            done.setdefault(row["file"], set()).add(row["offer"])
+    wanted = set(offers)
+    return {path for path, offers_done in done.items() if wanted <= offers_done}
+
+
+class ResultWriter:
+    """Escritura incremental: cada fila se vuelca al terminar su CV para poder reanudar."""
+
+    def __init__(self, path: Path, fmt: str, rows: Optional[List[Dict]] = None):
+        self.path = path
+        self.fmt = fmt
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Se reescribe lo recuperado para dejar el fichero sin líneas a medias
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=FIELDS)
+            self._csv.writeheader()
+        self.write_all(rows or [])
+
+    def write_all(self, rows: Iterable[Dict]) -> None:
+        for row in rows:
+            self._write(row)
+        self._file.flush()
+
+    def _write(self, row: Dict) -> None:
+        if self._csv is not None:
+            self._csv.writerow(_to_csv(row))
+        else:
+            self._file.write(json.dumps({field: row.get(field) for field in FIELDS}, ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def rank_rows(rows: List[Dict], top_k: Optional[int] = None) -> List[Dict]:
+    """Ordena por oferta y score descendente y numera el ranking; los errores van al final."""
+    by_offer: Dict[str, List[Dict]] = {}
+    for row in rows:
+        by_offer.setdefault(row["offer"], []).append(row)
+
+    ranked = []
+    for offer in sorted(by_offer):
+        ok = sorted(
+            (row for row in by_offer[offer] if row["status"] == "ok"),
+            key=lambda row: (-row["total_score"], row["file"])
+        )
+        if top_k is not None:
+            ok = ok[:top_k]
+        for rank, row in enumerate(ok, start=1):
+            ranked.append({**row, "rank": rank})
+        ranked.extend(
+            {**row, "rank": None}
+            for row in sorted(by_offer[offer], key=lambda row: row["file"])
+            if row["status"] != "ok"
+        )
+    return ranked
+
+
+def write_ranked(
+    path: Path,
+    fmt: str,
+    top_k: Optional[int] = None,
+    source: Optional[Path] = None
+) -> Tuple[int, int]:
+    """
+    Reescribe la salida ya ordenada (de forma atómica) con las filas de
+    `source` (por defecto, la propia salida). Devuelve (filas correctas, errores).
+    """
+    rows = rank_rows(load_rows(source or path, fmt), top_k)
+    temporary = path.with_name(path.name + ".tmp")
+    writer = ResultWriter(temporary, fmt, rows)
+    writer.close()
+    os.replace(temporary, path)
+    errors = sum(1 for row in rows if row["status"] != "ok")
+    return len(rows) - errors, errors
@@ -0,0 +1,108 @@
+import time
+from typing import Dict, List, Tuple
+
+from app.services import pipeline
+
+# Ofertas ya parseadas, enviadas una sola vez a cada proceso en el initializer
+_offers: List[Tuple[str, Dict]] = []
+
+
+def init_worker(offers: List[Tuple[str, Dict]]) -> None:
+    global _offers
+    _offers = offers
+    pipeline.warm_up()
+
+
+def parse_offers(offer_texts: List[Tuple[str, str]]) -> List[Tuple[str, Dict]]:
+    names = [name for name, _ in offer_texts]
+    return list(zip(names, pipeline.parse_jobs([text for _, text in offer_texts])))
+
+
+def analyze_file(path: str) -> Dict:
+    """
+    Extrae y parsea el CV una vez y lo puntúa contra todas las ofertas.
+    Devuelve las filas (una por oferta), las páginas y el tiempo empleado.
+    """
+    start = time.perf_counter()
+
+    try:
+        with open(path, "rb") as pdf_file:
+            extraction_result = pipeline.extract_pdf(pdf_file)
+    except OSError as e:
+        extraction_result = {"success": False, "error": str(e), "num_pages": 0}
+
+    if not extraction_result["success"]:
+        return {
+            "path": path,
+            "pages": 0,
+            "backend": None,
+            "seconds": time.perf_counter() - start,
+            "rows": [error_row(offer, path, extraction_result.get("error", "Error desconocido")) for offer, _ in _offers]
+        }
+
+    cv_analysis = pipeline.parse_cv(extraction_result["text"])
+    rows = [
+        result_row(offer, path, extraction_result, cv_analysis, job_analysis, pipeline.match_cv(cv_analysis, job_analysis))
+        for offer, job_analysis in _offers
+    ]
+
+    return {
+        "path": path,
+        # Páginas leídas de verdad: la extracción acotada se detiene en PDF_MAX_PAGES
+        "pages": extraction_result["pages_extracted"],
+        "backend": extraction_result["backend"],
+        "seconds": time.perf_counter() - start,
+        "rows": rows
+    }
+
+
+def result_row(
+    offer: str,
+    path: str,
+    extraction_result: Dict,
+    cv_analysis: Dict,
+    job_analysis: Dict,
+    match_result: Dict
+) -> Dict:
+    breakdown = match_result["breakdown"]
+    return {
+        "offer": offer,
+        "rank": None,
+        "file": path,
+        "status": "ok",
+        "total_score": match_result["total_score"],
+        "skills_score": breakdown["skills"]["score"],
+        "experience_score": breakdown["experience"]["score"],
+        "context_score": breakdown["context"]["score"],
+        "skills_found": match_result["total_found"],
+        "skills_required": match_result["total_required"],
+        "skills_missing": sorted(
+            skill for skills in match_result["skills_missing"].values() for skill in skills
+        ),
+        "experience_level": cv_analysis["experience"]["level"],
+        "level_required": job_analysis["required_experience"]["level_required"],
+        "num_pages": extraction_result["num_pages"],
+        "pages_extracted": extraction_result["pages_extracted"],
+        "error": None
+    }
+
+
+def error_row(offer: str, path: str, error: str) -> Dict:
+    return {
+        "offer": offer,
+        "rank": None,
+        "file": path,
+        "status": "error",
+        "total_score": None,
+        "skills_score": None,
+        "experience_score": None,
+        "context_score": None,
+        "skills_found": None,
+        "skills_required": None,
+        "skills_missing": [],
+        "experience_level": None,
+        "level_required": None,
+        "num_pages": None,
+        "pages_extracted": None,
+        "error": error
+    }
@@ -29,6 +29,65 @@ async function analyzeCV(file, jobOfferText) {
     }
 }
 
+async function analyzeCVStream(file, jobOfferText, onEvent) {
+    try {
+        const formData = new FormData();
+        formData.append('cv_file', file);
+        formData.append('job_offer', jobOfferText);
+
+        // El backend envía cada etapa en cuanto termina (una línea JSON por evento)
+        const response = await fetch(`${API_BASE_URL}/analyze/stream`, {
+            method: 'POST',
+            body: formData
+        });
+
+        if (!response.ok) {
+            const errorData = await response.json();
+            throw new Error(errorData.detail || 'Error en el análisis');
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        const data = {};
+        let buffer = '';
+
+        const handleLine = (line) => {
+            if (!line.trim()) return;
+
+            const { event, data: payload } = JSON.parse(line);
+            if (event === 'error') {
+                throw new Error(payload.detail || 'Error en el análisis');
+            }
+
+            // Se acumula el mismo objeto que devuelve /analyze
+            if (event === 'extraction') {
+                data.cv_info = payload;
+            } else if (event !== 'progress' && event !== 'done') {
+                data[event] = payload;
+            }
+
+            onEvent(event, payload);
+        };
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            lines.forEach(handleLine);
+        }
+        handleLine(buffer + decoder.decode());
+
+        return data;
+
+    } catch (error) {
+        console.error('Error al conectar con el backend:', error);
+        throw error;
+    }
+}
+
 async function checkBackendHealth() {
     try {
         const response = await fetch('http://localhost:8000/');
@@ -121,8 +121,15 @@ analyzeBtn.addEventListener('click', async () => {
         analyzeBtn.textContent = '  Analizando...';
         analyzeBtn.disabled = true;
 
-        // Llamar al backend
-        const result = await analyzeCV(uploadedFile, jobOffer.value);
+        // Llamar al backend: el score se pinta antes de tener las recomendaciones
+        const result = await analyzeCVStream(uploadedFile, jobOffer.value, (event, payload) => {
+            if (event === 'progress') {
+                analyzeBtn.textContent = `  Extrayendo texto (${payload.pages_done}/${payload.num_pages} páginas)...`;
+            } else if (event === 'extraction') {
+                analyzeBtn.textContent = '  Analizando...';
+            }
+            resultsRenderer.handleStreamEvent(event, payload);
+        });
 
         // Log en consola para debugging
         console.log('========================================');
@@ -130,9 +137,6 @@ analyzeBtn.addEventListener('click', async () => {
         console.log('========================================');
         console.log('Respuesta completa:', result);
         console.log('========================================');
-        
-        // Renderizar resultados en el dashboard
-        resultsRenderer.render(result.data);
 
     } catch (error) {
         console.error('Error:', error);
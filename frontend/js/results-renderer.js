@@ -37,6 +37,21 @@ class ResultsRenderer {
     render(data) {
         const { match_result, recommendations } = data;
         
+        // Renderizar cada sección
+        this.renderMatch(match_result);
+        this.renderRecommendations(recommendations);
+    }
+    
+    // Modo streaming: cada evento se pinta en cuanto llega
+    handleStreamEvent(event, payload) {
+        if (event === 'match_result') {
+            this.renderMatch(payload);
+        } else if (event === 'recommendations') {
+            this.renderRecommendations(payload);
+        }
+    }
+    
+    renderMatch(matchResult) {
         // Mostrar sección de resultados
         this.resultsSection.classList.add('active');
         
@@ -44,11 +59,14 @@ class ResultsRenderer {
             this.resultsSection.scrollIntoView({ behavior: 'smooth', block: 'start' });
         }, 300);
         
-        // Renderizar cada sección
-        this.renderScore(match_result);
-        this.renderBreakdown(match_result.breakdown);
-        this.renderSkills(match_result);
-        this.renderRecommendations(recommendations);
+        this.renderScore(matchResult);
+        this.renderBreakdown(matchResult.breakdown);
+        this.renderSkills(matchResult);
+        
+        // Las recomendaciones llegan después: se vacían las del análisis anterior
+        this.criticalGroup.style.display = 'none';
+        this.improvementsGroup.style.display = 'none';
+        this.strengthsGroup.style.display = 'none';
     }
     
     renderScore(matchResult) {